@@ -0,0 +1,44 @@
+"""
+Script for copying the asset metadata of Mongo courses into a document per asset
+"""
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+from opaque_keys.edx.locations import SlashSeparatedCourseKey
+
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import modulestore
+
+
+class Command(BaseCommand):
+    """
+    Copy the asset metadata of one or all Mongo courses into a document per asset
+    """
+    help = '''
+    Copy the asset metadata of Mongo courses from their course documents into a document per asset,
+    as used when the Mongo modulestore's asset_metadata_per_asset option is set, and create its indexes.
+    Takes one optional argument:
+    <course_id>: the course whose asset metadata to copy. If not given, copies that of all courses.
+    '''
+    args = '[<course_id>]'
+
+    def handle(self, *args, **options):
+        if len(args) > 1:
+            raise CommandError("migrate_asset_metadata takes at most one argument: <course_id>")
+
+        course_key = None
+        if args:
+            try:
+                course_key = CourseKey.from_string(args[0])
+            except InvalidKeyError:
+                try:
+                    course_key = SlashSeparatedCourseKey.from_deprecated_string(args[0])
+                except InvalidKeyError:
+                    raise CommandError("Invalid course key.")
+
+        store = modulestore()._get_modulestore_by_type(ModuleStoreEnum.Type.mongo)  # pylint: disable=protected-access
+        if store is None:
+            raise CommandError("There's no Mongo modulestore to migrate.")
+
+        num_assets = store.migrate_asset_metadata_per_asset(course_key)
+        print "Copied the metadata of {} assets.".format(num_assets)
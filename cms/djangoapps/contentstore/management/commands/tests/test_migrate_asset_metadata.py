@@ -0,0 +1,40 @@
+"""
+Tests for copying the asset metadata of Mongo courses into a document per asset
+"""
+from django.core.management import CommandError, call_command
+
+from xmodule.assetstore import AssetMetadata
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory
+
+
+class TestMigrateAssetMetadata(ModuleStoreTestCase):
+    """
+    Tests for the migrate_asset_metadata management command.
+    """
+    def setUp(self):
+        super(TestMigrateAssetMetadata, self).setUp()
+        self.course = CourseFactory.create(default_store=ModuleStoreEnum.Type.mongo)
+        # pylint: disable=protected-access
+        self.mongo_store = modulestore()._get_modulestore_by_type(ModuleStoreEnum.Type.mongo)
+        for filename in ('pic.jpg', 'sound.ogg'):
+            asset_md = AssetMetadata(self.course.id.make_asset_key('asset', filename))
+            self.mongo_store.save_asset_metadata(asset_md, ModuleStoreEnum.UserID.test)
+
+    def test_migrate_course(self):
+        call_command('migrate_asset_metadata', unicode(self.course.id))
+        self.mongo_store.asset_metadata_per_asset = True
+        try:
+            filenames = [
+                asset_md.asset_id.path
+                for asset_md in self.mongo_store.get_all_asset_metadata(self.course.id, 'asset')
+            ]
+        finally:
+            self.mongo_store.asset_metadata_per_asset = False
+        self.assertEqual(filenames, ['pic.jpg', 'sound.ogg'])
+
+    def test_invalid_course_key(self):
+        with self.assertRaisesRegexp(CommandError, "Invalid course key"):
+            call_command('migrate_asset_metadata', 'not a course key')
@@ -8,6 +8,7 @@ from django.conf import settings
 settings.INSTALLED_APPS  # pylint: disable=pointless-statement
 
 from openedx.core.lib.django_startup import autostartup
+from edxmako.startup import preload_all_templates
 from monkey_patch import django_utils_translation
 
 
@@ -24,6 +25,9 @@ def run():
     if settings.FEATURES.get('USE_CUSTOM_THEME', False):
         enable_theme()
 
+    # Once the theme has added its template directories
+    preload_all_templates()
+
 
 def add_mimetypes():
     """
@@ -11,6 +11,8 @@ Core methods
 from django.core.cache import cache
 from django.db import DEFAULT_DB_ALIAS
 from opaque_keys import InvalidKeyError
+from xmodule.assetstore.assetmgr import AssetManager
+from xmodule.contentstore.content import StaticContent
 
 from . import app_settings
 
@@ -110,6 +112,108 @@ def instance_key(model, instance_or_pk):
     )
 
 
+# Chunks stay below memcached's default 1MB item size limit
+CONTENT_CHUNK_SIZE = 1000 * 1024
+
+
+class ChunkedContent(StaticContent):
+    """
+    A large asset whose data is cached as fixed-size chunks under their own keys.
+
+    Only the metadata is stored under the asset's own cache key. Chunks are read
+    from the cache as the data is streamed; a chunk missing from the cache is read
+    from the contentstore and cached, so the chunks a client asks for are filled in
+    lazily.
+    """
+    def __init__(self, content, chunk_size=None):
+        super(ChunkedContent, self).__init__(
+            content.location, content.name, content.content_type, None,
+            last_modified_at=content.last_modified_at, thumbnail_location=content.thumbnail_location,
+            import_path=content.import_path, length=content.length, locked=content.locked
+        )
+        self.chunk_size = chunk_size or CONTENT_CHUNK_SIZE
+        # Chunk keys include the upload date, so that chunks of a replaced asset are never mixed
+        # with those of its new version.
+        self.version = content.last_modified_at.isoformat() if content.last_modified_at else ''
+        self._source = content if hasattr(content, 'stream_data_in_range') else None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_source'] = None
+        return state
+
+    @property
+    def data(self):
+        return ''.join(self.stream_data())
+
+    def chunk_key(self, index):
+        """
+        Returns the cache key of the chunk with the given index.
+        """
+        return u'{}:{}:chunk:{}'.format(self.location, self.version, index).encode("utf-8")
+
+    def chunk_keys(self):
+        """
+        Returns the cache keys of all of the chunks of this content.
+        """
+        chunk_count = (self.length + self.chunk_size - 1) // self.chunk_size
+        return [self.chunk_key(index) for index in xrange(chunk_count)]
+
+    def stream_data(self):
+        return self.stream_data_in_range(0, self.length - 1)
+
+    def stream_data_in_range(self, first_byte, last_byte):
+        """
+        Stream the data between first_byte and last_byte (included)
+        """
+        if last_byte < first_byte:
+            return
+        for index in xrange(first_byte // self.chunk_size, last_byte // self.chunk_size + 1):
+            chunk_start = index * self.chunk_size
+            chunk = self._get_chunk(index)
+            yield chunk[max(first_byte - chunk_start, 0):last_byte - chunk_start + 1]
+
+    def _get_chunk(self, index):
+        """
+        Returns the chunk with the given index, reading it from the contentstore if it isn't cached.
+        """
+        key = self.chunk_key(index)
+        chunk = cache.get(key)
+        if chunk is None:
+            if self._source is None:
+                self._source = AssetManager.find(self.location, as_stream=True)
+            chunk_start = index * self.chunk_size
+            chunk_end = min(chunk_start + self.chunk_size, self.length) - 1
+            chunk = ''.join(self._source.stream_data_in_range(chunk_start, chunk_end))
+            cache.set(key, chunk)
+        return chunk
+
+
+# How long (in seconds) a location that isn't in the contentstore is remembered as missing
+MISSING_CONTENT_TIMEOUT = 60
+
+
+def missing_content_key(location):
+    """
+    Returns the cache key which marks the content at location as missing.
+    """
+    return u'missing:{}'.format(location).encode("utf-8")
+
+
+def set_missing_content(location, timeout=MISSING_CONTENT_TIMEOUT):
+    """
+    Remember, for timeout seconds, that there is no content at location.
+    """
+    cache.set(missing_content_key(location), True, timeout)
+
+
+def is_missing_content(location):
+    """
+    Returns True if the content at location was recently found to be missing.
+    """
+    return cache.get(missing_content_key(location)) is not None
+
+
 def set_cached_content(content):
     cache.set(unicode(content.location).encode("utf-8"), content)
 
@@ -123,15 +227,23 @@ def del_cached_content(location):
     delete content for the given location, as well as for content with run=None.
     it's possible that the content could have been cached without knowing the
     course_key - and so without having the run.
+
+    The chunks of any ChunkedContent cached for those locations are deleted as well,
+    as are the markers of those locations being missing.
     """
     def location_str(loc):
         return unicode(loc).encode("utf-8")
 
-    locations = [location_str(location)]
+    locations = [location]
     try:
-        locations.append(location_str(location.replace(run=None)))
+        locations.append(location.replace(run=None))
     except InvalidKeyError:
         # although deprecated keys allowed run=None, new keys don't if there is no version.
         pass
 
-    cache.delete_many(locations)
+    content_keys = [location_str(loc) for loc in locations]
+    keys = content_keys + [missing_content_key(loc) for loc in locations]
+    for content in cache.get_many(content_keys).values():
+        if isinstance(content, ChunkedContent):
+            keys.extend(content.chunk_keys())
+    cache.delete_many(keys)
@@ -2,19 +2,25 @@
 Middleware to serve assets.
 """
 
+import hashlib
 import logging
+from uuid import uuid4
 
+from django.core.cache import cache
+from django.dispatch import receiver
 from django.http import (
     HttpResponse, HttpResponseNotModified, HttpResponseForbidden
 )
-from student.models import CourseEnrollment
+from student.models import CourseEnrollment, UNENROLL_DONE
 
 from xmodule.assetstore.assetmgr import AssetManager
 from xmodule.contentstore.content import StaticContent, XASSET_LOCATION_TAG
 from xmodule.modulestore import InvalidLocationError
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.locator import AssetLocator
-from cache_toolbox.core import get_cached_content, set_cached_content
+from cache_toolbox.core import (
+    ChunkedContent, get_cached_content, set_cached_content, is_missing_content, set_missing_content
+)
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.exceptions import NotFoundError
 
@@ -23,6 +29,12 @@ from xmodule.exceptions import NotFoundError
 
 log = logging.getLogger(__name__)
 
+# Content smaller than this is cached whole; larger content is cached in chunks
+MAX_WHOLE_CACHED_CONTENT_SIZE = 1048576
+
+# How long (in seconds) a user's enrollment in a course is remembered when checking access to locked assets
+ENROLLMENT_CACHE_TIMEOUT = 300
+
 
 class StaticContentServer(object):
     def process_request(self, request):
@@ -44,21 +56,30 @@ class StaticContentServer(object):
             # first look in our cache so we don't have to round-trip to the DB
             content = get_cached_content(loc)
             if content is None:
+                # don't go back to the DB for content we recently found to be missing
+                if is_missing_content(loc):
+                    response = HttpResponse()
+                    response.status_code = 404
+                    return response
+
                 # nope, not in cache, let's fetch from DB
                 try:
                     content = AssetManager.find(loc, as_stream=True)
                 except (ItemNotFoundError, NotFoundError):
+                    set_missing_content(loc)
                     response = HttpResponse()
                     response.status_code = 404
                     return response
 
-                # since we fetched it from DB, let's cache it going forward, but only if it's < 1MB
-                # this is because I haven't been able to find a means to stream data out of memcached
+                # since we fetched it from DB, let's cache it going forward. Small content is cached
+                # whole; larger content is cached in fixed-size chunks which are filled in as they're read.
                 if content.length is not None:
-                    if content.length < 1048576:
+                    if content.length < MAX_WHOLE_CACHED_CONTENT_SIZE:
                         # since we've queried as a stream, let's read in the stream into memory to set in cache
                         content = content.copy_to_in_mem()
-                        set_cached_content(content)
+                    else:
+                        content = ChunkedContent(content)
+                    set_cached_content(content)
             else:
                 # NOP here, but we may wish to add a "cache-hit" counter in the future
                 pass
@@ -67,23 +88,23 @@ class StaticContentServer(object):
             if getattr(content, "locked", False):
                 if not hasattr(request, "user") or not request.user.is_authenticated():
                     return HttpResponseForbidden('Unauthorized')
-                if not request.user.is_staff:
-                    if getattr(loc, 'deprecated', False) and not CourseEnrollment.is_enrolled_by_partial(
-                        request.user, loc.course_key
-                    ):
-                        return HttpResponseForbidden('Unauthorized')
-                    if not getattr(loc, 'deprecated', False) and not CourseEnrollment.is_enrolled(
-                        request.user, loc.course_key
-                    ):
-                        return HttpResponseForbidden('Unauthorized')
+                if not request.user.is_staff and not is_enrolled_for_assets(request.user, loc):
+                    return HttpResponseForbidden('Unauthorized')
 
             # convert over the DB persistent last modified timestamp to a HTTP compatible
             # timestamp, so we can simply compare the strings
             last_modified_at_str = content.last_modified_at.strftime("%a, %d-%b-%Y %H:%M:%S GMT")
+            etag = content_etag(content)
 
             # see if the client has cached this content, if so then compare the
-            # timestamps, if they are the same then just return a 304 (Not Modified)
-            if 'HTTP_IF_MODIFIED_SINCE' in request.META:
+            # ETags or timestamps, if they are the same then just return a 304 (Not Modified)
+            if 'HTTP_IF_NONE_MATCH' in request.META:
+                if_none_match = request.META['HTTP_IF_NONE_MATCH']
+                if if_none_match == '*' or etag in [tag.strip() for tag in if_none_match.split(',')]:
+                    response = HttpResponseNotModified()
+                    response['ETag'] = etag
+                    return response
+            elif 'HTTP_IF_MODIFIED_SINCE' in request.META:
                 if_modified_since = request.META['HTTP_IF_MODIFIED_SINCE']
                 if if_modified_since == last_modified_at_str:
                     return HttpResponseNotModified()
@@ -96,10 +117,6 @@ class StaticContentServer(object):
             # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
             response = None
             if request.META.get('HTTP_RANGE'):
-                # Data from cache (StaticContent) has no easy byte management, so we use the DB instead (StaticContentStream)
-                if type(content) == StaticContent:
-                    content = AssetManager.find(loc, as_stream=True)
-
                 header_value = request.META['HTTP_RANGE']
                 try:
                     unit, ranges = parse_range_header(header_value, content.length)
@@ -112,29 +129,27 @@ class StaticContentServer(object):
                     if unit != 'bytes':
                         # Only accept ranges in bytes
                         log.warning(u"Unknown unit in Range header: %s for content: %s", header_value, unicode(loc))
-                    elif len(ranges) > 1:
-                        # According to Http/1.1 spec content for multiple ranges should be sent as a multipart message.
-                        # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
-                        # But we send back the full content.
-                        log.warning(
-                            u"More than 1 ranges in Range header: %s for content: %s", header_value, unicode(loc)
-                        )
                     else:
-                        first, last = ranges[0]
-
-                        if 0 <= first <= last < content.length:
-                            # If the byte range is satisfiable
+                        satisfiable_ranges = [
+                            (first, last) for first, last in ranges if 0 <= first <= last < content.length
+                        ]
+                        if not satisfiable_ranges:
+                            log.warning(
+                                u"Cannot satisfy ranges in Range header: %s for content: %s", header_value, unicode(loc)
+                            )
+                            return HttpResponse(status=416)  # Requested Range Not Satisfiable
+                        elif len(satisfiable_ranges) == 1:
+                            first, last = satisfiable_ranges[0]
                             response = HttpResponse(content.stream_data_in_range(first, last))
                             response['Content-Range'] = 'bytes {first}-{last}/{length}'.format(
                                 first=first, last=last, length=content.length
                             )
                             response['Content-Length'] = str(last - first + 1)
-                            response.status_code = 206  # Partial Content
                         else:
-                            log.warning(
-                                u"Cannot satisfy ranges in Range header: %s for content: %s", header_value, unicode(loc)
-                            )
-                            return HttpResponse(status=416)  # Requested Range Not Satisfiable
+                            # Content for multiple ranges is sent as a multipart message.
+                            # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
+                            response = multipart_byteranges_response(content, satisfiable_ranges)
+                        response.status_code = 206  # Partial Content
 
             # If Range header is absent or syntactically invalid return a full content response.
             if response is None:
@@ -143,12 +158,112 @@ class StaticContentServer(object):
 
             # "Accept-Ranges: bytes" tells the user that only "bytes" ranges are allowed
             response['Accept-Ranges'] = 'bytes'
-            response['Content-Type'] = content.content_type
+            if not response['Content-Type'].startswith('multipart/byteranges'):
+                response['Content-Type'] = content.content_type
             response['Last-Modified'] = last_modified_at_str
+            response['ETag'] = etag
 
             return response
 
 
+def is_enrolled_for_assets(user, loc):
+    """
+    Returns whether the user is enrolled in the course of the asset at loc.
+
+    Pages can reference dozens of locked assets of the same course, so enrollments are
+    remembered in the cache for ENROLLMENT_CACHE_TIMEOUT seconds, or until the user
+    unenrolls. Only enrollments are remembered, so a user who has just enrolled is
+    never refused access.
+    """
+    course_key = loc.course_key
+    cache_key = _enrollment_cache_key(user.id, course_key.org, course_key.course, course_key.run)
+    if cache.get(cache_key):
+        return True
+
+    if getattr(loc, 'deprecated', False):
+        is_enrolled = CourseEnrollment.is_enrolled_by_partial(user, course_key)
+    else:
+        is_enrolled = CourseEnrollment.is_enrolled(user, course_key)
+    if is_enrolled:
+        cache.set(cache_key, True, ENROLLMENT_CACHE_TIMEOUT)
+    return is_enrolled
+
+
+def _enrollment_cache_key(user_id, org, course, run):
+    """
+    Returns the cache key remembering that the user is enrolled in the course.
+    """
+    return u'contentserver.enrolled.{}.{}.{}.{}'.format(user_id, org, course, run or '').encode('utf-8')
+
+
+@receiver(UNENROLL_DONE, dispatch_uid='contentserver.middleware.forget_enrollment')
+def forget_enrollment(sender, course_enrollment=None, **kwargs):  # pylint: disable=unused-argument
+    """
+    Stops remembering the enrollment of a user who unenrolled, so they're refused access to
+    the course's locked assets straight away.
+    """
+    if course_enrollment is None:
+        return
+    course_key = course_enrollment.course_id
+    # Deprecated asset locations have no run, so their enrollments are remembered without one
+    cache.delete_many([
+        _enrollment_cache_key(course_enrollment.user_id, course_key.org, course_key.course, run)
+        for run in (course_key.run, None)
+    ])
+
+
+def content_etag(content):
+    """
+    Returns a strong ETag for the content, derived from its location, upload date and length.
+
+    Assets are replaced by re-uploading them, which changes their upload date, so these together
+    identify the content's data without having to read or hash it.
+    """
+    digest = hashlib.md5(u'{}|{}|{}'.format(
+        content.location, content.last_modified_at.isoformat(), content.length
+    ).encode('utf-8')).hexdigest()
+    return '"{}"'.format(digest)
+
+
+def multipart_byteranges_response(content, ranges):
+    """
+    Returns a response whose body is a multipart/byteranges message with a part for each
+    of the (first, last) ranges of the content.
+
+    See spec for details: http://www.w3.org/Protocols/rfc2616/rfc2616-sec19.html#sec19.2
+    """
+    boundary = uuid4().hex
+    part_headers = [
+        (
+            '--{boundary}\r\n'
+            'Content-Type: {content_type}\r\n'
+            'Content-Range: bytes {first}-{last}/{length}\r\n\r\n'
+        ).format(
+            boundary=boundary, content_type=content.content_type, first=first, last=last, length=content.length
+        )
+        for first, last in ranges
+    ]
+    closing = '\r\n--{boundary}--\r\n'.format(boundary=boundary)
+
+    def stream_parts():
+        """
+        Yields the headers and data of each part, followed by the closing boundary.
+        """
+        for index, (first, last) in enumerate(ranges):
+            yield ('\r\n' if index else '') + part_headers[index]
+            for chunk in content.stream_data_in_range(first, last):
+                yield chunk
+        yield closing
+
+    content_length = (
+        sum(len(headers) for headers in part_headers) + 2 * (len(ranges) - 1) + len(closing) +
+        sum(last - first + 1 for first, last in ranges)
+    )
+    response = HttpResponse(stream_parts(), content_type='multipart/byteranges; boundary={}'.format(boundary))
+    response['Content-Length'] = str(content_length)
+    return response
+
+
 def parse_range_header(header_value, content_length):
     """
     Returns the unit and a list of (start, end) tuples of ranges.
@@ -5,18 +5,22 @@ import copy
 import ddt
 import logging
 import unittest
+from mock import patch
 from uuid import uuid4
 
 from django.conf import settings
+from django.core.cache import cache
 from django.test.client import Client
 from django.test.utils import override_settings
 
 from xmodule.contentstore.django import contentstore
+from xmodule.exceptions import NotFoundError
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.xml_importer import import_course_from_xml
 
+from cache_toolbox.core import ChunkedContent, del_cached_content, get_cached_content
 from contentserver.middleware import parse_range_header
 from student.models import CourseEnrollment
 
@@ -40,6 +44,8 @@ class ContentStoreToyCourseTest(ModuleStoreTestCase):
         Create user and login.
         """
         self.staff_pwd = super(ContentStoreToyCourseTest, self).setUp()
+        # Cached content, missing locations and enrollments must not leak between tests
+        cache.clear()
         self.staff_usr = self.user
         self.non_staff_usr, self.non_staff_pwd = self.create_non_staff_user()
 
@@ -102,6 +108,56 @@ class ContentStoreToyCourseTest(ModuleStoreTestCase):
         resp = self.client.get(self.url_locked)
         self.assertEqual(resp.status_code, 200)
 
+    def test_locked_asset_enrollment_is_remembered(self):
+        """
+        Test that a user's enrollment is only looked up once for the locked assets of a course.
+        """
+        CourseEnrollment.enroll(self.non_staff_usr, self.course_key)
+        self.client.login(username=self.non_staff_usr, password=self.non_staff_pwd)
+
+        with patch.object(CourseEnrollment, 'is_enrolled', wraps=CourseEnrollment.is_enrolled) as mock_is_enrolled:
+            for __ in range(3):
+                resp = self.client.get(self.url_locked)
+                self.assertEqual(resp.status_code, 200)
+        self.assertEqual(mock_is_enrolled.call_count, 1)
+
+    def test_locked_asset_unenrollment_is_not_remembered(self):
+        """
+        Test that a user is refused access to locked assets as soon as they unenroll.
+        """
+        CourseEnrollment.enroll(self.non_staff_usr, self.course_key)
+        self.client.login(username=self.non_staff_usr, password=self.non_staff_pwd)
+        self.assertEqual(self.client.get(self.url_locked).status_code, 200)
+
+        CourseEnrollment.unenroll(self.non_staff_usr, self.course_key)
+        self.assertEqual(self.client.get(self.url_locked).status_code, 403)
+
+    def test_locked_asset_not_registered_is_not_remembered(self):
+        """
+        Test that a refused user is let in as soon as they enroll.
+        """
+        self.client.login(username=self.non_staff_usr, password=self.non_staff_pwd)
+        self.assertEqual(self.client.get(self.url_locked).status_code, 403)
+
+        CourseEnrollment.enroll(self.non_staff_usr, self.course_key)
+        self.assertEqual(self.client.get(self.url_locked).status_code, 200)
+
+    def test_missing_asset_is_remembered(self):
+        """
+        Test that a missing asset is only looked up once, until content is cached for its location again.
+        """
+        missing_asset = self.course_key.make_asset_key('asset', 'no_such_file.txt')
+        with patch('contentserver.middleware.AssetManager.find', side_effect=NotFoundError) as mock_find:
+            for __ in range(3):
+                resp = self.client.get(unicode(missing_asset))
+                self.assertEqual(resp.status_code, 404)
+        self.assertEqual(mock_find.call_count, 1)
+
+        del_cached_content(missing_asset)
+        with patch('contentserver.middleware.AssetManager.find', side_effect=NotFoundError) as mock_find:
+            self.client.get(unicode(missing_asset))
+        self.assertEqual(mock_find.call_count, 1)
+
     def test_locked_asset_staff(self):
         """
         Test that locked assets behave appropriately in case user is staff.
@@ -146,7 +202,7 @@ class ContentStoreToyCourseTest(ModuleStoreTestCase):
 
     def test_range_request_multiple_ranges(self):
         """
-        Test that multiple ranges in request outputs the full content.
+        Test that multiple ranges in request outputs a multipart/byteranges message.
         """
         first_byte = self.length_unlocked / 4
         last_byte = self.length_unlocked / 2
@@ -154,9 +210,62 @@ class ContentStoreToyCourseTest(ModuleStoreTestCase):
             first=first_byte, last=last_byte)
         )
 
-        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.status_code, 206)  # HTTP_206_PARTIAL_CONTENT
         self.assertNotIn('Content-Range', resp)
-        self.assertEqual(resp['Content-Length'], str(self.length_unlocked))
+        self.assertTrue(resp['Content-Type'].startswith('multipart/byteranges; boundary='))
+        boundary = resp['Content-Type'].split('boundary=')[1]
+        body = ''.join(resp)
+        self.assertEqual(resp['Content-Length'], str(len(body)))
+
+        data = self.contentstore.find(self.unlocked_asset).data
+        parts = body.split('--' + boundary)
+        self.assertEqual(parts[-1], '--\r\n')
+        self.assertIn('Content-Range: bytes {first}-{last}/{length}\r\n\r\n'.format(
+            first=first_byte, last=last_byte, length=self.length_unlocked
+        ), parts[1])
+        self.assertTrue(parts[1].endswith('\r\n\r\n' + data[first_byte:last_byte + 1] + '\r\n'))
+        self.assertTrue(parts[2].endswith('\r\n\r\n' + data[-100:] + '\r\n'))
+
+    def test_etag(self):
+        """
+        Test that responses carry an ETag, and that a matching If-None-Match results in a 304.
+        """
+        resp = self.client.get(self.url_unlocked)
+        etag = resp['ETag']
+        self.assertEqual(self.client.get(self.url_unlocked)['ETag'], etag)
+
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp['ETag'], etag)
+
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(resp.status_code, 200)
+
+    @patch('contentserver.middleware.MAX_WHOLE_CACHED_CONTENT_SIZE', 0)
+    @patch('cache_toolbox.core.CONTENT_CHUNK_SIZE', 16)
+    def test_chunked_content(self):
+        """
+        Test that large content is cached in chunks, and that full and range responses are served from them.
+        """
+        del_cached_content(self.unlocked_asset)
+        data = self.contentstore.find(self.unlocked_asset).data
+        self.assertEqual(''.join(self.client.get(self.url_unlocked)), data)
+
+        content = get_cached_content(self.unlocked_asset)
+        self.assertIsInstance(content, ChunkedContent)
+        chunks = cache.get_many(content.chunk_keys())
+        self.assertEqual(len(chunks), len(content.chunk_keys()))
+
+        with patch('cache_toolbox.core.AssetManager.find') as mock_find:
+            resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=10-40')
+            self.assertEqual(resp.status_code, 206)
+            self.assertEqual(''.join(resp), data[10:41])
+            self.assertEqual(''.join(self.client.get(self.url_unlocked)), data)
+            self.assertFalse(mock_find.called)
+
+        del_cached_content(self.unlocked_asset)
+        self.assertIsNone(get_cached_content(self.unlocked_asset))
+        self.assertEqual(cache.get_many(content.chunk_keys()), {})
 
     @ddt.data(
         'bytes 0-',
@@ -0,0 +1,28 @@
+"""
+Compile every mako template into MAKO_MODULE_DIR ahead of time, so that
+processes started afterwards (with MAKO_PRELOAD_TEMPLATES set) load the
+compiled modules rather than compiling templates on their first render.
+"""
+from django.core.management.base import NoArgsCommand
+
+from edxmako import LOOKUP
+
+
+class Command(NoArgsCommand):
+    """
+    Management command to compile the templates of all the mako lookups.
+    """
+
+    help = "Compile all mako templates into MAKO_MODULE_DIR."
+
+    def handle_noargs(self, **options):
+        """
+        Load every template of every namespace, compiling those whose modules
+        are missing or out of date.
+        """
+        for namespace, templates in sorted(LOOKUP.items()):
+            failed = templates.load_templates()
+            self.stdout.write(u"Compiled the templates in namespace {}\n".format(namespace))
+            for uri in failed:
+                # Not every file in a template directory is a mako template
+                self.stderr.write(u"Couldn't compile {}, skipped it\n".format(uri))
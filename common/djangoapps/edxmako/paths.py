@@ -1,6 +1,7 @@
 """
 Set up lookup paths for mako templates.
 """
+import logging
 import os
 import pkg_resources
 
@@ -9,6 +10,14 @@ from mako.lookup import TemplateLookup
 
 from . import LOOKUP
 
+log = logging.getLogger(__name__)
+
+# The extensions of the files in lookup directories which are mako templates
+TEMPLATE_EXTENSIONS = ('.html', '.js', '.txt', '.xml')
+# Directories of static files, which some lookups include (e.g. for including
+# Underscore templates) but whose javascript files aren't mako templates
+STATIC_DIRECTORY_NAMES = ('static',)
+
 
 class DynamicTemplateLookup(TemplateLookup):
     """
@@ -23,6 +32,45 @@ class DynamicTemplateLookup(TemplateLookup):
             self.directories.insert(0, os.path.normpath(directory))
         else:
             self.directories.append(os.path.normpath(directory))
+        # Templates already loaded may now be overridden by ones in the new directory
+        self._collection.clear()
+        self._uri_cache.clear()
+
+    def template_uris(self):
+        """
+        Returns the uris of all the templates in the lookup directories,
+        other than those in static file directories.
+        """
+        uris = set()
+        for directory in self.directories:
+            if os.path.basename(directory) in STATIC_DIRECTORY_NAMES:
+                continue
+            for root, dirs, files in os.walk(directory):
+                dirs[:] = [
+                    name for name in dirs
+                    if not name.startswith('.') and name not in STATIC_DIRECTORY_NAMES
+                ]
+                for filename in files:
+                    if os.path.splitext(filename)[1] in TEMPLATE_EXTENSIONS:
+                        path = os.path.relpath(os.path.join(root, filename), directory)
+                        uris.add(path.replace(os.sep, '/'))
+        return sorted(uris)
+
+    def load_templates(self):
+        """
+        Loads every template in the lookup directories, compiling the ones
+        whose modules in the module directory are missing or out of date.
+
+        Returns the uris of the templates which failed to compile.
+        """
+        failed = []
+        for uri in self.template_uris():
+            try:
+                self.get_template(uri)
+            except Exception:  # pylint: disable=broad-except
+                log.warning("Couldn't compile mako template %s", uri, exc_info=True)
+                failed.append(uri)
+        return failed
 
 
 def clear_lookups(namespace):
@@ -55,6 +103,18 @@ def add_lookup(namespace, directory, package=None, prepend=False):
     templates.add_directory(directory, prepend=prepend)
 
 
+def preload_templates(namespace):
+    """
+    Loads every template in the namespace's lookup, and stops checking whether
+    their files have changed each time they are used.
+
+    Returns the uris of the templates which failed to compile.
+    """
+    templates = LOOKUP[namespace]
+    templates.filesystem_checks = False
+    return templates.load_templates()
+
+
 def lookup_template(namespace, name):
     """
     Look up a Mako template by namespace and name.
@@ -2,7 +2,8 @@
 Initialize the mako template lookup
 """
 from django.conf import settings
-from . import add_lookup, clear_lookups
+from . import LOOKUP, add_lookup, clear_lookups
+from .paths import preload_templates
 
 
 def run():
@@ -17,3 +18,19 @@ def run():
         clear_lookups(namespace)
         for directory in directories:
             add_lookup(namespace, directory)
+
+
+def preload_all_templates():
+    """
+    If MAKO_PRELOAD_TEMPLATES is set, loads every template now, from the
+    modules compiled into MAKO_MODULE_DIR by the precompile_templates command
+    where they are up to date, and stops checking template files for changes
+    when they are rendered.
+
+    Adding a lookup directory drops the templates already loaded, so this is
+    called at the end of the LMS and Studio startup, after themes and
+    microsites have added theirs.
+    """
+    if settings.MAKO_PRELOAD_TEMPLATES:
+        for namespace in LOOKUP:
+            preload_templates(namespace)
@@ -1,5 +1,8 @@
 
 from mock import patch, Mock
+import os
+import shutil
+import tempfile
 import unittest
 import ddt
 
@@ -12,6 +15,7 @@ from django.core.urlresolvers import reverse
 import edxmako.middleware
 from edxmako.middleware import get_template_request_context
 from edxmako import add_lookup, LOOKUP
+from edxmako.paths import preload_templates
 from edxmako.shortcuts import (
     marketing_link,
     render_to_string,
@@ -63,6 +67,67 @@ class AddLookupTests(TestCase):
         self.assertTrue(dirs[0].endswith('management'))
 
 
+@patch.dict('edxmako.LOOKUP', {}, clear=True)
+class PreloadTemplatesTests(TestCase):
+    """
+    Test loading all the templates of a lookup ahead of time.
+    """
+    def setUp(self):
+        super(PreloadTemplatesTests, self).setUp()
+        self.module_dir = self.make_dir()
+        self.template_dir = self.make_dir({
+            'main.html': '${1 + 1}',
+            'emails/message.txt': 'message',
+            'static.underscore': '<%= value %>',
+            'broken.html': '<%def name="unclosed()">',
+        })
+        settings_override = override_settings(MAKO_MODULE_DIR=self.module_dir)
+        settings_override.__enter__()
+        self.addCleanup(settings_override.__exit__, None, None, None)
+        add_lookup('test', self.template_dir)
+
+    def make_dir(self, files=None):
+        """
+        Returns a temporary directory, containing the given files.
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        for name, content in (files or {}).items():
+            path = os.path.join(directory, name)
+            if not os.path.exists(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            with open(path, 'w') as template_file:
+                template_file.write(content)
+        return directory
+
+    def test_template_uris(self):
+        self.assertEqual(LOOKUP['test'].template_uris(), ['broken.html', 'emails/message.txt', 'main.html'])
+
+    def test_template_uris_skip_static_files(self):
+        add_lookup('test', self.make_dir({'static/vendor.js': 'var a;', 'graph.js': '${1 + 1}'}))
+        add_lookup('test', os.path.join(self.make_dir({'static/app.js': 'var b;'}), 'static'))
+        self.assertEqual(
+            LOOKUP['test'].template_uris(), ['broken.html', 'emails/message.txt', 'graph.js', 'main.html']
+        )
+
+    def test_preload_templates(self):
+        self.assertEqual(preload_templates('test'), ['broken.html'])
+        templates = LOOKUP['test']
+        self.assertFalse(templates.filesystem_checks)
+        self.assertTrue(templates.has_template('main.html'))
+        self.assertTrue(os.path.exists(os.path.join(self.module_dir, 'main.html.py')))
+
+        # Changes to a preloaded template aren't noticed
+        with open(os.path.join(self.template_dir, 'main.html'), 'w') as template_file:
+            template_file.write('changed')
+        self.assertEqual(templates.get_template('main.html').render(), '2')
+
+    def test_added_directory_overrides_loaded_templates(self):
+        preload_templates('test')
+        add_lookup('test', self.make_dir({'main.html': 'override'}), prepend=True)
+        self.assertEqual(LOOKUP['test'].get_template('main.html').render(), 'override')
+
+
 class MakoMiddlewareTest(TestCase):
     """
     Test MakoMiddleware.
@@ -1,9 +1,25 @@
+"""
+A cache which lives for the duration of a single request.
+
+Besides the flat `data` dict, the cache is divided into namespaces, which are
+retrieved with `get_cache`. Namespaces are dotted names; clearing a namespace
+clears the namespaces beneath it too. Each namespace may have a size limit, and
+keeps hit/miss statistics which are logged when the response is processed.
+"""
+from collections import OrderedDict
+import functools
+import logging
 import threading
 
+log = logging.getLogger(__name__)
+
 _request_cache_threadlocal = threading.local()
 _request_cache_threadlocal.data = {}
 _request_cache_threadlocal.request = None
 
+# The key in the request cache's data under which the namespaced caches are kept
+NAMESPACES_KEY = 'request_cache.namespaces'
+
 
 class RequestCache(object):
     @classmethod
@@ -16,7 +32,7 @@ class RequestCache(object):
         Get a reference to the HttpRequest object, if we are presently
         servicing one.
         """
-        return _request_cache_threadlocal.request
+        return getattr(_request_cache_threadlocal, 'request', None)
 
     @classmethod
     def clear_request_cache(cls):
@@ -32,5 +48,148 @@ class RequestCache(object):
         return None
 
     def process_response(self, request, response):
+        if log.isEnabledFor(logging.DEBUG):
+            for namespace, cache in sorted(_namespaces().items()):
+                log.debug(
+                    u"Request cache namespace %s for %s: %d hits, %d misses, %d evictions, %d entries",
+                    namespace, request.path, cache.hits, cache.misses, cache.evictions, len(cache)
+                )
         self.clear_request_cache()
         return response
+
+
+class NamespacedCache(object):
+    """
+    The cache of a single namespace of the request cache.
+
+    It behaves like a dict, except that lookups are counted as hits or misses, and that
+    once it holds max_size entries, adding another evicts the least recently used one.
+    """
+    def __init__(self, namespace, max_size=None):
+        self.namespace = namespace
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        """
+        Returns the value cached for key, or default if there is none.
+        """
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def setdefault(self, key, default=None):
+        """
+        Returns the value cached for key, caching default for it if there is none.
+        """
+        try:
+            return self[key]
+        except KeyError:
+            self[key] = default
+            return default
+
+    def pop(self, key, *default):
+        """
+        Removes key and returns its value (or default, if given and key isn't cached).
+        """
+        return self._data.pop(key, *default)
+
+    def clear(self):
+        """
+        Removes all entries, keeping the statistics.
+        """
+        self._data.clear()
+
+    def __getitem__(self, key):
+        try:
+            value = self._data.pop(key)
+        except KeyError:
+            self.misses += 1
+            raise
+        # Re-insert to mark the entry as the most recently used
+        self._data[key] = value
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        self._data.pop(key, None)
+        self._data[key] = value
+        if self.max_size is not None:
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def __delitem__(self, key):
+        del self._data[key]
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+
+def _namespaces():
+    """
+    Returns the dict of namespaced caches for the current request.
+    """
+    data = getattr(_request_cache_threadlocal, 'data', None)
+    if data is None:
+        data = _request_cache_threadlocal.data = {}
+    return data.setdefault(NAMESPACES_KEY, {})
+
+
+def get_cache(namespace, max_size=None):
+    """
+    Returns the NamespacedCache for namespace in the current request, creating it if needed.
+
+    max_size only applies when the namespace is created; the first caller in a request sets it.
+    """
+    namespaces = _namespaces()
+    cache = namespaces.get(namespace)
+    if cache is None:
+        cache = namespaces[namespace] = NamespacedCache(namespace, max_size)
+    return cache
+
+
+def clear_cache(namespace):
+    """
+    Empties namespace, and every namespace beneath it, in the current request.
+    """
+    prefix = namespace + '.'
+    for name, cache in _namespaces().items():
+        if name == namespace or name.startswith(prefix):
+            cache.clear()
+
+
+def request_cached(namespace=None, max_size=None):
+    """
+    Memoizes the decorated function for the lifetime of the current request.
+
+    Results are cached in namespace, which defaults to the function's module and name,
+    keyed by the function's positional and keyword arguments, which must be hashable.
+    """
+    def _decorator(func):
+        """
+        Returns the memoizing wrapper of func.
+        """
+        cache_namespace = namespace or u'{}.{}'.format(func.__module__, func.__name__)
+
+        @functools.wraps(func)
+        def _wrapper(*args, **kwargs):
+            """
+            Returns the cached result for the arguments, calling func if there is none.
+            """
+            cache = get_cache(cache_namespace, max_size)
+            key = (args, tuple(sorted(kwargs.items())))
+            try:
+                return cache[key]
+            except KeyError:
+                result = cache[key] = func(*args, **kwargs)
+                return result
+        return _wrapper
+    return _decorator
@@ -0,0 +1,91 @@
+"""
+Tests for the namespaced request cache.
+"""
+from django.test import TestCase
+from mock import Mock
+
+from request_cache.middleware import RequestCache, clear_cache, get_cache, request_cached
+
+
+class TestNamespacedCache(TestCase):
+    """
+    Tests of get_cache and NamespacedCache.
+    """
+    def setUp(self):
+        super(TestNamespacedCache, self).setUp()
+        RequestCache.clear_request_cache()
+        self.addCleanup(RequestCache.clear_request_cache)
+
+    def test_same_namespace_same_cache(self):
+        get_cache('courseware.test')['key'] = 'value'
+        self.assertEqual(get_cache('courseware.test')['key'], 'value')
+        self.assertNotIn('key', get_cache('courseware.other'))
+
+    def test_stats(self):
+        cache = get_cache('courseware.test')
+        self.assertIsNone(cache.get('key'))
+        cache['key'] = 'value'
+        self.assertEqual(cache.get('key'), 'value')
+        self.assertEqual(cache.setdefault('key', 'other'), 'value')
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (2, 1, 1))
+
+    def test_size_limit_evicts_least_recently_used(self):
+        cache = get_cache('courseware.test', max_size=2)
+        cache['a'] = 1
+        cache['b'] = 2
+        cache.get('a')
+        cache['c'] = 3
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual((len(cache), cache.evictions), (2, 1))
+
+    def test_clear_cache_is_hierarchical(self):
+        get_cache('courseware')['key'] = 1
+        get_cache('courseware.test')['key'] = 2
+        get_cache('courseware_other')['key'] = 3
+        clear_cache('courseware')
+        self.assertEqual(len(get_cache('courseware')), 0)
+        self.assertEqual(len(get_cache('courseware.test')), 0)
+        self.assertEqual(len(get_cache('courseware_other')), 1)
+
+    def test_cleared_with_request(self):
+        get_cache('courseware.test')['key'] = 'value'
+        RequestCache().process_response(Mock(path='/'), Mock())
+        self.assertNotIn('key', get_cache('courseware.test'))
+
+
+class TestRequestCached(TestCase):
+    """
+    Tests of the request_cached decorator.
+    """
+    def setUp(self):
+        super(TestRequestCached, self).setUp()
+        RequestCache.clear_request_cache()
+        self.addCleanup(RequestCache.clear_request_cache)
+        self.mock_func = Mock(side_effect=lambda *args, **kwargs: (args, kwargs))
+
+        def func(*args, **kwargs):
+            """ Calls the mock """
+            return self.mock_func(*args, **kwargs)
+        self.func = func
+
+    def test_memoized_per_arguments(self):
+        cached_func = request_cached(namespace='test.func')(self.func)
+        self.assertEqual(cached_func(1, b=2), ((1,), {'b': 2}))
+        self.assertEqual(cached_func(1, b=2), ((1,), {'b': 2}))
+        self.assertEqual(self.mock_func.call_count, 1)
+
+        cached_func(2, b=2)
+        self.assertEqual(self.mock_func.call_count, 2)
+        self.assertEqual(get_cache('test.func').hits, 1)
+
+    def test_default_namespace(self):
+        request_cached()(self.func)(1)
+        self.assertEqual(len(get_cache('request_cache.tests.func')), 1)
+
+    def test_memoized_for_request(self):
+        cached_func = request_cached(namespace='test.func')(self.func)
+        cached_func(1)
+        RequestCache.clear_request_cache()
+        cached_func(1)
+        self.assertEqual(self.mock_func.call_count, 2)
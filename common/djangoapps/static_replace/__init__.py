@@ -1,5 +1,6 @@
 import logging
 import re
+import threading
 
 from staticfiles.storage import staticfiles_storage
 from staticfiles import finders
@@ -10,9 +11,21 @@ from xmodule.modulestore import ModuleStoreEnum
 from xmodule.contentstore.content import StaticContent
 
 from opaque_keys.edx.locator import AssetLocator
+from request_cache.middleware import NamespacedCache
 
 log = logging.getLogger(__name__)
 
+# How many resolved static urls replace_static_urls remembers
+STATIC_URL_CACHE_SIZE = 10000
+
+# Maps (course_id, static_asset_path, data_directory, prefix, rest) to the url a
+# static url resolves to, which can't change for the life of the process
+_static_url_cache = NamespacedCache('static_replace.urls', max_size=STATIC_URL_CACHE_SIZE)
+_static_url_cache_lock = threading.Lock()
+
+# Compiled url replacement patterns, by the prefixes they match
+_url_replace_patterns = {}
+
 
 def _url_replace_regex(prefix):
     """
@@ -30,6 +43,45 @@ def _url_replace_regex(prefix):
         """.format(prefix=prefix)
 
 
+def _static_prefix_regex(data_dir):
+    """
+    Match the prefix of static urls which aren't already in data_dir.
+    """
+    return u'(?:{static_url}|/static/)(?!{data_dir})'.format(
+        static_url=settings.STATIC_URL,
+        data_dir=data_dir
+    )
+
+
+def _url_replace_pattern(static_prefix=None, course_prefix=None, jump_to_id_prefix=None):
+    """
+    Return the compiled pattern matching quoted urls that start with any of the
+    given prefixes, like _url_replace_regex. Besides being captured in the
+    'prefix' group, the course and jump_to_id prefixes are captured in groups
+    named after their arguments.
+    """
+    key = (static_prefix, course_prefix, jump_to_id_prefix)
+    pattern = _url_replace_patterns.get(key)
+    if pattern is None:
+        prefixes = []
+        if static_prefix is not None:
+            prefixes.append(static_prefix)
+        if course_prefix is not None:
+            prefixes.append(u'(?P<course_prefix>{})'.format(course_prefix))
+        if jump_to_id_prefix is not None:
+            prefixes.append(u'(?P<jump_to_id_prefix>{})'.format(jump_to_id_prefix))
+        pattern = _url_replace_patterns[key] = re.compile(_url_replace_regex(u'|'.join(prefixes)))
+    return pattern
+
+
+def clear_static_url_cache():
+    """
+    Forget every static url resolved by replace_static_urls.
+    """
+    with _static_url_cache_lock:
+        _static_url_cache.clear()
+
+
 def try_staticfiles_lookup(path):
     """
     Try to lookup a path in staticfiles_storage.  If it fails, return
@@ -66,12 +118,7 @@ def replace_jump_to_id_urls(text, course_id, jump_to_id_base_url):
     output: <text> after the link rewriting rules are applied
     """
 
-    def replace_jump_to_id_url(match):
-        quote = match.group('quote')
-        rest = match.group('rest')
-        return "".join([quote, jump_to_id_base_url + rest, quote])
-
-    return re.sub(_url_replace_regex('/jump_to_id/'), replace_jump_to_id_url, text)
+    return replace_urls(text, course_id=course_id, jump_to_id_base_url=jump_to_id_base_url, replace_static=False)
 
 
 def replace_course_urls(text, course_key):
@@ -83,15 +130,7 @@ def replace_course_urls(text, course_key):
 
     returns: text with the links replaced
     """
-
-    course_id = course_key.to_deprecated_string()
-
-    def replace_course_url(match):
-        quote = match.group('quote')
-        rest = match.group('rest')
-        return "".join([quote, '/courses/' + course_id + '/', rest, quote])
-
-    return re.sub(_url_replace_regex('/course/'), replace_course_url, text)
+    return replace_urls(text, course_id=course_key, replace_static=False, replace_course=True)
 
 
 def process_static_urls(text, replacement_function, data_dir=None):
@@ -110,14 +149,7 @@ def process_static_urls(text, replacement_function, data_dir=None):
         rest = match.group('rest')
         return replacement_function(original, prefix, quote, rest)
 
-    return re.sub(
-        _url_replace_regex(u'(?:{static_url}|/static/)(?!{data_dir})'.format(
-            static_url=settings.STATIC_URL,
-            data_dir=data_dir
-        )),
-        wrap_part_extraction,
-        text
-    )
+    return _url_replace_pattern(static_prefix=_static_prefix_regex(data_dir)).sub(wrap_part_extraction, text)
 
 
 def make_static_urls_absolute(request, html):
@@ -149,57 +181,120 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
     course_id: The course identifier used to distinguish static content for this course in studio
     static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
     """
+    return replace_urls(text, data_directory, course_id, static_asset_path)
+
+
+def replace_urls(
+        text, data_directory=None, course_id=None, static_asset_path='',
+        replace_static=True, replace_course=False, jump_to_id_base_url=None
+):
+    """
+    Apply the substitutions of replace_static_urls, replace_course_urls and
+    replace_jump_to_id_urls to text in a single scan, rather than a pass for each.
+
+    text: The source text to do the substitutions in
+    data_directory, static_asset_path: As for replace_static_urls
+    course_id: The course in which the rewrite happens
+    replace_static: Whether to replace /static/ urls, as replace_static_urls does
+    replace_course: Whether to replace /course/ urls, as replace_course_urls does
+    jump_to_id_base_url: If given, /jump_to_id/ urls are replaced, as replace_jump_to_id_urls does
+    """
+    if not (replace_static or replace_course or jump_to_id_base_url is not None):
+        return text
+
+    data_dir = static_asset_path or data_directory
+    pattern = _url_replace_pattern(
+        static_prefix=_static_prefix_regex(data_dir) if replace_static else None,
+        course_prefix='/course/' if replace_course else None,
+        jump_to_id_prefix='/jump_to_id/' if jump_to_id_base_url is not None else None,
+    )
+    if replace_course:
+        course_url = '/courses/' + course_id.to_deprecated_string() + '/'
 
-    def replace_static_url(original, prefix, quote, rest):
+    def replace_url(match):
         """
         Replace a single matched url.
         """
-        # Don't mess with things that end in '?raw'
-        if rest.endswith('?raw'):
-            return original
-
-        # In debug mode, if we can find the url as is,
-        if settings.DEBUG and finders.find(rest, True):
-            return original
-        # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
-        elif (not static_asset_path) \
-                and course_id \
-                and modulestore().get_modulestore_type(course_id) != ModuleStoreEnum.Type.xml:
-            # first look in the static file pipeline and see if we are trying to reference
-            # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
-
-            exists_in_staticfiles_storage = False
-            try:
-                exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
-            except Exception as err:
-                log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
-                    rest, str(err)))
-
-            if exists_in_staticfiles_storage:
-                url = staticfiles_storage.url(rest)
-            else:
-                # if not, then assume it's courseware specific content and then look in the
-                # Mongo-backed database
-                url = StaticContent.convert_legacy_static_url_with_course_id(rest, course_id)
+        quote = match.group('quote')
+        rest = match.group('rest')
+        if replace_course and match.group('course_prefix'):
+            url = course_url + rest
+        elif jump_to_id_base_url is not None and match.group('jump_to_id_prefix'):
+            url = jump_to_id_base_url + rest
+        else:
+            # Don't mess with things that end in '?raw'
+            if rest.endswith('?raw'):
+                return match.group(0)
+            # In debug mode, if we can find the url as is,
+            if settings.DEBUG and finders.find(rest, True):
+                return match.group(0)
+            url = _resolve_static_url(match.group('prefix'), rest, data_directory, course_id, static_asset_path)
+        return "".join([quote, url, quote])
+
+    return pattern.sub(replace_url, text)
+
 
-                if AssetLocator.CANONICAL_NAMESPACE in url:
-                    url = url.replace('block@', 'block/', 1)
+def _resolve_static_url(prefix, rest, data_directory, course_id, static_asset_path):
+    """
+    Return the url which the static url prefix + rest refers to, remembering it
+    so that storage and the modulestore aren't consulted for it again.
+    Outside of DEBUG mode, neither the collected static files nor the courses'
+    stores change while the process runs.
+    """
+    if settings.DEBUG:
+        return _lookup_static_url(prefix, rest, data_directory, course_id, static_asset_path)
+
+    key = (course_id, static_asset_path, data_directory, prefix, rest)
+    with _static_url_cache_lock:
+        url = _static_url_cache.get(key)
+    if url is None:
+        url = _lookup_static_url(prefix, rest, data_directory, course_id, static_asset_path)
+        with _static_url_cache_lock:
+            _static_url_cache[key] = url
+    return url
 
-        # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
+
+def _lookup_static_url(prefix, rest, data_directory, course_id, static_asset_path):
+    """
+    Find the url which the static url prefix + rest refers to.
+    """
+    # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
+    if (not static_asset_path) \
+            and course_id \
+            and modulestore().get_modulestore_type(course_id) != ModuleStoreEnum.Type.xml:
+        # first look in the static file pipeline and see if we are trying to reference
+        # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
+
+        exists_in_staticfiles_storage = False
+        try:
+            exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
+        except Exception as err:
+            log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
+                rest, str(err)))
+
+        if exists_in_staticfiles_storage:
+            url = staticfiles_storage.url(rest)
         else:
-            course_path = "/".join((static_asset_path or data_directory, rest))
-
-            try:
-                if staticfiles_storage.exists(rest):
-                    url = staticfiles_storage.url(rest)
-                else:
-                    url = staticfiles_storage.url(course_path)
-            # And if that fails, assume that it's course content, and add manually data directory
-            except Exception as err:
-                log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
-                    rest, str(err)))
-                url = "".join([prefix, course_path])
+            # if not, then assume it's courseware specific content and then look in the
+            # Mongo-backed database
+            url = StaticContent.convert_legacy_static_url_with_course_id(rest, course_id)
 
-        return "".join([quote, url, quote])
+            if AssetLocator.CANONICAL_NAMESPACE in url:
+                url = url.replace('block@', 'block/', 1)
+
+    # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
+    else:
+        course_path = "/".join((static_asset_path or data_directory, rest))
+
+        try:
+            if staticfiles_storage.exists(rest):
+                url = staticfiles_storage.url(rest)
+            else:
+                url = staticfiles_storage.url(course_path)
+        # And if that fails, assume that it's course content, and add manually data directory
+        except Exception as err:
+            log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
+                rest, str(err)))
+            url = "".join([prefix, course_path])
 
-    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+    return url
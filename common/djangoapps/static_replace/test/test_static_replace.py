@@ -1,9 +1,13 @@
 import re
 
-from nose.tools import assert_equals, assert_true, assert_false  # pylint: disable=no-name-in-module
+from nose.tools import assert_equals, assert_true, assert_false, with_setup  # pylint: disable=no-name-in-module
+import static_replace
 from static_replace import (
+    clear_static_url_cache,
     replace_static_urls,
     replace_course_urls,
+    replace_jump_to_id_urls,
+    replace_urls,
     _url_replace_regex,
     process_static_urls,
     make_static_urls_absolute
@@ -19,6 +23,7 @@ COURSE_KEY = SlashSeparatedCourseKey('org', 'course', 'run')
 STATIC_SOURCE = '"/static/file.png"'
 
 
+@with_setup(clear_static_url_cache)
 def test_multi_replace():
     course_source = '"/course/file.png"'
 
@@ -63,6 +68,7 @@ def test_static_urls(mock_request):
     assert_equals(result, '\"http:///static/file.png\"')
 
 
+@with_setup(clear_static_url_cache)
 @patch('static_replace.staticfiles_storage')
 def test_storage_url_exists(mock_storage):
     mock_storage.exists.return_value = True
@@ -73,6 +79,7 @@ def test_storage_url_exists(mock_storage):
     mock_storage.url.called_once_with('data_dir/file.png')
 
 
+@with_setup(clear_static_url_cache)
 @patch('static_replace.staticfiles_storage')
 def test_storage_url_not_exists(mock_storage):
     mock_storage.exists.return_value = False
@@ -83,6 +90,7 @@ def test_storage_url_not_exists(mock_storage):
     mock_storage.url.called_once_with('file.png')
 
 
+@with_setup(clear_static_url_cache)
 @patch('static_replace.StaticContent')
 @patch('static_replace.modulestore')
 def test_mongo_filestore(mock_modulestore, mock_static_content):
@@ -102,6 +110,7 @@ def test_mongo_filestore(mock_modulestore, mock_static_content):
     mock_static_content.convert_legacy_static_url_with_course_id.assert_called_once_with('file.png', COURSE_KEY)
 
 
+@with_setup(clear_static_url_cache)
 @patch('static_replace.settings')
 @patch('static_replace.modulestore')
 @patch('static_replace.staticfiles_storage')
@@ -127,6 +136,7 @@ def test_raw_static_check():
     assert_equals(path, replace_static_urls(path, text))
 
 
+@with_setup(clear_static_url_cache)
 @patch('static_replace.staticfiles_storage')
 @patch('static_replace.modulestore')
 def test_static_url_with_query(mock_modulestore, mock_storage):
@@ -161,3 +171,62 @@ def test_regex():
     for s in no:
         print 'Should not match: {0!r}'.format(s)
         assert_false(re.match(regex, s))
+
+
+@with_setup(clear_static_url_cache)
+@patch('static_replace.staticfiles_storage')
+def test_resolved_urls_cached(mock_storage):
+    mock_storage.exists.return_value = True
+    mock_storage.url.return_value = '/static/file.abc123.png'
+
+    text = STATIC_SOURCE + ' ' + STATIC_SOURCE
+    expected = '"/static/file.abc123.png" "/static/file.abc123.png"'
+    assert_equals(expected, replace_static_urls(text, DATA_DIRECTORY))
+    assert_equals(expected, replace_static_urls(text, DATA_DIRECTORY))
+    mock_storage.exists.assert_called_once_with('file.png')
+
+    # The data directory is part of what the url resolves to
+    replace_static_urls(STATIC_SOURCE, 'other_dir')
+    assert_equals(mock_storage.exists.call_count, 2)
+
+
+@with_setup(clear_static_url_cache)
+@patch('static_replace.staticfiles_storage')
+def test_resolved_urls_evicted(mock_storage):
+    mock_storage.exists.return_value = True
+    mock_storage.url.side_effect = lambda path: '/static/hashed/' + path
+
+    with patch.object(static_replace._static_url_cache, 'max_size', 2):  # pylint: disable=protected-access
+        for name in ('a.png', 'b.png', 'a.png', 'c.png', 'a.png', 'b.png'):
+            replace_static_urls('"/static/{}"'.format(name), DATA_DIRECTORY)
+    # b.png was the least recently used when c.png was resolved
+    assert_equals(
+        [call[0][0] for call in mock_storage.exists.call_args_list],
+        ['a.png', 'b.png', 'c.png', 'b.png']
+    )
+
+
+@with_setup(clear_static_url_cache)
+@patch('static_replace.staticfiles_storage')
+def test_replace_urls_in_one_pass(mock_storage):
+    mock_storage.exists.return_value = False
+    mock_storage.url.side_effect = lambda path: '/static/hashed/' + path
+    jump_to_id_base_url = '/courses/org/course/run/jump_to_id/'
+    text = '<img src="/static/file.png"/><a href="/course/info">i</a><a href=\'/jump_to_id/abc\'>j</a>"/static/a.js?raw"'
+
+    expected = replace_jump_to_id_urls(
+        replace_course_urls(replace_static_urls(text, DATA_DIRECTORY), COURSE_KEY),
+        COURSE_KEY,
+        jump_to_id_base_url
+    )
+    assert_equals(
+        '<img src="/static/hashed/data_dir/file.png"/><a href="/courses/org/course/run/info">i</a>'
+        '<a href=\'/courses/org/course/run/jump_to_id/abc\'>j</a>"/static/a.js?raw"',
+        expected
+    )
+    assert_equals(
+        expected,
+        replace_urls(
+            text, DATA_DIRECTORY, replace_course=True, course_id=COURSE_KEY, jump_to_id_base_url=jump_to_id_base_url
+        )
+    )
@@ -0,0 +1,142 @@
+"""
+Event tracker backend that queues events in memory and sends them to
+another backend in batches from a background thread, so that sending
+events doesn't hold up requests.
+
+For example, to buffer the events sent to MongoDB::
+
+  TRACKING_BACKENDS = {
+      'mongo': {
+          'ENGINE': 'track.backends.buffered.BufferedBackend',
+          'OPTIONS': {
+              'backend': {
+                  'ENGINE': 'track.backends.mongodb.MongoBackend',
+                  'OPTIONS': {...}
+              },
+              'flush_interval': 1.0,
+              'flush_size': 100,
+          }
+      }
+  }
+
+"""
+
+from __future__ import absolute_import
+
+import atexit
+import logging
+import os
+import Queue
+import threading
+
+from dogapi import dog_stats_api
+
+from track.backends import BaseBackend
+
+
+log = logging.getLogger(__name__)
+
+
+class BufferedBackend(BaseBackend):
+    """
+    Event tracker backend that queues events and sends them to another
+    backend in batches from a background thread.
+
+    The queued events are sent when the process exits.
+
+    """
+
+    def __init__(self, backend, max_queue_size=10000, flush_interval=1.0, flush_size=100, block_when_full=False,
+                 **kwargs):
+        """
+        :Parameters:
+
+          - `backend`: the backend to send the events to, configured
+            like the backends in TRACKING_BACKENDS, with an `ENGINE`
+            and `OPTIONS`
+          - `max_queue_size`: the most events to queue
+          - `flush_interval`: the seconds between sending the queued
+            events
+          - `flush_size`: the most events to send in a batch, and the
+            number of queued events which are sent without waiting for
+            the flush interval
+          - `block_when_full`: if the queue is full, whether to wait
+            for a place in it, for at most `flush_interval` seconds,
+            rather than dropping the event straight away
+
+        """
+        super(BufferedBackend, self).__init__(**kwargs)
+
+        # Imported here as the tracker initializes its backends when it's imported
+        from track.tracker import _instantiate_backend_from_name
+        self.backend = _instantiate_backend_from_name(backend['ENGINE'], backend.get('OPTIONS', {}))
+
+        self.max_queue_size = max_queue_size
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.block_when_full = block_when_full
+
+        self.queue = None
+        self._thread = None
+        self._pid = None
+        self._thread_lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._batch_ready = threading.Event()
+
+        atexit.register(self.flush)
+
+    def _ensure_thread(self):
+        """
+        Starts the thread sending the queued events, if it isn't running in this process.
+        """
+        if self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._pid != os.getpid():
+                # A forked process starts with a fresh queue, leaving the parent to send the events it queued
+                self.queue = Queue.Queue(self.max_queue_size)
+                self._batch_ready = threading.Event()
+                self._pid = os.getpid()
+                self._thread = None
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='BufferedBackend')
+                self._thread.daemon = True
+                self._thread.start()
+
+    def send(self, event):
+        """Queue the event to be sent, or drop it if the queue is full."""
+        self._ensure_thread()
+        try:
+            self.queue.put(event, self.block_when_full, self.flush_interval)
+        except Queue.Full:
+            dog_stats_api.increment('track.send.buffered.dropped')
+            log.warning('Dropped an event as the buffered event tracker backend queue is full')
+        else:
+            if self.queue.qsize() >= self.flush_size:
+                self._batch_ready.set()
+
+    def _run(self):
+        """Send the queued events every flush interval, or whenever a batch is ready, forever."""
+        while True:
+            self._batch_ready.wait(self.flush_interval)
+            self._batch_ready.clear()
+            self.flush()
+
+    def flush(self):
+        """
+        Send all the queued events now, in batches of at most flush_size.
+        """
+        if self.queue is None or self._pid != os.getpid():
+            return
+        with self._send_lock:
+            events = []
+            while True:
+                try:
+                    events.append(self.queue.get_nowait())
+                except Queue.Empty:
+                    break
+            for index in xrange(0, len(events), self.flush_size):
+                try:
+                    self.backend.send_many(events[index:index + self.flush_size])
+                except Exception:  # pylint: disable=broad-except
+                    log.exception('Error sending events from the buffered event tracker backend')
@@ -0,0 +1,71 @@
+from __future__ import absolute_import
+
+import threading
+
+from mock import patch
+
+from django.test import TestCase
+
+from track.backends import BaseBackend
+from track.backends.buffered import BufferedBackend
+
+
+class RecordingBackend(BaseBackend):
+    """Backend which records the batches of events sent to it."""
+
+    def __init__(self, **kwargs):
+        super(RecordingBackend, self).__init__(**kwargs)
+        self.batches = []
+        self.sent = threading.Event()
+
+    def send(self, event):
+        self.send_many([event])
+
+    def send_many(self, events):
+        self.batches.append(events)
+        self.sent.set()
+
+
+class TestBufferedBackend(TestCase):
+    def make_backend(self, **options):
+        """Returns a BufferedBackend sending events to a RecordingBackend."""
+        backend = BufferedBackend(
+            backend={'ENGINE': 'track.backends.tests.test_buffered.RecordingBackend'},
+            **options
+        )
+        self.addCleanup(backend.flush)
+        return backend
+
+    def test_batch_sent_when_full(self):
+        backend = self.make_backend(flush_interval=60, flush_size=2)
+        backend.send({'test': 1})
+        backend.send({'test': 2})
+
+        self.assertTrue(backend.backend.sent.wait(5))
+        self.assertEqual(backend.backend.batches, [[{'test': 1}, {'test': 2}]])
+
+    def test_events_sent_after_flush_interval(self):
+        backend = self.make_backend(flush_interval=0.01, flush_size=100)
+        backend.send({'test': 1})
+
+        self.assertTrue(backend.backend.sent.wait(5))
+        self.assertEqual(backend.backend.batches, [[{'test': 1}]])
+
+    @patch.object(BufferedBackend, '_run')
+    def test_flush(self, _run):
+        backend = self.make_backend(flush_size=2)
+        for i in range(3):
+            backend.send({'test': i})
+        self.assertEqual(backend.backend.batches, [])
+
+        backend.flush()
+        self.assertEqual(backend.backend.batches, [[{'test': 0}, {'test': 1}], [{'test': 2}]])
+
+    @patch.object(BufferedBackend, '_run')
+    def test_events_dropped_when_queue_full(self, _run):
+        backend = self.make_backend(max_queue_size=2)
+        for i in range(3):
+            backend.send({'test': i})
+
+        backend.flush()
+        self.assertEqual(backend.backend.batches, [[{'test': 0}, {'test': 1}]])
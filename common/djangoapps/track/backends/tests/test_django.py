@@ -24,3 +24,12 @@ class TestDjangoBackend(TestCase):
 
         # Check if time is stored in UTC
         self.assertEqual(str(results[0].time), '2013-01-01 17:01:00+00:00')
+
+    def test_django_backend_send_many(self):
+        self.backend.send_many([
+            {'username': 'first', 'time': '2013-01-01T12:01:00-05:00'},
+            {'username': 'second', 'time': '2013-01-01T12:02:00-05:00'},
+        ])
+
+        usernames = TrackingLog.objects.order_by('time').values_list('username', flat=True)
+        self.assertEqual(list(usernames), ['first', 'second'])
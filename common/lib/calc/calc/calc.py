@@ -4,9 +4,12 @@ Parser and evaluator for FormulaResponse and NumericalResponse
 Uses pyparsing to parse. Main function as of now is evaluator().
 """
 
+from collections import OrderedDict
 import math
 import operator
 import numbers
+import threading
+
 import numpy
 import scipy.constants
 import functions
@@ -73,6 +76,13 @@ SUFFIXES = {
 }
 
 
+# The number of parsed expressions to keep. Grading evaluates the same few
+# expressions (the instructor's answer and recent student answers) repeatedly.
+PARSE_CACHE_SIZE = 1024
+_PARSE_CACHE = OrderedDict()
+_PARSE_CACHE_LOCK = threading.Lock()
+
+
 class UndefinedVariable(Exception):
     """
     Indicate when a student inputs a variable which was not expected.
@@ -105,6 +115,16 @@ def super_float(text):
         return float(text)
 
 
+def is_value(token):
+    """
+    Return whether a token is a (previously calculated) value, rather than an
+    operator or parenthesis.
+
+    Values are numbers, or NumPy arrays of numbers when evaluating samples.
+    """
+    return isinstance(token, (numbers.Number, numpy.ndarray))
+
+
 def eval_number(parse_result):
     """
     Create a float out of its string parts.
@@ -121,8 +141,8 @@ def eval_atom(parse_result):
 
     In the case of parenthesis, ignore them.
     """
-    # Find first number in the list
-    result = next(k for k in parse_result if isinstance(k, numbers.Number))
+    # Find first number (or array of numbers) in the list
+    result = next(k for k in parse_result if is_value(k))
     return result
 
 
@@ -136,7 +156,7 @@ def eval_power(parse_result):
     # `reduce` will go from left to right; reverse the list.
     parse_result = reversed(
         [k for k in parse_result
-         if isinstance(k, numbers.Number)]  # Ignore the '^' marks.
+         if is_value(k)]  # Ignore the '^' marks.
     )
     # Having reversed it, raise `b` to the power of `a`.
     power = reduce(lambda a, b: b ** a, parse_result)
@@ -155,10 +175,16 @@ def eval_parallel(parse_result):
     """
     if len(parse_result) == 1:
         return parse_result[0]
-    if 0 in parse_result:
+    values = [e for e in parse_result if is_value(e)]
+    if any(isinstance(e, numpy.ndarray) for e in values):
+        # Evaluating samples: the result is NaN for the samples with a zero input.
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            result = 1. / sum(1. / e for e in values)
+        has_zero = reduce(numpy.logical_or, [e == 0 for e in values])
+        return numpy.where(has_zero, float('nan'), result)
+    if 0 in values:
         return float('nan')
-    reciprocals = [1. / e for e in parse_result
-                   if isinstance(e, numbers.Number)]
+    reciprocals = [1. / e for e in values]
     return 1. / sum(reciprocals)
 
 
@@ -173,12 +199,12 @@ def eval_sum(parse_result):
     total = 0.0
     current_op = operator.add
     for token in parse_result:
-        if token == '+':
+        if is_value(token):
+            total = current_op(total, token)
+        elif token == '+':
             current_op = operator.add
         elif token == '-':
             current_op = operator.sub
-        else:
-            total = current_op(total, token)
     return total
 
 
@@ -191,12 +217,12 @@ def eval_product(parse_result):
     prod = 1.0
     current_op = operator.mul
     for token in parse_result:
-        if token == '*':
+        if is_value(token):
+            prod = current_op(prod, token)
+        elif token == '*':
             current_op = operator.mul
         elif token == '/':
             current_op = operator.truediv
-        else:
-            prod = current_op(prod, token)
     return prod
 
 
@@ -216,6 +242,32 @@ def add_defaults(variables, functions, case_sensitive):
     return (all_variables, all_functions)
 
 
+def parse_expression(math_expr, case_sensitive=False):
+    """
+    Return a `ParseAugmenter` holding the parse of `math_expr`.
+
+    Parses are cached by expression, so re-evaluating an expression (e.g. at
+    other values of its variables) doesn't parse it again. The returned object
+    is shared and must not be modified.
+    """
+    key = (math_expr, case_sensitive)
+    with _PARSE_CACHE_LOCK:
+        math_interpreter = _PARSE_CACHE.pop(key, None)
+        if math_interpreter is not None:
+            # Re-insert it as the most recently used
+            _PARSE_CACHE[key] = math_interpreter
+            return math_interpreter
+
+    math_interpreter = ParseAugmenter(math_expr, case_sensitive)
+    math_interpreter.parse_algebra()
+
+    with _PARSE_CACHE_LOCK:
+        _PARSE_CACHE[key] = math_interpreter
+        while len(_PARSE_CACHE) > PARSE_CACHE_SIZE:
+            _PARSE_CACHE.popitem(last=False)
+    return math_interpreter
+
+
 def evaluator(variables, functions, math_expr, case_sensitive=False):
     """
     Evaluate an expression; that is, take a string of math and return a float.
@@ -228,9 +280,44 @@ def evaluator(variables, functions, math_expr, case_sensitive=False):
     if math_expr.strip() == "":
         return float('nan')
 
+    return evaluate_tree(variables, functions, math_expr, case_sensitive, call_function)
+
+
+def evaluate_samples(variables, functions, math_expr, case_sensitive=False):
+    """
+    Evaluate an expression at many samples of its variables at once.
+
+    -Variables are passed as a dictionary from string to value. The values are
+     NumPy arrays of the same length, one element per sample, or python
+     numbers which are the same for every sample.
+    -Unary functions are passed as a dictionary from string to function. They
+     are given arrays; those which only work on numbers are applied to each
+     element in turn.
+
+    Return a NumPy array of the expression's value at each sample. Where
+    `evaluator` raises (e.g. on a division by zero), NumPy's arithmetic gives
+    inf or nan instead.
+    """
+    sizes = set(numpy.size(value) for value in variables.values() if isinstance(value, numpy.ndarray))
+    if len(sizes) > 1:
+        raise ValueError("Samples of the variables differ in length")
+    size = sizes.pop() if sizes else 1
+
+    if math_expr.strip() == "":
+        return numpy.repeat(float('nan'), size)
+
+    with numpy.errstate(all='ignore'):
+        result = evaluate_tree(variables, functions, math_expr, case_sensitive, call_function_on_samples)
+        # Expressions which don't depend on any samples evaluate to a single value
+        return numpy.asarray(result) * numpy.ones(size)
+
+
+def evaluate_tree(variables, functions, math_expr, case_sensitive, function_caller):
+    """
+    Evaluate a (nonempty) expression, calling functions with `function_caller`.
+    """
     # Parse the tree.
-    math_interpreter = ParseAugmenter(math_expr, case_sensitive)
-    math_interpreter.parse_algebra()
+    math_interpreter = parse_expression(math_expr, case_sensitive)
 
     # Get our variables together.
     all_variables, all_functions = add_defaults(variables, functions, case_sensitive)
@@ -247,7 +334,7 @@ def evaluator(variables, functions, math_expr, case_sensitive=False):
     evaluate_actions = {
         'number': eval_number,
         'variable': lambda x: all_variables[casify(x[0])],
-        'function': lambda x: all_functions[casify(x[0])](x[1]),
+        'function': lambda x: function_caller(all_functions[casify(x[0])], x[1]),
         'atom': eval_atom,
         'power': eval_power,
         'parallel': eval_parallel,
@@ -258,6 +345,31 @@ def evaluator(variables, functions, math_expr, case_sensitive=False):
     return math_interpreter.reduce_tree(evaluate_actions)
 
 
+def call_function(function, arg):
+    """
+    Call a unary function on a number.
+    """
+    return function(arg)
+
+
+def call_function_on_samples(function, arg):
+    """
+    Call a unary function on an array of samples.
+
+    Functions which can't take arrays (e.g. `math.factorial`) are called on
+    each sample in turn.
+    """
+    if not isinstance(arg, numpy.ndarray):
+        return function(arg)
+    try:
+        result = function(arg)
+    except (TypeError, ValueError):
+        result = None
+    if not isinstance(result, numpy.ndarray) or result.shape != arg.shape:
+        result = numpy.array([function(value) for value in arg.tolist()])
+    return result
+
+
 class ParseAugmenter(object):
     """
     Holds the data for a particular parse.
@@ -559,3 +559,92 @@ class EvaluatorTest(unittest.TestCase):
             calc.evaluator({'r1': 5}, {}, "r1+r2")
         with self.assertRaisesRegexp(calc.UndefinedVariable, 'r1 r3'):
             calc.evaluator(variables, {}, "r1*r3", case_sensitive=True)
+
+
+class ParseCacheTest(unittest.TestCase):
+    """
+    Test that parsed expressions are cached and reused
+    """
+    def test_reused(self):
+        """
+        Parsing an expression again returns the same parse
+        """
+        parsed = calc.parse_expression("x^2 + 17*y")
+        self.assertIs(calc.parse_expression("x^2 + 17*y"), parsed)
+        self.assertIsNot(calc.parse_expression("x^2 + 17*y", case_sensitive=True), parsed)
+        self.assertEqual(calc.evaluator({'x': 2, 'y': 1}, {}, "x^2 + 17*y"), 21)
+        self.assertEqual(calc.evaluator({'x': 3, 'y': 0}, {}, "x^2 + 17*y"), 9)
+
+    def test_size_limit(self):
+        """
+        The least recently used parses are dropped beyond PARSE_CACHE_SIZE
+        """
+        parsed = calc.parse_expression("1+2")
+        for index in range(calc.PARSE_CACHE_SIZE):
+            calc.parse_expression(str(index))
+        self.assertLessEqual(len(calc._PARSE_CACHE), calc.PARSE_CACHE_SIZE)  # pylint: disable=protected-access
+        self.assertIsNot(calc.parse_expression("1+2"), parsed)
+
+    def test_parse_errors_not_cached(self):
+        """
+        Unparseable expressions raise every time
+        """
+        for __ in range(2):
+            with self.assertRaises(ParseException):
+                calc.parse_expression("1+*2")
+
+
+class EvaluateSamplesTest(unittest.TestCase):
+    """
+    Test evaluating an expression at arrays of samples of its variables
+    """
+    def assert_matches_evaluator(self, variables, functions, math_expr):
+        """
+        Check that evaluate_samples agrees with evaluator at each sample
+        """
+        results = calc.evaluate_samples(variables, functions, math_expr)
+        size = len(results)
+        for index in range(size):
+            sample = {
+                name: (value[index] if isinstance(value, numpy.ndarray) else value)
+                for name, value in variables.items()
+            }
+            self.assertAlmostEqual(results[index], calc.evaluator(sample, functions, math_expr))
+
+    def test_arithmetic(self):
+        variables = {'x': numpy.array([1.0, 2.5, -3.0]), 'y': numpy.array([4.0, 0.5, 7.0])}
+        self.assert_matches_evaluator(variables, {}, "x^2 + 3*y - x/y")
+        self.assert_matches_evaluator(variables, {}, "-x + (y - 2)*2^x")
+        self.assert_matches_evaluator(variables, {}, "x || y")
+        self.assert_matches_evaluator(variables, {}, "2k*x + 5%")
+
+    def test_functions(self):
+        variables = {'x': numpy.array([0.5, 1.5, 2.0])}
+        self.assert_matches_evaluator(variables, {}, "sin(x) + sqrt(x) * ln(x)")
+        self.assert_matches_evaluator(variables, {}, "sec(x) + arccot(x)")
+        self.assert_matches_evaluator(variables, {'f': lambda z: 2 * z}, "f(x)^2")
+
+    def test_scalar_only_functions(self):
+        variables = {'n': numpy.array([1.0, 3.0, 5.0])}
+        results = calc.evaluate_samples(variables, {}, "fact(n)")
+        self.assertEqual(results.tolist(), [1, 6, 120])
+
+    def test_broadcast(self):
+        variables = {'x': numpy.array([1.0, 2.0]), 'a': 3.0}
+        self.assertEqual(calc.evaluate_samples(variables, {}, "a*x").tolist(), [3.0, 6.0])
+        self.assertEqual(calc.evaluate_samples(variables, {}, "a + 1").tolist(), [4.0, 4.0])
+        self.assertTrue(numpy.all(numpy.isnan(calc.evaluate_samples(variables, {}, " "))))
+
+    def test_non_finite(self):
+        variables = {'x': numpy.array([0.0, 2.0])}
+        results = calc.evaluate_samples(variables, {}, "1/x")
+        self.assertTrue(numpy.isinf(results[0]))
+        self.assertEqual(results[1], 0.5)
+        results = calc.evaluate_samples(variables, {}, "x || 1")
+        self.assertTrue(numpy.isnan(results[0]))
+
+    def test_errors(self):
+        with self.assertRaises(calc.UndefinedVariable):
+            calc.evaluate_samples({'x': numpy.array([1.0])}, {}, "x + y")
+        with self.assertRaises(ValueError):
+            calc.evaluate_samples({'x': numpy.array([1.0]), 'y': numpy.array([1.0, 2.0])}, {}, "x + y")
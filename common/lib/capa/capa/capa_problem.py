@@ -13,11 +13,15 @@ Main module which shows problems (of "capa" type).
 This is used by capa_module.
 """
 
-from copy import deepcopy
+from collections import OrderedDict
+from contextlib import contextmanager
+from copy import copy, deepcopy
 from datetime import datetime
+import hashlib
 import logging
 import os.path
 import re
+import threading
 
 from lxml import etree
 from pytz import UTC
@@ -181,9 +185,9 @@ class LoncapaProblem(object):
         if not self.student_answers:  # True when student_answers is an empty dict
             self.set_initial_display()
 
-        # dictionary of InputType objects associated with this problem
+        # dictionary of InputType objects associated with this problem (see `inputs`)
         #   input_id string -> InputType object
-        self.inputs = {}
+        self._inputs = {}
 
         # Run response late_transforms last (see MultipleChoiceResponse)
         # Sort the responses to be in *_1 *_2 ... order.
@@ -193,7 +197,86 @@ class LoncapaProblem(object):
             if hasattr(response, 'late_transforms'):
                 response.late_transforms(self)
 
-        self.extracted_tree = self._extract_html(self.tree)
+        # The problem's HTML, and the InputTypes rendering it, are only built when
+        # first needed (see `extracted_tree`), so problems which are only graded
+        # never build them.
+        self._extracted_tree = None
+
+        # Whether the tree is shared with other problems (see `copy_for_grading`)
+        self._shares_tree = False
+
+    @property
+    def extracted_tree(self):
+        """
+        The Element tree of the XHTML representation of the problem, extracted
+        from the problem's XML when it's first needed.
+        """
+        if self._extracted_tree is None:
+            self._unshare_tree()
+            self._extracted_tree = self._extract_html(self.tree)
+        return self._extracted_tree
+
+    @property
+    def inputs(self):
+        """
+        Dictionary of the InputType objects associated with this problem, mapping
+        input_id strings to InputType objects.  They're created by extracting the
+        problem's HTML, which is done if it hasn't been yet.
+        """
+        self.extracted_tree  # pylint: disable=pointless-statement
+        return self._inputs
+
+    def copy_for_grading(self, capa_system, capa_module, state=None):
+        """
+        Returns a copy of this problem holding the student state `state`, for
+        use by `capa_module`, without parsing the problem again.
+
+        The copy shares this problem's XML tree and its responders' definitions,
+        which grading answers (e.g. to rescore them) leaves unchanged.  Rendering
+        the copy changes its tree, so before that the copy parses the problem
+        for itself (see `_unshare_tree`).  Its seed is this problem's.
+        """
+        problem = copy(self)
+        problem._shares_tree = True  # pylint: disable=protected-access
+        problem.capa_system = capa_system
+        problem.capa_module = capa_module
+
+        # Responders update the script context when they grade, so each copy gets its own.
+        problem.context = dict(self.context)
+        problem.responders = {}
+        for response, responder in self.responders.iteritems():
+            responder = copy(responder)
+            responder.capa_system = capa_system
+            responder.capa_module = capa_module
+            responder.context = problem.context
+            problem.responders[response] = responder
+
+        state = state or {}
+        problem.do_reset()
+        problem.student_answers = state.get('student_answers', {})
+        if 'correct_map' in state:
+            problem.correct_map.set_dict(state['correct_map'])
+        problem.done = state.get('done', False)
+        problem.input_state = state.get('input_state', {})
+        if not problem.student_answers:
+            problem.set_initial_display()
+
+        problem._inputs = {}  # pylint: disable=protected-access
+        problem._extracted_tree = None  # pylint: disable=protected-access
+        return problem
+
+    def _unshare_tree(self):
+        """
+        Gives a problem made by `copy_for_grading` its own parse of the problem,
+        keeping its student state, so that its tree can be changed.
+        """
+        if not self._shares_tree:
+            return
+        problem = LoncapaProblem(
+            self.problem_text, self.problem_id, self.capa_system, self.capa_module,
+            state=self.get_state(), seed=self.seed,
+        )
+        self.__dict__.update(problem.__dict__)
 
     def make_xml_compatible(self, tree):
         """
@@ -282,6 +365,22 @@ class LoncapaProblem(object):
             maxscore += responder.get_max_score()
         return maxscore
 
+    def get_static_metadata(self):
+        """
+        Return the parts of the problem which don't depend on the student, as a dict:
+            'max_score': as returned by get_max_score()
+            'response_types': the tags of the problem's responses, in document order
+            'answer_ids': the ids of the problem's inputs, in document order
+        These only change when the problem's XML does, so they can be cached per
+        version of the problem.
+        """
+        responders = [self.responders[response] for response in self.tree.iter() if response in self.responders]
+        return {
+            'max_score': self.get_max_score(),
+            'response_types': [responder.xml.tag for responder in responders],
+            'answer_ids': [answer_id for responder in responders for answer_id in responder.answer_ids],
+        }
+
     def get_score(self):
         """
         Compute score for this problem.  The score is the number of points awarded.
@@ -554,8 +653,10 @@ class LoncapaProblem(object):
         """
         Main method called externally to get the HTML to be rendered for this capa Problem.
         """
+        self._unshare_tree()
         self.do_targeted_feedback(self.tree)
-        html = contextualize_text(etree.tostring(self._extract_html(self.tree)), self.context)
+        self._extracted_tree = self._extract_html(self.tree)
+        html = contextualize_text(etree.tostring(self._extracted_tree), self.context)
         return html
 
     def handle_input_ajax(self, data):
@@ -796,8 +897,8 @@ class LoncapaProblem(object):
 
             input_type_cls = inputtypes.registry.get_class_for_tag(problemtree.tag)
             # save the input type so that we can make ajax calls on it if we need to
-            self.inputs[input_id] = input_type_cls(self.capa_system, problemtree, state)
-            return self.inputs[input_id].get_html()
+            self._inputs[input_id] = input_type_cls(self.capa_system, problemtree, state)
+            return self._inputs[input_id].get_html()
 
         # let each Response render itself
         if problemtree in self.responders:
@@ -888,3 +989,68 @@ class LoncapaProblem(object):
         for solution in tree.findall('.//solution'):
             solution.attrib['id'] = "%s_solution_%i" % (self.problem_id, solution_id)
             solution_id += 1
+
+
+class ProblemTemplateCache(object):
+    """
+    Parsed problems, keyed by a hash of the problem text, id and seed, from which problems
+    for other students with the same seed are copied (see
+    `LoncapaProblem.copy_for_grading`) rather than parsed again.  Problems whose
+    text refers to `anonymous_student_id` can have different answers for each
+    student, so they're also keyed by the student.
+
+    Copied problems only save work when they're just graded, since rendering
+    one parses the problem again, so a cache is only made active, by
+    `problem_templates`, around code which grades many students' answers to
+    the same problems, such as rescoring.
+    """
+    def __init__(self, max_size=100):
+        self.max_size = max_size
+        self.templates = OrderedDict()
+
+    def get_problem(self, problem_text, problem_id, capa_system, capa_module, state=None, seed=None):
+        """
+        Returns a problem for grading the student state `state`, parsing the
+        problem only if no problem with the same text, id and seed was parsed
+        before (for the same student, if the problem's scripts can depend on
+        the student).  Arguments are as for `LoncapaProblem`.
+        """
+        state = state or {}
+        text_hash = hashlib.sha1(
+            problem_text.encode('utf-8') if isinstance(problem_text, unicode) else problem_text
+        ).hexdigest()
+        # The script context includes the student's anonymous id, which scripts may use to personalise the problem
+        student_id = capa_system.anonymous_student_id if 'anonymous_student_id' in problem_text else None
+        key = (text_hash, problem_id, state.get('seed', seed), student_id)
+        template = self.templates.pop(key, None)
+        if template is None:
+            template = LoncapaProblem(problem_text, problem_id, capa_system, capa_module, seed=key[2])
+            if len(self.templates) >= self.max_size:
+                self.templates.popitem(last=False)
+        # (Re)insert the template as the most recently used one
+        self.templates[key] = template
+        return template.copy_for_grading(capa_system, capa_module, state)
+
+
+_ACTIVE_TEMPLATES = threading.local()
+
+
+@contextmanager
+def problem_templates(max_size=100):
+    """
+    Makes a `ProblemTemplateCache` the active one for the current thread
+    within the block, and yields it.
+    """
+    previous = get_problem_template_cache()
+    _ACTIVE_TEMPLATES.cache = ProblemTemplateCache(max_size)
+    try:
+        yield _ACTIVE_TEMPLATES.cache
+    finally:
+        _ACTIVE_TEMPLATES.cache = previous
+
+
+def get_problem_template_cache():
+    """
+    Returns the `ProblemTemplateCache` active in the current thread, or None.
+    """
+    return getattr(_ACTIVE_TEMPLATES, 'cache', None)
@@ -36,7 +36,7 @@ from shapely.geometry import Point, MultiPoint
 import dogstats_wrapper as dog_stats_api
 
 # specific library imports
-from calc import evaluator, UndefinedVariable
+from calc import evaluator, evaluate_samples, UndefinedVariable
 from . import correctmap
 from .registry import TagRegistry
 from datetime import datetime
@@ -3181,6 +3181,10 @@ class FormulaResponse(LoncapaResponse):
         """
         _ = self.capa_system.i18n.ugettext
 
+        sampled = self.evaluate_samples(answer, var_dict_list)
+        if sampled is not None:
+            return sampled
+
         out = []
         for var_dict in var_dict_list:
             try:
@@ -3232,6 +3236,28 @@ class FormulaResponse(LoncapaResponse):
                 )
         return out
 
+    def evaluate_samples(self, answer, var_dict_list):
+        """
+        Evaluates answer at all of the test cases in var_dict_list in a single pass.
+
+        Returns a list of the results, or None if the answer fails to evaluate or has
+        a non-finite value at some test case. Those answers are evaluated one test case
+        at a time by tupleize_answers, which reports their errors.
+        """
+        if not var_dict_list:
+            return None
+        variables = {
+            name: numpy.array([var_dict[name] for var_dict in var_dict_list])
+            for name in var_dict_list[0]
+        }
+        try:
+            results = evaluate_samples(variables, dict(), answer, case_sensitive=self.case_sensitive)
+        except Exception:  # pylint: disable=broad-except
+            return None
+        if not numpy.all(numpy.isfinite(results)):
+            return None
+        return results.tolist()
+
     def randomize_variables(self, samples):
         """
         Returns a list of dictionaries mapping variables to random values in range,
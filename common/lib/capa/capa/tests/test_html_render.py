@@ -7,6 +7,7 @@ import mock
 
 from .response_xml_factory import StringResponseXMLFactory, CustomResponseXMLFactory
 from . import test_capa_system, new_loncapa_problem
+from capa.capa_problem import LoncapaProblem
 
 
 class CapaHtmlRenderTest(unittest.TestCase):
@@ -272,6 +273,19 @@ class CapaHtmlRenderTest(unittest.TestCase):
         the_html = problem.get_html()
         self.assertRegexpMatches(the_html, r"<div>\s+</div>")
 
+    def test_html_extracted_when_needed(self):
+        xml_str = StringResponseXMLFactory().build_xml(answer="Test String")
+        extract_html_fcn = LoncapaProblem._extract_html  # pylint: disable=protected-access
+        patcher = mock.patch.object(LoncapaProblem, '_extract_html', autospec=True, side_effect=extract_html_fcn)
+        with patcher as extract_html:
+            problem = new_loncapa_problem(xml_str)
+            problem.grade_answers({'1_2_1': 'Test String'})
+            self.assertFalse(extract_html.called)
+
+            # The inputs are created by extracting the HTML
+            self.assertEqual(problem.inputs.keys(), ['1_2_1'])
+            self.assertTrue(extract_html.called)
+
     def _create_test_file(self, path, content_str):
         test_fp = self.capa_system.filestore.open(path, "w")
         test_fp.write(content_str)
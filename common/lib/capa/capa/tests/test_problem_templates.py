@@ -0,0 +1,110 @@
+"""
+Tests of grading copies of parsed problems.
+"""
+import unittest
+
+from capa.capa_problem import ProblemTemplateCache, get_problem_template_cache, problem_templates
+from capa.tests import mock_capa_module, new_loncapa_problem, test_capa_system
+from capa.tests.response_xml_factory import NumericalResponseXMLFactory
+
+
+class ProblemTemplateCacheTest(unittest.TestCase):
+    """
+    Tests of ProblemTemplateCache and LoncapaProblem.copy_for_grading.
+    """
+    def setUp(self):
+        super(ProblemTemplateCacheTest, self).setUp()
+        # The answer depends on the seed
+        self.xml = NumericalResponseXMLFactory().build_xml(
+            script='x = random.randint(1, 100000)', answer='$x', tolerance=0
+        )
+        self.answer_id = '1_2_1'
+
+    def get_problem(self, cache, seed, answer):
+        """
+        Returns a problem from the cache for a student with the given seed and answer.
+        """
+        state = {'seed': seed, 'student_answers': {self.answer_id: str(answer)}}
+        return cache.get_problem(self.xml, '1', test_capa_system(), mock_capa_module(), state=state)
+
+    def test_copies_grade_like_parsed_problems(self):
+        answer = new_loncapa_problem(self.xml, seed=1).context['x']
+        cache = ProblemTemplateCache()
+
+        right = self.get_problem(cache, 1, answer)
+        wrong = self.get_problem(cache, 1, answer + 1)
+        self.assertEqual(len(cache.templates), 1)
+        self.assertIs(right.tree, wrong.tree)
+
+        self.assertEqual(right.rescore_existing_answers().get_correctness(self.answer_id), 'correct')
+        self.assertEqual(wrong.rescore_existing_answers().get_correctness(self.answer_id), 'incorrect')
+        # Grading one copy doesn't affect another
+        self.assertEqual(right.correct_map.get_correctness(self.answer_id), 'correct')
+
+    def test_copies_use_their_own_module(self):
+        cache = ProblemTemplateCache()
+        first = self.get_problem(cache, 1, 1)
+        second = self.get_problem(cache, 1, 1)
+        self.assertIsNot(first.capa_module, second.capa_module)
+        for problem in (first, second):
+            for responder in problem.responders.values():
+                self.assertIs(responder.capa_module, problem.capa_module)
+                self.assertIs(responder.context, problem.context)
+
+    def test_rendering_copies_own_tree(self):
+        cache = ProblemTemplateCache()
+        template_problem = self.get_problem(cache, 1, 1)
+        problem = self.get_problem(cache, 1, 1)
+        self.assertIs(problem.tree, template_problem.tree)
+
+        problem.get_html()
+        self.assertIsNot(problem.tree, template_problem.tree)
+        self.assertEqual(problem.student_answers, {self.answer_id: '1'})
+        self.assertEqual(problem.inputs.keys(), [self.answer_id])
+        self.assertEqual(template_problem.inputs.keys(), [self.answer_id])
+        self.assertIsNot(problem.inputs[self.answer_id], template_problem.inputs[self.answer_id])
+
+    def test_templates_per_seed(self):
+        cache = ProblemTemplateCache()
+        answers = {seed: new_loncapa_problem(self.xml, seed=seed).context['x'] for seed in (1, 2)}
+        for seed, answer in answers.items():
+            problem = self.get_problem(cache, seed, answer)
+            self.assertEqual(problem.seed, seed)
+            self.assertEqual(problem.rescore_existing_answers().get_correctness(self.answer_id), 'correct')
+        self.assertEqual(len(cache.templates), 2)
+
+    def test_templates_per_student_when_scripts_use_student(self):
+        self.xml = NumericalResponseXMLFactory().build_xml(
+            script='x = len(anonymous_student_id)', answer='$x', tolerance=0
+        )
+        cache = ProblemTemplateCache()
+        for student_id in ('student', 'another_student'):
+            capa_system = test_capa_system()
+            capa_system.anonymous_student_id = student_id
+            state = {'seed': 1, 'student_answers': {self.answer_id: str(len(student_id))}}
+            problem = cache.get_problem(self.xml, '1', capa_system, mock_capa_module(), state=state)
+            self.assertEqual(problem.rescore_existing_answers().get_correctness(self.answer_id), 'correct')
+        self.assertEqual(len(cache.templates), 2)
+
+    def test_templates_shared_between_students(self):
+        cache = ProblemTemplateCache()
+        for student_id in ('student', 'another_student'):
+            capa_system = test_capa_system()
+            capa_system.anonymous_student_id = student_id
+            cache.get_problem(self.xml, '1', capa_system, mock_capa_module(), state={'seed': 1})
+        self.assertEqual(len(cache.templates), 1)
+
+    def test_least_recently_used_template_is_evicted(self):
+        cache = ProblemTemplateCache(max_size=2)
+        for seed in (1, 2, 1, 3):
+            self.get_problem(cache, seed, 0)
+        self.assertEqual([key[2] for key in cache.templates], [1, 3])
+
+    def test_active_cache(self):
+        self.assertIsNone(get_problem_template_cache())
+        with problem_templates() as cache:
+            self.assertIs(get_problem_template_cache(), cache)
+            with problem_templates() as inner_cache:
+                self.assertIs(get_problem_template_cache(), inner_cache)
+            self.assertIs(get_problem_template_cache(), cache)
+        self.assertIsNone(get_problem_template_cache())
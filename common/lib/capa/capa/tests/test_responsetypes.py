@@ -410,6 +410,22 @@ class FormulaResponseTest(ResponseTest):
         input_formula = "x + y"
         self.assert_grade(problem, input_formula, "incorrect")
 
+    def test_grade_evaluates_samples_at_once(self):
+        """
+        Test that formulas are evaluated at all of the samples in one pass,
+        rather than once per sample
+        """
+        sample_dict = {'x': (1, 10), 'y': (1, 10)}
+        problem = self.build_problem(sample_dict=sample_dict,
+                                     num_samples=10,
+                                     tolerance=0.01,
+                                     answer="x+2*y")
+
+        with mock.patch('capa.responsetypes.evaluator', wraps=calc.evaluator) as mock_evaluator:
+            self.assert_grade(problem, "sqrt(x^2) + y*2", "correct")
+            self.assert_grade(problem, "x*y", "incorrect")
+        self.assertFalse(mock_evaluator.called)
+
     def test_hint(self):
         """
         Test the hint-giving functionality of FormulaResponse
@@ -11,6 +11,8 @@ import struct
 import sys
 import re
 
+from bson import ObjectId
+
 # We don't want to force a dependency on datadog, so make the import conditional
 try:
     import dogstats_wrapper as dog_stats_api
@@ -18,7 +20,7 @@ except ImportError:
     # pylint: disable=invalid-name
     dog_stats_api = None
 
-from capa.capa_problem import LoncapaProblem, LoncapaSystem
+from capa.capa_problem import LoncapaProblem, LoncapaSystem, get_problem_template_cache
 from capa.responsetypes import StudentInputError, \
     ResponseError, LoncapaProblemError
 from capa.util import convert_files_to_filenames
@@ -30,6 +32,12 @@ from django.utils.timezone import UTC
 from xmodule.capa_base_constants import RANDOMIZATION, SHOWANSWER
 from django.conf import settings
 
+try:
+    from django.core.cache import get_cache, InvalidCacheBackendError
+    DJANGO_CACHE_AVAILABLE = True
+except ImportError:
+    DJANGO_CACHE_AVAILABLE = False
+
 log = logging.getLogger("edx.courseware")
 
 # Make '_' a no-op so we can scrape strings
@@ -57,6 +65,60 @@ def randomization_bin(seed, problem_id):
     return int(r_hash.hexdigest()[:7], 16) % NUM_RANDOMIZATION_BINS
 
 
+# The name of the Django cache holding the static metadata of problems (see `get_cached_static_metadata`).
+STATIC_METADATA_CACHE_NAME = 'default'
+
+
+def _static_metadata_cache():
+    """
+    Returns the Django cache holding the static metadata of problems, or None
+    if there is none (e.g. when Django isn't configured).
+    """
+    if not DJANGO_CACHE_AVAILABLE:
+        return None
+    try:
+        return get_cache(STATIC_METADATA_CACHE_NAME)
+    except (InvalidCacheBackendError, ImportError):
+        return None
+
+
+def static_metadata_cache_key(block):
+    """
+    Returns the cache key of the static metadata of the problem `block`, made
+    from its usage key and the version of its definition.
+
+    Split modulestore definitions are versioned by their ids.  Other modulestores
+    use the usage key as the definition id, so the problem's XML is hashed instead.
+    """
+    def_id = block.scope_ids.def_id
+    if isinstance(def_id, ObjectId):
+        definition_version = unicode(def_id)
+    else:
+        data = block.data
+        if isinstance(data, unicode):
+            data = data.encode('utf-8')
+        definition_version = hashlib.sha1(data).hexdigest()
+
+    location = block.location
+    if hasattr(location, 'version_agnostic') and hasattr(location, 'for_branch'):
+        location = location.for_branch(None).version_agnostic()
+
+    key = u'{}@{}'.format(location, definition_version)
+    return 'capa.static_metadata.' + hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def get_cached_static_metadata(block):
+    """
+    Returns the static metadata of the problem `block` (see
+    `LoncapaProblem.get_static_metadata`), if it has been cached for the current
+    version of the problem's definition, or None.
+    """
+    cache = _static_metadata_cache()
+    if cache is None:
+        return None
+    return cache.get(static_metadata_cache_key(block))
+
+
 class Randomization(String):
     """
     Define a field to store how to randomize a problem.
@@ -228,6 +290,7 @@ class CapaMixin(CapaFields):
             # TODO (vshnayder): move as much as possible of this work and error
             # checking to descriptor load time
             self.lcp = self.new_lcp(self.get_state_for_lcp())
+            self.lcp_has_error = False
 
             # At this point, we need to persist the randomization seed
             # so that when the problem is re-loaded (to check/view/save)
@@ -265,6 +328,7 @@ class CapaMixin(CapaFields):
                                     msg=msg)
                                 )
                 self.lcp = self.new_lcp(self.get_state_for_lcp(), text=problem_text)
+                self.lcp_has_error = True
             else:
                 # add extra info and raise
                 raise Exception(msg), None, sys.exc_info()[2]
@@ -313,6 +377,14 @@ class CapaMixin(CapaFields):
             matlab_api_key=self.matlab_api_key
         )
 
+        template_cache = get_problem_template_cache()
+        if template_cache is not None:
+            # Only grading is done while a template cache is active (e.g. rescoring),
+            # so the problem can be copied from one already parsed for the same seed.
+            return template_cache.get_problem(
+                text, self.location.html_id(), capa_system, self, state=state, seed=self.seed
+            )
+
         return LoncapaProblem(
             problem_text=text,
             id=self.location.html_id(),
@@ -359,9 +431,22 @@ class CapaMixin(CapaFields):
 
     def max_score(self):
         """
-        Access the problem's max score
+        Access the problem's max score, caching the problem's static metadata
+        so that it can be found later without constructing the problem.
+        """
+        return self.static_metadata()['max_score']
+
+    def static_metadata(self):
+        """
+        Returns the problem's static metadata (see `LoncapaProblem.get_static_metadata`),
+        after caching it for the current version of the problem's definition.
         """
-        return self.lcp.get_max_score()
+        metadata = self.lcp.get_static_metadata()
+        if not self.lcp_has_error:
+            cache = _static_metadata_cache()
+            if cache is not None:
+                cache.set(static_metadata_cache_key(self), metadata)
+        return metadata
 
     def get_progress(self):
         """
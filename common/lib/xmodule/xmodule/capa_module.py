@@ -7,7 +7,7 @@ from lxml import etree
 from pkg_resources import resource_string
 
 import dogstats_wrapper as dog_stats_api
-from .capa_base import CapaMixin, CapaFields, ComplexEncoder
+from .capa_base import CapaMixin, CapaFields, ComplexEncoder, get_cached_static_metadata
 from capa import responsetypes
 from .progress import Progress
 from xmodule.x_module import XModule, module_attr, DEPRECATION_VSCOMPAT_EVENT
@@ -210,6 +210,24 @@ class CapaDescriptor(CapaFields, RawDescriptor):
         result.update(index)
         return result
 
+    def max_score(self):
+        """
+        Returns the problem's max score, without constructing the problem if its
+        static metadata has been cached.
+        """
+        return self.static_metadata()['max_score']
+
+    def static_metadata(self):
+        """
+        Returns the problem's static metadata (see `LoncapaProblem.get_static_metadata`),
+        without constructing the problem if it has been cached for the current version
+        of the problem's definition.
+        """
+        metadata = get_cached_static_metadata(self)
+        if metadata is None:
+            metadata = self._xmodule.static_metadata()
+        return metadata
+
     # Proxy to CapaModule for access to any of its attributes
     answer_available = module_attr('answer_available')
     check_button_name = module_attr('check_button_name')
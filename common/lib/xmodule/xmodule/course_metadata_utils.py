@@ -7,6 +7,9 @@ classes, which both need these type of functions.
 """
 from datetime import datetime
 from base64 import b32encode
+from math import exp
+
+import dateutil.parser
 
 from django.utils.timezone import UTC
 
@@ -208,3 +211,41 @@ def may_certify_for_course(certificates_display_behavior, certificates_show_befo
         or certificates_show_before_end
     )
     return show_early or has_ended
+
+
+def sorting_dates(start, advertised_start, announcement):
+    """
+    Returns the (announcement, start) dates used to tell how "new" a course is.
+    A parseable advertised start date takes priority over the start date.
+
+    Arguments:
+        start (datetime): The start datetime of the course.
+        advertised_start (str): The advertised start date.
+        announcement (datetime): The announcement date of the course, if any.
+    """
+    try:
+        start = dateutil.parser.parse(advertised_start)
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=UTC())
+    except (ValueError, AttributeError):
+        pass
+    return announcement, start
+
+
+def sorting_score(announcement, start, now):
+    """
+    Returns a number that can be used to sort courses according to how "new"
+    they are, given the dates returned by sorting_dates and the current time.
+    The lower the number the "newer" the course.
+    """
+    # Make courses that have an announcement date have a lower
+    # score than courses than don't, older courses should have a
+    # higher score.
+    scale = 300.0  # about a year
+    if announcement:
+        days = (now - announcement).days
+        score = -exp(-days / scale)
+    else:
+        days = (now - start).days
+        score = exp(days / scale)
+    return score
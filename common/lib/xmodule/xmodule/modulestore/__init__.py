@@ -619,14 +619,11 @@ class ModuleStoreAssetWriteInterface(ModuleStoreAssetBase):
     """
     The write operations for assets and asset metadata
     """
-    def _save_assets_by_type(self, course_key, asset_metadata_list, course_assets, user_id, import_only):
+    def _assets_to_save(self, course_key, asset_metadata_list, user_id, import_only):
         """
-        Common private method that saves/updates asset metadata items in the internal modulestore
-        structure used to store asset metadata items.
+        Common private method that yields the asset metadata items of the given course to save,
+        updating their edit info unless only importing them.
         """
-        # Lazily create a sorted list if not already created.
-        assets_by_type = defaultdict(lambda: SortedAssetList(iterable=course_assets.get(asset_type, [])))
-
         for asset_md in asset_metadata_list:
             if asset_md.asset_id.course_key != course_key:
                 # pylint: disable=logging-format-interpolation
@@ -636,6 +633,17 @@ class ModuleStoreAssetWriteInterface(ModuleStoreAssetBase):
                 continue
             if not import_only:
                 asset_md.update({'edited_by': user_id, 'edited_on': datetime.datetime.now(UTC)})
+            yield asset_md
+
+    def _save_assets_by_type(self, course_key, asset_metadata_list, course_assets, user_id, import_only):
+        """
+        Common private method that saves/updates asset metadata items in the internal modulestore
+        structure used to store asset metadata items.
+        """
+        # Lazily create a sorted list if not already created.
+        assets_by_type = defaultdict(lambda: SortedAssetList(iterable=course_assets.get(asset_type, [])))
+
+        for asset_md in self._assets_to_save(course_key, asset_metadata_list, user_id, import_only):
             asset_type = asset_md.asset_id.asset_type
             all_assets = assets_by_type[asset_type]
             all_assets.insert_or_update(asset_md)
@@ -1136,6 +1144,16 @@ class ModuleStoreReadBase(BulkOperationsMixin, ModuleStoreRead):
         """
         return {}
 
+    def get_course_keys(self, **kwargs):
+        """
+        Returns a list containing the keys of the courses in this modulestore. Like get_courses,
+        this can take an optional argument 'org' which limits the keys to courses of that ORG.
+
+        Default impl--the keys of the course list. Modulestores which can list their courses
+        without loading them should override this.
+        """
+        return [course.id for course in self.get_courses(**kwargs)]
+
     def get_course(self, course_id, depth=0, **kwargs):
         """
         See ModuleStoreRead.get_course
@@ -280,6 +280,20 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
                     courses[course_id] = course
         return courses.values()
 
+    @strip_key
+    def get_course_keys(self, **kwargs):
+        """
+        Returns a list containing the keys of the courses in this modulestore, without loading the courses.
+        """
+        course_keys = {}
+        for store in self.modulestores:
+            # filter out ones which were fetched from earlier stores but locations may not be ==
+            for course_key in store.get_course_keys(**kwargs):
+                course_id = self._clean_locator_for_mapping(course_key)
+                if course_id not in course_keys:
+                    course_keys[course_id] = course_key
+        return course_keys.values()
+
     @strip_key
     def get_libraries(self, **kwargs):
         """
@@ -15,7 +15,6 @@ structure:
 import pymongo
 import sys
 import logging
-import copy
 import re
 from uuid import uuid4
 
@@ -48,6 +47,7 @@ from xmodule.modulestore.draft_and_published import ModuleStoreDraftAndPublished
 from xmodule.modulestore.edit_info import EditInfoRuntimeMixin
 from xmodule.modulestore.exceptions import ItemNotFoundError, DuplicateCourseError, ReferentialIntegrityError
 from xmodule.modulestore.inheritance import InheritanceMixin, inherit_metadata, InheritanceKeyValueStore
+from xmodule.modulestore.mongo.inheritance_tree import MetadataInheritanceTree
 from xmodule.modulestore.xml import CourseLocationManager
 from xmodule.services import SettingsService
 
@@ -261,7 +261,8 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
                 parent = None
                 if self.cached_metadata is not None:
                     # fish the parent out of here if it's available
-                    parent_url = self.cached_metadata.get(unicode(location), {}).get('parent', {}).get(
+                    parent_url = self.cached_metadata.parent(
+                        unicode(location),
                         ModuleStoreEnum.Branch.published_only if location.revision is None
                         else ModuleStoreEnum.Branch.draft_preferred
                     )
@@ -300,7 +301,7 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
 
                     # Convert the serialized fields values in self.cached_metadata
                     # to python values
-                    metadata_to_inherit = self.cached_metadata.get(unicode(non_draft_loc), {})
+                    metadata_to_inherit = self.cached_metadata.inherited_metadata(unicode(non_draft_loc))
                     inherit_metadata(module, metadata_to_inherit)
 
                 module._edit_info = json_data.get('edit_info')
@@ -534,6 +535,9 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
     # If no name is specified for the asset metadata collection, this name is used.
     DEFAULT_ASSET_COLLECTION_NAME = 'assetstore'
 
+    # Suffix of the name of the collection storing one document per asset, appended to the asset collection name.
+    ASSET_METADATA_COLLECTION_SUFFIX = '.assets'
+
     # TODO (cpennington): Enable non-filesystem filestores
     # pylint: disable=invalid-name
     # pylint: disable=attribute-defined-outside-init
@@ -545,9 +549,12 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
                  user_service=None,
                  signal_handler=None,
                  retry_wait_time=0.1,
+                 asset_metadata_per_asset=False,
                  **kwargs):
         """
         :param doc_store_config: must have a host, db, and collection entries. Other common entries: port, tz_aware.
+        :param asset_metadata_per_asset: if True, store the metadata of each asset in its own document rather than
+            that of all of a course's assets in a single document.
         """
 
         super(MongoModuleStore, self).__init__(contentstore=contentstore, **kwargs)
@@ -580,6 +587,8 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             if asset_collection is None:
                 asset_collection = self.DEFAULT_ASSET_COLLECTION_NAME
             self.asset_collection = self.database[asset_collection]
+            # Collection which stores asset metadata with a document per asset.
+            self.asset_metadata_collection = self.database[asset_collection + self.ASSET_METADATA_COLLECTION_SUFFIX]
 
             if user is not None and password is not None:
                 self.database.authenticate(user, password)
@@ -604,6 +613,7 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
 
         self._course_run_cache = {}
         self.signal_handler = signal_handler
+        self.asset_metadata_per_asset = asset_metadata_per_asset
 
     def close_connections(self):
         """
@@ -676,95 +686,113 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         else:
             return ParentLocationCache()
 
-    def _compute_metadata_inheritance_tree(self, course_id):
-        '''
-        Find all inheritable fields from all xblocks in the course which may define inheritable data
-        '''
-        # get all collections in the course, this query should not return any leaf nodes
-        course_id = self.fill_in_run(course_id)
-        query = SON([
-            ('_id.tag', 'i4x'),
-            ('_id.org', course_id.org),
-            ('_id.course', course_id.course),
-            ('_id.category', {'$in': BLOCK_TYPES_WITH_CHILDREN})
-        ])
-        # if we're only dealing in the published branch, then only get published containers
-        if self.get_branch_setting() == ModuleStoreEnum.Branch.published_only:
-            query['_id.revision'] = None
-        # we just want the Location, children, and inheritable metadata
+    def _inheritance_record_filter(self):
+        """
+        Returns the fields of a container needed for the metadata inheritance tree: the Location,
+        children, and inheritable metadata. This minimizes the data pushed over the wire.
+        """
         record_filter = {'_id': 1, 'definition.children': 1}
-
-        # just get the inheritable metadata since that is all we need for the computation
-        # this minimizes both data pushed over the wire
         for field_name in InheritanceMixin.fields:
             record_filter['metadata.{0}'.format(field_name)] = 1
+        return record_filter
 
-        # call out to the DB
-        resultset = self.collection.find(query, record_filter)
+    def _inheritance_nodes(self, course_id, query):
+        """
+        Finds the containers in the course matching query, and returns a dict mapping their urls
+        to their inheritable metadata and their children, merged across their draft and published revisions.
+        """
+        # if we're only dealing in the published branch, then only get published containers
+        if self.get_branch_setting() == ModuleStoreEnum.Branch.published_only:
+            query['_id.revision'] = None
 
         # it's ok to keep these as deprecated strings b/c the overall cache is indexed by course_key and this
         # is a dictionary relative to that course
-        results_by_url = {}
-        root = None
-
-        # now go through the results and order them by the location url
-        for result in resultset:
+        nodes = {}
+        for result in self.collection.find(query, self._inheritance_record_filter()):
             # manually pick it apart b/c the db has tag and we want as_published revision regardless
             location = as_published(Location._from_deprecated_son(result['_id'], course_id.run))
-
             location_url = unicode(location)
-            if location_url in results_by_url:
+            children = result.get('definition', {}).get('children', [])
+            if location_url in nodes:
                 # found either draft or live to complement the other revision
                 # FIXME this is wrong. If the child was moved in draft from one parent to the other, it will
                 # show up under both in this logic: https://openedx.atlassian.net/browse/TNL-1075
-                existing_children = results_by_url[location_url].get('definition', {}).get('children', [])
-                additional_children = result.get('definition', {}).get('children', [])
-                total_children = existing_children + additional_children
                 # use set to get rid of duplicates. We don't care about order; so, it shouldn't matter.
-                results_by_url[location_url].setdefault('definition', {})['children'] = set(total_children)
+                nodes[location_url]['children'] = set(nodes[location_url]['children']).union(children)
             else:
-                results_by_url[location_url] = result
-            if location.category == 'course':
-                root = location_url
+                nodes[location_url] = {
+                    'category': location.category,
+                    'metadata': result.get('metadata', {}),
+                    'children': children,
+                }
+        return nodes
+
+    def _compute_metadata_inheritance_tree(self, course_id):
+        '''
+        Find all inheritable fields from all xblocks in the course which may define inheritable data
+        '''
+        # get all collections in the course, this query should not return any leaf nodes
+        course_id = self.fill_in_run(course_id)
+        query = SON([
+            ('_id.tag', 'i4x'),
+            ('_id.org', course_id.org),
+            ('_id.course', course_id.course),
+            ('_id.category', {'$in': BLOCK_TYPES_WITH_CHILDREN})
+        ])
+        tree = MetadataInheritanceTree(branch=self.get_branch_setting())
+        for url, node in self._inheritance_nodes(course_id, query).iteritems():
+            tree.set_node(url, node['metadata'], node['children'])
+            if node['category'] == 'course':
+                tree.root = url
+        return tree
 
-        # now traverse the tree and compute down the inherited metadata
-        metadata_to_inherit = {}
+    def _update_metadata_inheritance_tree(self, course_id, location):
+        """
+        Updates the cached metadata inheritance tree of the course after the block at location
+        has been saved, by reading back just that block rather than the whole course.
 
-        def _compute_inherited_metadata(url):
-            """
-            Helper method for computing inherited metadata for a specific location url
-            """
-            my_metadata = results_by_url[url].get('metadata', {})
-
-            # go through all the children and recurse, but only if we have
-            # in the result set. Remember results will not contain leaf nodes
-            for child in results_by_url[url].get('definition', {}).get('children', []):
-                if child in results_by_url:
-                    new_child_metadata = copy.deepcopy(my_metadata)
-                    new_child_metadata.update(results_by_url[child].get('metadata', {}))
-                    results_by_url[child]['metadata'] = new_child_metadata
-                    metadata_to_inherit[child] = new_child_metadata
-                    _compute_inherited_metadata(child)
-                else:
-                    # this is likely a leaf node, so let's record what metadata we need to inherit
-                    metadata_to_inherit[child] = my_metadata.copy()
-                # WARNING: 'parent' is not part of inherited metadata, but
-                # we're piggybacking on this recursive traversal to grab
-                # and cache the child's parent, as a performance optimization.
-                # The 'parent' key will be popped out of the dictionary during
-                # CachingDescriptorSystem.load_item
-                metadata_to_inherit[child].setdefault('parent', {})[self.get_branch_setting()] = url
+        Returns the updated tree, or None if there's no cached tree to update.
+        """
+        course_id = self.fill_in_run(course_id)
+        cache_key = MetadataInheritanceTree.cache_key(course_id)
+        tree = None
+        if self.request_cache is not None:
+            tree = self.request_cache.data.get('metadata_inheritance', {}).get(unicode(course_id))
+        if not tree and self.metadata_inheritance_cache_subsystem is not None:
+            tree = self.metadata_inheritance_cache_subsystem.get(cache_key)
+        if not tree or tree.branch != self.get_branch_setting():
+            return None
 
-        if root is not None:
-            _compute_inherited_metadata(root)
+        if location.category in BLOCK_TYPES_WITH_CHILDREN:
+            # Leaves neither pass on metadata nor record their parents, so only containers change the tree
+            query = SON([
+                ('_id.tag', 'i4x'),
+                ('_id.org', course_id.org),
+                ('_id.course', course_id.course),
+                ('_id.category', location.category),
+                ('_id.name', location.name),
+            ])
+            location_url = unicode(as_published(location))
+            node = self._inheritance_nodes(course_id, query).get(location_url)
+            if node is None:
+                tree.remove_node(location_url)
+            else:
+                tree.set_node(location_url, node['metadata'], node['children'])
+                if location.category == 'course':
+                    tree.root = location_url
 
-        return metadata_to_inherit
+            if self.metadata_inheritance_cache_subsystem is not None:
+                self.metadata_inheritance_cache_subsystem.set(cache_key, tree)
+
+        if self.request_cache is not None:
+            self.request_cache.data.setdefault('metadata_inheritance', {})[unicode(course_id)] = tree
+        return tree
 
     def _get_cached_metadata_inheritance_tree(self, course_id, force_refresh=False):
         '''
         Compute the metadata inheritance for the course.
         '''
-        tree = {}
+        tree = None
 
         course_id = self.fill_in_run(course_id)
         if not force_refresh:
@@ -774,7 +802,7 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
 
             # then look in any caching subsystem (e.g. memcached)
             if self.metadata_inheritance_cache_subsystem is not None:
-                tree = self.metadata_inheritance_cache_subsystem.get(unicode(course_id), {})
+                tree = self.metadata_inheritance_cache_subsystem.get(MetadataInheritanceTree.cache_key(course_id))
             else:
                 logging.warning(
                     'Running MongoModuleStore without a metadata_inheritance_cache_subsystem. This is \
@@ -787,7 +815,7 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
 
             # now write out computed tree to caching subsystem (e.g. memcached), if available
             if self.metadata_inheritance_cache_subsystem is not None:
-                self.metadata_inheritance_cache_subsystem.set(unicode(course_id), tree)
+                self.metadata_inheritance_cache_subsystem.set(MetadataInheritanceTree.cache_key(course_id), tree)
 
         # now populate a request_cache, if available. NOTE, we are outside of the
         # scope of the above if: statement so that after a memcache hit, it'll get
@@ -801,18 +829,25 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
 
         return tree
 
-    def refresh_cached_metadata_inheritance_tree(self, course_id, runtime=None):
+    def refresh_cached_metadata_inheritance_tree(self, course_id, runtime=None, location=None):
         """
         Refresh the cached metadata inheritance tree for the org/course combination
         for location
 
         If given a runtime, it replaces the cached_metadata in that runtime. NOTE: failure to provide
         a runtime may mean that some objects report old values for inherited data.
+
+        If given the location of the block which changed, only that block is read back into the
+        cached tree, falling back to recomputing the whole tree if there isn't one cached.
         """
         course_id = course_id.for_branch(None)
         if not self._is_in_bulk_operation(course_id):
-            # below is done for side effects when runtime is None
-            cached_metadata = self._get_cached_metadata_inheritance_tree(course_id, force_refresh=True)
+            cached_metadata = None
+            if location is not None:
+                cached_metadata = self._update_metadata_inheritance_tree(course_id, location)
+            if cached_metadata is None:
+                # below is done for side effects when runtime is None
+                cached_metadata = self._get_cached_metadata_inheritance_tree(course_id, force_refresh=True)
             if runtime:
                 runtime.cached_metadata = cached_metadata
 
@@ -905,7 +940,7 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         root = self.fs_root / data_dir
         resource_fs = _OSFS_INSTANCE.setdefault(root, OSFS(root, create=True))
 
-        cached_metadata = {}
+        cached_metadata = MetadataInheritanceTree()
         if apply_cached_metadata:
             cached_metadata = self._get_cached_metadata_inheritance_tree(course_key)
 
@@ -1008,6 +1043,28 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         )
         return [course for course in base_list if not isinstance(course, ErrorDescriptor)]
 
+    @autoretry_read()
+    def get_course_keys(self, **kwargs):
+        """
+        Returns a list of the keys of the courses in this modulestore, without loading the courses.
+        This accepts an optional parameter of 'org' which will apply an efficient filter to only
+        get the keys of courses with the specified ORG. Unlike get_courses, the keys of courses
+        which fail to load are included.
+        """
+        query = {'_id.category': 'course'}
+        course_org_filter = kwargs.get('org')
+        if course_org_filter:
+            query['_id.org'] = course_org_filter
+
+        return [
+            SlashSeparatedCourseKey(course['_id']['org'], course['_id']['course'], course['_id']['name'])
+            for course in self.collection.find(query, fields=('_id',))
+            if not (  # TODO kill this
+                course['_id']['org'] == 'edx' and
+                course['_id']['course'] == 'templates'
+            )
+        ]
+
     def _find_one(self, location):
         '''Look for a given location in the collection. If the item is not present, raise
         ItemNotFoundError.
@@ -1278,7 +1335,7 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
                 resources_fs=None,
                 error_tracker=self.error_tracker,
                 render_template=self.render_template,
-                cached_metadata={},
+                cached_metadata=MetadataInheritanceTree(),
                 mixins=self.xblock_mixins,
                 select=self.xblock_select,
                 services=services,
@@ -1462,8 +1519,10 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             # update the edit info of the instantiated xblock
             xblock._edit_info = payload['edit_info']
 
-            # recompute (and update) the metadata inheritance tree which is cached
-            self.refresh_cached_metadata_inheritance_tree(xblock.scope_ids.usage_id.course_key, xblock.runtime)
+            # update the metadata inheritance tree which is cached
+            self.refresh_cached_metadata_inheritance_tree(
+                xblock.scope_ids.usage_id.course_key, xblock.runtime, location=xblock.scope_ids.usage_id
+            )
             # fire signal that we've written to DB
         except ItemNotFoundError:
             if not allow_not_found:
@@ -1730,6 +1789,26 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         # Pass back wrapped 'assets' dict with the '_id' key added to it for document update purposes.
         return CourseAssetsFromStorage(course_key, doc_id, course_assets['assets'])
 
+    def _asset_metadata_query(self, course_key, asset_type=None, filename=None):
+        """
+        Returns the query for the documents of the course's assets, optionally only those of the given type
+        and filename, in the per-asset asset metadata collection.
+        """
+        query = SON([('course_id', unicode(course_key))])
+        if asset_type is not None:
+            query['asset_type'] = asset_type
+            if filename is not None:
+                query['filename'] = filename
+        return query
+
+    def _check_course_has_assets(self, course_key):
+        """
+        Raises ItemNotFoundError if there's no such course to have assets. Only used when
+        storing asset metadata per asset, which has no document per course to find.
+        """
+        if course_key.run is None or not self.has_course(course_key):
+            raise ItemNotFoundError(course_key)
+
     def _make_mongo_asset_key(self, asset_type):
         """
         Given a asset type, form a key needed to update the proper embedded field in the Mongo doc.
@@ -1747,6 +1826,9 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             import_only (bool): True if edited_on/by data should remain unchanged.
         """
         course_key = asset_metadata_list[0].asset_id.course_key
+        if self.asset_metadata_per_asset:
+            return self._save_asset_metadata_per_asset(course_key, asset_metadata_list, user_id, import_only)
+
         course_assets = self._find_course_assets(course_key)
         assets_by_type = self._save_assets_by_type(course_key, asset_metadata_list, course_assets, user_id, import_only)
 
@@ -1762,6 +1844,24 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         )
         return True
 
+    def _save_asset_metadata_per_asset(self, course_key, asset_metadata_list, user_id, import_only):
+        """
+        Internal; saves the info for a particular course's assets in a document per asset.
+        """
+        self._check_course_has_assets(self.fill_in_run(course_key))
+        bulk = self.asset_metadata_collection.initialize_unordered_bulk_op()
+        saved = False
+        for asset_md in self._assets_to_save(course_key, asset_metadata_list, user_id, import_only):
+            asset_doc = asset_md.to_storable()
+            asset_doc['course_id'] = unicode(course_key)
+            bulk.find(
+                self._asset_metadata_query(course_key, asset_doc['asset_type'], asset_doc['filename'])
+            ).upsert().replace_one(asset_doc)
+            saved = True
+        if saved:
+            bulk.execute()
+        return True
+
     @contract(asset_metadata='AssetMetadata', user_id='int|long')
     def save_asset_metadata(self, asset_metadata, user_id, import_only=False):
         """
@@ -1804,6 +1904,17 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             source_course_key (CourseKey): identifier of course to copy from
             dest_course_key (CourseKey): identifier of course to copy to
         """
+        if self.asset_metadata_per_asset:
+            self.asset_metadata_collection.remove(self._asset_metadata_query(dest_course_key))
+            dest_assets = []
+            for asset_doc in self.asset_metadata_collection.find(self._asset_metadata_query(source_course_key)):
+                del asset_doc['_id']
+                asset_doc['course_id'] = unicode(dest_course_key)
+                dest_assets.append(asset_doc)
+            if dest_assets:
+                self.asset_metadata_collection.insert(dest_assets)
+            return
+
         source_assets = self._find_course_assets(source_course_key)
         dest_assets = {'assets': source_assets.asset_md.copy(), 'course_id': unicode(dest_course_key)}
         self.asset_collection.remove({'course_id': unicode(dest_course_key)})
@@ -1823,6 +1934,19 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             ItemNotFoundError if no such item exists
             AttributeError is attr is one of the build in attrs.
         """
+        if self.asset_metadata_per_asset:
+            md = self.find_asset_metadata(asset_key)
+            if md is None:
+                raise ItemNotFoundError(asset_key)
+            md.update(attr_dict)
+            asset_doc = md.to_storable()
+            asset_doc['course_id'] = unicode(asset_key.course_key)
+            self.asset_metadata_collection.update(
+                self._asset_metadata_query(asset_key.course_key, asset_key.asset_type, asset_key.path),
+                asset_doc
+            )
+            return
+
         course_assets, asset_idx = self._find_course_asset(asset_key)
         if asset_idx is None:
             raise ItemNotFoundError(asset_key)
@@ -1852,6 +1976,12 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         Returns:
             Number of asset metadata entries deleted (0 or 1)
         """
+        if self.asset_metadata_per_asset:
+            result = self.asset_metadata_collection.remove(
+                self._asset_metadata_query(asset_key.course_key, asset_key.asset_type, asset_key.path)
+            )
+            return result['n']
+
         course_assets, asset_idx = self._find_course_asset(asset_key)
         if asset_idx is None:
             return 0
@@ -1875,6 +2005,10 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         Arguments:
             course_key (CourseKey): course_identifier
         """
+        if self.asset_metadata_per_asset:
+            self.asset_metadata_collection.remove(self._asset_metadata_query(course_key))
+            return
+
         # Using the course_id, find the course asset metadata document.
         # A single document exists per course to store the course asset metadata.
         try:
@@ -1884,6 +2018,121 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             # When deleting asset metadata, if a course's asset metadata is not present, no big deal.
             pass
 
+    @contract(asset_key='AssetKey')
+    def find_asset_metadata(self, asset_key, **kwargs):
+        """
+        Find the metadata for a particular course asset.
+
+        Arguments:
+            asset_key (AssetKey): key containing original asset filename
+
+        Returns:
+            asset metadata (AssetMetadata) -or- None if not found
+        """
+        if not self.asset_metadata_per_asset:
+            return super(MongoModuleStore, self).find_asset_metadata(asset_key, **kwargs)
+
+        asset_doc = self.asset_metadata_collection.find_one(
+            self._asset_metadata_query(asset_key.course_key, asset_key.asset_type, asset_key.path)
+        )
+        if asset_doc is None:
+            self._check_course_has_assets(self.fill_in_run(asset_key.course_key))
+            return None
+
+        mdata = AssetMetadata(asset_key, asset_key.path, **kwargs)
+        mdata.from_storable(asset_doc)
+        return mdata
+
+    @contract(
+        course_key='CourseKey', asset_type='None | basestring',
+        start='int | None', maxresults='int | None', sort='tuple(str,(int,>=1,<=2))|None'
+    )
+    def get_all_asset_metadata(self, course_key, asset_type, start=0, maxresults=-1, sort=None, **kwargs):
+        """
+        Returns a list of asset metadata for all assets of the given asset_type in the course.
+
+        When storing asset metadata per asset, only the requested page of assets is read, using
+        the indexes created by ensure_indexes to sort them.
+
+        Args:
+            course_key (CourseKey): course identifier
+            asset_type (str): the block_type of the assets to return. If None, return assets of all types.
+            start (int): optional - start at this asset number. Zero-based!
+            maxresults (int): optional - return at most this many, -1 means no limit
+            sort (array): optional - None means no sort
+                (sort_by (str), sort_order (str))
+                sort_by - one of 'uploadDate' or 'displayname'
+                sort_order - one of SortOrder.ascending or SortOrder.descending
+
+        Returns:
+            List of AssetMetadata objects.
+        """
+        if not self.asset_metadata_per_asset:
+            return super(MongoModuleStore, self).get_all_asset_metadata(
+                course_key, asset_type, start, maxresults, sort, **kwargs
+            )
+
+        # Determine the proper sort - with defaults of ('displayname', SortOrder.ascending).
+        sort_field = 'filename'
+        direction = pymongo.ASCENDING
+        if sort:
+            if sort[0] == 'uploadDate':
+                sort_field = 'edit_info.edited_on'
+            if sort[1] == ModuleStoreEnum.SortOrder.descending:
+                direction = pymongo.DESCENDING
+
+        ret_assets = []
+        if maxresults != 0:
+            cursor = self.asset_metadata_collection.find(
+                self._asset_metadata_query(course_key, asset_type)
+            ).sort(sort_field, direction).skip(start or 0)
+            if maxresults > 0:
+                cursor = cursor.limit(maxresults)
+            for asset_doc in cursor:
+                asset_key = course_key.make_asset_key(asset_doc['asset_type'], asset_doc['filename'])
+                new_asset = AssetMetadata(asset_key)
+                new_asset.from_storable(asset_doc)
+                ret_assets.append(new_asset)
+
+        if not ret_assets:
+            self._check_course_has_assets(self.fill_in_run(course_key))
+        return ret_assets
+
+    def migrate_asset_metadata_per_asset(self, course_key=None):
+        """
+        Copies the asset metadata of the course, or of all courses, from their course documents into a
+        document per asset, for using with asset_metadata_per_asset. The course documents are left in place.
+
+        Arguments:
+            course_key (CourseKey): optional - the course whose asset metadata to copy
+
+        Returns:
+            The number of assets whose metadata was copied.
+        """
+        self.ensure_indexes()
+        query = {}
+        if course_key is not None:
+            query['course_id'] = unicode(self.fill_in_run(course_key))
+
+        num_assets = 0
+        for course_assets in self.asset_collection.find(query):
+            if not isinstance(course_assets.get('assets'), dict):
+                # The old, empty, course assets format
+                continue
+            bulk = self.asset_metadata_collection.initialize_unordered_bulk_op()
+            num_course_assets = 0
+            for asset_type, asset_docs in course_assets['assets'].iteritems():
+                for asset_doc in asset_docs:
+                    asset_doc = dict(asset_doc, course_id=course_assets['course_id'], asset_type=asset_type)
+                    bulk.find(
+                        self._asset_metadata_query(asset_doc['course_id'], asset_type, asset_doc['filename'])
+                    ).upsert().replace_one(asset_doc)
+                    num_course_assets += 1
+            if num_course_assets:
+                bulk.execute()
+                num_assets += num_course_assets
+        return num_assets
+
     def heartbeat(self):
         """
         Check that the db is reachable.
@@ -1919,6 +2168,23 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         # To allow prioritizing draft vs published material
         self.collection.create_index('_id.revision')
 
+        # Indexes for finding an asset, and for listing the assets of a course, or of one of its asset types,
+        # sorted by filename or upload date.
+        self.asset_metadata_collection.create_index(
+            [('course_id', pymongo.ASCENDING), ('asset_type', pymongo.ASCENDING), ('filename', pymongo.ASCENDING)],
+            unique=True
+        )
+        self.asset_metadata_collection.create_index(
+            [
+                ('course_id', pymongo.ASCENDING),
+                ('asset_type', pymongo.ASCENDING),
+                ('edit_info.edited_on', pymongo.ASCENDING)
+            ]
+        )
+        self.asset_metadata_collection.create_index(
+            [('course_id', pymongo.ASCENDING), ('filename', pymongo.ASCENDING)]
+        )
+
     # Some overrides that still need to be implemented by subclasses
     def convert_to_draft(self, location, user_id):
         raise NotImplementedError()
@@ -0,0 +1,179 @@
+"""
+The metadata inheritance tree of a course in the Mongo modulestore.
+"""
+
+
+class MetadataInheritanceTree(object):
+    """
+    The inheritable metadata set on each container in a course, and the
+    parents of its blocks, from which the metadata each block inherits is
+    worked out.
+
+    Rather than keeping a copy of the metadata each block inherits, the tree
+    keeps each container's own inheritable metadata and its children. What a
+    container passes on to its children is worked out when it's first needed
+    and shared between them, so changing one container only means working it
+    out again for the containers beneath it.
+
+    Blocks which aren't beneath the course root inherit nothing, and have no
+    parent in the tree.
+    """
+    # Bump this when what's pickled changes, so that trees cached in the old form aren't used
+    VERSION = 1
+
+    def __init__(self, root=None, branch=None):
+        """
+        Arguments:
+            root (unicode): the url of the course, at the root of the tree
+            branch (ModuleStoreEnum.Branch): the branch setting the tree was computed for
+        """
+        self.root = root
+        self.branch = branch
+        # Maps container urls to their own inheritable metadata
+        self._metadata = {}
+        # Maps container urls to the urls of their children
+        self._children = {}
+        # Maps block urls to the url of their parent
+        self._parents = {}
+        # Maps container urls to the metadata they pass on to their children,
+        # or None if they aren't beneath the root
+        self._passed_on = {}
+
+    @classmethod
+    def cache_key(cls, course_key):
+        """
+        Returns the key the tree of the course is cached under, which changes with the VERSION.
+        """
+        return u'v{}.{}'.format(cls.VERSION, course_key)
+
+    def __getstate__(self):
+        return {
+            'version': self.VERSION,
+            'root': self.root,
+            'branch': self.branch,
+            'metadata': self._metadata,
+            'children': self._children,
+        }
+
+    def __setstate__(self, state):
+        self.__init__(state['root'], state['branch'])
+        if state.get('version') != self.VERSION:
+            # Leave the tree empty, so that it's recomputed
+            self.root = None
+            return
+        for url, children in state['children'].iteritems():
+            self.set_node(url, state['metadata'][url], children)
+
+    def __len__(self):
+        return len(self._metadata)
+
+    def keys(self):
+        """
+        Returns the urls of the blocks whose parents are in the tree.
+        """
+        return self._parents.keys()
+
+    def set_node(self, url, metadata, children):
+        """
+        Sets the inheritable metadata and the children of the container at url.
+        """
+        # Forget what's passed on beneath both the old and the new children
+        self._forget_passed_on(url)
+        for child in self._children.get(url, []):
+            if self._parents.get(child) == url:
+                del self._parents[child]
+        self._metadata[url] = metadata
+        self._children[url] = list(children)
+        for child in self._children[url]:
+            self._parents[child] = url
+        self._forget_passed_on(url)
+
+    def remove_node(self, url):
+        """
+        Removes the container at url from the tree.
+        """
+        self._forget_passed_on(url)
+        for child in self._children.pop(url, []):
+            if self._parents.get(child) == url:
+                del self._parents[child]
+        self._metadata.pop(url, None)
+
+    def update(self, other):
+        """
+        Adds the containers of another tree of the same course to this one.
+        """
+        if other is self:
+            return
+        for url, children in other._children.iteritems():  # pylint: disable=protected-access
+            self.set_node(url, other._metadata[url], children)  # pylint: disable=protected-access
+        self.root = other.root or self.root
+        self.branch = other.branch or self.branch
+
+    def _forget_passed_on(self, url):
+        """
+        Forgets what the container at url, and the containers beneath it, pass on to their children.
+        """
+        urls = [url]
+        seen = set()
+        while urls:
+            url = urls.pop()
+            if url in seen:
+                continue
+            seen.add(url)
+            self._passed_on.pop(url, None)
+            urls.extend(child for child in self._children.get(url, []) if child in self._children)
+
+    def _get_passed_on(self, url):
+        """
+        Returns the metadata the container at url passes on to its children,
+        or None if it isn't beneath the root.
+        """
+        if url in self._passed_on:
+            return self._passed_on[url]
+
+        # Find the closest ancestor whose metadata has been worked out
+        ancestors = []
+        passed_on = None
+        while url is not None and url not in self._passed_on:
+            if url in ancestors:
+                # A cycle, which never reaches the root
+                break
+            ancestors.append(url)
+            if url == self.root:
+                url = None
+                passed_on = {}
+            else:
+                url = self._parents.get(url)
+        else:
+            if url is not None:
+                passed_on = self._passed_on[url]
+
+        # and work out the metadata passed on from it down to the container
+        for ancestor in reversed(ancestors):
+            if passed_on is not None and ancestor in self._metadata:
+                passed_on = dict(passed_on, **self._metadata[ancestor])
+            else:
+                passed_on = None
+            self._passed_on[ancestor] = passed_on
+        return self._passed_on.get(ancestors[0]) if ancestors else passed_on
+
+    def parent(self, url, branch):
+        """
+        Returns the url of the parent of the block at url, or None if it isn't
+        known for the given branch setting.
+        """
+        if branch != self.branch:
+            return None
+        parent = self._parents.get(url)
+        if parent is None or self._get_passed_on(parent) is None:
+            return None
+        return parent
+
+    def inherited_metadata(self, url):
+        """
+        Returns the metadata the block at url inherits, which must not be changed.
+        """
+        parent = self._parents.get(url)
+        if parent is None:
+            return {}
+        return self._get_passed_on(parent) or {}
@@ -0,0 +1,312 @@
+"""
+Benchmarks of the split modulestore's read paths, writes and publish.
+
+Each benchmark builds a synthetic course of a configurable shape in an isolated
+split modulestore (backed by a throwaway database on the local Mongo, like the
+modulestore unit tests), then times:
+
+    * get_course(depth=None)
+    * get_items with qualifiers
+    * get_item on leaf blocks
+    * update_item on a leaf block
+    * publish of the whole course
+    * xml_importer import of the course's export
+
+The results, including the number of split Mongo operations recorded by
+:class:`QueryTimer` and the number of Mongo wire queries, are emitted as JSON
+so that runs before and after a modulestore change can be compared.
+
+Usage:
+
+    python -m xmodule.modulestore.perf_tests.split_benchmarks \\
+        --shape chapter:10,sequential:10,vertical:5,problem:4 --repeat 5 results.json
+"""
+from collections import Counter
+from contextlib import contextmanager
+import json
+import random
+from shutil import rmtree
+from tempfile import mkdtemp
+import time
+
+from mock import patch
+import pymongo.message
+
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.split_mongo import mongo_connection
+from xmodule.modulestore.tests.test_cross_modulestore_import_export import (
+    MongoContentstoreBuilder,
+    VersioningModulestoreBuilder,
+)
+from xmodule.modulestore.xml_exporter import export_course_to_xml
+from xmodule.modulestore.xml_importer import import_course_from_xml
+
+try:
+    import click
+except ImportError:
+    click = None
+
+
+# The default course shape: (block type, number of children per parent) from the top down.
+# 10 chapters of 10 sequentials of 5 verticals of 4 problems is 2610 blocks.
+DEFAULT_SHAPE = (('chapter', 10), ('sequential', 10), ('vertical', 5), ('problem', 4))
+
+# The number of times each operation is timed.
+DEFAULT_REPEAT = 3
+
+# The number of leaf blocks fetched by the get_item benchmark.
+LEAF_SAMPLE_SIZE = 20
+
+USER_ID = ModuleStoreEnum.UserID.test
+
+
+def parse_shape(shape_string):
+    """
+    Parses a shape such as "chapter:10,sequential:10,vertical:5,problem:4".
+
+    A block type may be repeated to build deeper trees, e.g. "vertical:2,vertical:2".
+    """
+    shape = []
+    for level in shape_string.split(','):
+        block_type, count = level.strip().split(':')
+        shape.append((block_type, int(count)))
+    return tuple(shape)
+
+
+def shape_size(shape):
+    """
+    Returns the number of blocks (excluding the course root) in a course of the given shape.
+    """
+    total = 0
+    level_size = 1
+    for __, count in shape:
+        level_size *= count
+        total += level_size
+    return total
+
+
+def build_course(store, shape, org='perf', course='split', run='bench'):
+    """
+    Creates a course of the given shape in the store and returns its key and leaf block locations.
+    """
+    course_key = store.make_course_key(org, course, run)
+    with store.bulk_operations(course_key):
+        course_block = store.create_course(org, course, run, USER_ID, skip_auto_publish=True)
+        course_key = course_block.id
+        parents = [course_block.location]
+        for depth, (block_type, count) in enumerate(shape):
+            children = []
+            for parent_index, parent in enumerate(parents):
+                for index in range(count):
+                    child = store.create_child(
+                        USER_ID,
+                        parent,
+                        block_type,
+                        block_id='{}_{}_{}_{}'.format(block_type, depth, parent_index, index),
+                        fields={'display_name': '{} {}'.format(block_type, index)},
+                    )
+                    children.append(child.location)
+            parents = children
+    return course_key, parents
+
+
+@contextmanager
+def count_queries():
+    """
+    Counts the split Mongo operations timed by QueryTimer and the Mongo wire queries made within the block.
+
+    Yields a Counter which is filled in when the block exits.
+    """
+    counts = Counter()
+    timed_operations = Counter()
+
+    def record_increment(metric_name, *args, **kwargs):  # pylint: disable=unused-argument
+        """
+        Counts each operation QueryTimer reports.
+        """
+        timed_operations[metric_name] += 1
+
+    wire_queries = Counter()
+    originals = {name: getattr(pymongo.message, name) for name in ('query', 'get_more')}
+
+    def counting(name):
+        """
+        Returns a wrapper of pymongo.message.<name> which counts its calls.
+        """
+        def _wrapper(*args, **kwargs):
+            """
+            Counts the call and passes it on.
+            """
+            wire_queries[name] += 1
+            return originals[name](*args, **kwargs)
+        return _wrapper
+
+    with patch.object(mongo_connection.dog_stats_api, 'increment', record_increment):
+        with patch.object(pymongo.message, 'query', counting('query')):
+            with patch.object(pymongo.message, 'get_more', counting('get_more')):
+                yield counts
+
+    prefix = mongo_connection.__name__ + '.'
+    for metric_name, count in timed_operations.items():
+        counts[metric_name[len(prefix):] if metric_name.startswith(prefix) else metric_name] = count
+    counts['mongo_queries'] = sum(wire_queries.values())
+
+
+class SplitBenchmark(object):
+    """
+    Times modulestore operations against one synthetic course.
+    """
+    def __init__(self, store, contentstore, shape=DEFAULT_SHAPE, repeat=DEFAULT_REPEAT, cold=True):
+        """
+        Arguments:
+            store: an empty split modulestore
+            contentstore: the contentstore used by the store
+            shape: the course shape, as for :func:`parse_shape`
+            repeat: the number of times to time each operation
+            cold: whether to empty the in-process structure cache before each timing
+        """
+        self.store = store
+        self.contentstore = contentstore
+        self.shape = shape
+        self.repeat = repeat
+        self.cold = cold
+        self.results = []
+        self.course_key = None
+        self.leaves = []
+
+    def run(self):
+        """
+        Builds the course, runs every benchmark, and returns the results.
+        """
+        start = time.time()
+        self.course_key, self.leaves = build_course(self.store, self.shape)
+        self.results.append({
+            'operation': 'build_course',
+            'blocks': shape_size(self.shape),
+            'seconds': [time.time() - start],
+        })
+
+        draft_course_key = self.course_key.for_branch(ModuleStoreEnum.BranchName.draft)
+        leaf_sample = random.Random(0).sample(self.leaves, min(LEAF_SAMPLE_SIZE, len(self.leaves)))
+        leaf_type = self.shape[-1][0]
+
+        self.time('get_course', lambda: self.store.get_course(draft_course_key, depth=None))
+        self.time(
+            'get_items',
+            lambda: self.store.get_items(draft_course_key, qualifiers={'category': leaf_type}),
+        )
+        self.time('get_item_leaves', lambda: [self.store.get_item(leaf) for leaf in leaf_sample])
+        self.time('update_item', lambda: self.update_leaf(leaf_sample[0]))
+        course_location = self.store.get_course(draft_course_key).location
+        self.time('publish', lambda: self.store.publish(course_location, USER_ID))
+        self.time_import()
+        return self.results
+
+    def update_leaf(self, location):
+        """
+        Changes the display name of the block at location.
+        """
+        block = self.store.get_item(location)
+        block.display_name = 'updated {}'.format(time.time())
+        self.store.update_item(block, USER_ID)
+
+    def time(self, operation, func):
+        """
+        Times func `repeat` times and records the timings and the queries of the first run.
+        """
+        timings = []
+        queries = None
+        for __ in range(self.repeat):
+            if self.cold:
+                self.store.db_connection.structure_cache.clear()
+            if queries is None:
+                with count_queries() as queries:
+                    start = time.time()
+                    func()
+                    timings.append(time.time() - start)
+            else:
+                start = time.time()
+                func()
+                timings.append(time.time() - start)
+        self.results.append({
+            'operation': operation,
+            'seconds': timings,
+            'queries': dict(queries),
+        })
+
+    def time_import(self):
+        """
+        Exports the course and times importing it, each time as a new course.
+        """
+        export_dir = mkdtemp()
+        try:
+            export_course_to_xml(self.store, self.contentstore, self.course_key, export_dir, 'benchmark_course')
+            imports = iter(range(self.repeat))
+
+            def do_import():
+                """
+                Imports the exported course under a new run.
+                """
+                target = self.store.make_course_key('perf', 'split', 'import{}'.format(next(imports)))
+                import_course_from_xml(
+                    self.store,
+                    USER_ID,
+                    export_dir,
+                    source_dirs=['benchmark_course'],
+                    static_content_store=self.contentstore,
+                    target_id=target,
+                    create_if_not_present=True,
+                    raise_on_failure=True,
+                )
+            self.time('xml_import', do_import)
+        finally:
+            rmtree(export_dir, ignore_errors=True)
+
+
+def run_benchmarks(shape=DEFAULT_SHAPE, repeat=DEFAULT_REPEAT, cold=True):
+    """
+    Runs the benchmarks in a throwaway split modulestore and returns a JSON-serializable report.
+    """
+    with MongoContentstoreBuilder().build() as contentstore:
+        with VersioningModulestoreBuilder().build_with_contentstore(contentstore) as store:
+            results = SplitBenchmark(store, contentstore, shape=shape, repeat=repeat, cold=cold).run()
+
+    summary = {}
+    for result in results:
+        timings = sorted(result['seconds'])
+        summary[result['operation']] = {
+            'min': timings[0],
+            'median': timings[len(timings) // 2],
+        }
+    return {
+        'shape': [list(level) for level in shape],
+        'blocks': shape_size(shape),
+        'repeat': repeat,
+        'cold': cold,
+        'results': results,
+        'summary': summary,
+    }
+
+
+if click is not None:
+    # pylint: disable=bad-continuation
+    @click.command()
+    @click.argument('outfile', type=click.File('w'), default='-', required=False)
+    @click.option('--shape',
+                  default=','.join('{}:{}'.format(*level) for level in DEFAULT_SHAPE),
+                  help='Course shape, as comma-separated block_type:children_per_parent levels.'
+                  )
+    @click.option('--repeat', type=click.INT, default=DEFAULT_REPEAT, help='Number of timings per operation.')
+    @click.option('--warm', is_flag=True, help="Don't empty the in-process structure cache between timings.")
+    def cli(outfile, shape, repeat, warm):
+        """
+        Benchmark the split modulestore against a synthetic course and write the results as JSON.
+        """
+        report = run_benchmarks(parse_shape(shape), repeat=repeat, cold=not warm)
+        click.echo(json.dumps(report, indent=2, sort_keys=True), file=outfile)
+
+if __name__ == '__main__':
+    if click is not None:
+        cli()  # pylint: disable=no-value-for-parameter
+    else:
+        print "Aborted! Module 'click' is not installed."
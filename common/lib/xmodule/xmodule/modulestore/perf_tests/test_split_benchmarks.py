@@ -0,0 +1,32 @@
+"""
+Smoke tests of the split modulestore benchmarks, run against a tiny course.
+"""
+import json
+import unittest
+
+from xmodule.modulestore.perf_tests.split_benchmarks import parse_shape, run_benchmarks, shape_size
+
+
+class TestSplitBenchmarks(unittest.TestCase):
+    """
+    Tests of the split modulestore benchmarks.
+    """
+    def test_parse_shape(self):
+        shape = parse_shape('chapter:2, vertical:3,vertical:2')
+        self.assertEqual(shape, (('chapter', 2), ('vertical', 3), ('vertical', 2)))
+        self.assertEqual(shape_size(shape), 2 + 6 + 12)
+
+    def test_run_benchmarks(self):
+        report = run_benchmarks(shape=(('chapter', 2), ('sequential', 2), ('problem', 2)), repeat=2)
+        self.assertEqual(report['blocks'], 14)
+        self.assertEqual(
+            [result['operation'] for result in report['results']],
+            ['build_course', 'get_course', 'get_items', 'get_item_leaves', 'update_item', 'publish', 'xml_import'],
+        )
+        for result in report['results'][1:]:
+            self.assertEqual(len(result['seconds']), 2)
+            self.assertGreater(result['queries']['mongo_queries'], 0)
+        # The split Mongo operations reported through QueryTimer are counted
+        self.assertIn('get_course_index', report['results'][1]['queries'])
+        self.assertEqual(set(report['summary']), set(result['operation'] for result in report['results']))
+        json.dumps(report)
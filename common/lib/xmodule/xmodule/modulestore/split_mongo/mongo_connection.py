@@ -1,11 +1,15 @@
 """
 Segregation of pymongo functions from the data modeling mechanisms for split modulestore.
 """
+import cPickle as pickle
 import datetime
 import math
 import pymongo
 import pytz
 import re
+import threading
+import zlib
+from collections import OrderedDict
 from contextlib import contextmanager
 from time import time
 
@@ -19,6 +23,11 @@ from xmodule.modulestore import BlockData
 from xmodule.modulestore.split_mongo import BlockKey
 import dogstats_wrapper as dog_stats_api
 
+try:
+    from django.core.cache import get_cache, InvalidCacheBackendError
+    DJANGO_AVAILABLE = True
+except ImportError:
+    DJANGO_AVAILABLE = False
 
 new_contract('BlockData', BlockData)
 
@@ -203,6 +212,111 @@ def structure_to_mongo(structure, course_context=None):
         return new_structure
 
 
+class CourseStructureCache(object):
+    """
+    Two-tier cache of converted split structures, keyed by structure version guid.
+
+    Structures are immutable once written, so entries never need invalidating. The
+    first tier is a bounded in-process LRU of pickled structures; the second is the
+    optional Django cache named ``course_structure_cache``, which holds the pickled
+    structures zlib-compressed so that they can be shared between processes.
+
+    Entries are stored pickled (rather than as the structure dicts themselves) so
+    that every caller gets its own copy and can't corrupt the cache by mutating it.
+    """
+    CACHE_NAME = 'course_structure_cache'
+
+    def __init__(self, local_size=64, cache_name=CACHE_NAME):
+        """
+        Arguments:
+            local_size (int): The number of structures to keep in the in-process tier.
+                0 disables the in-process tier.
+            cache_name (str): The name of the Django cache to use as the shared tier.
+                If Django isn't available or no such cache is configured, the shared
+                tier is disabled.
+        """
+        self.local_size = local_size
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.cache = None
+        if DJANGO_AVAILABLE:
+            try:
+                self.cache = get_cache(cache_name)
+            except (InvalidCacheBackendError, ImportError):
+                pass
+
+    def get(self, key, course_context=None):
+        """
+        Return the structure stored under ``key``, or None if it isn't cached.
+        """
+        with TIMER.timer("CourseStructureCache.get", course_context) as tagger:
+            pickled_data = self._get_local(key)
+            if pickled_data is not None:
+                tagger.tag(from_cache='local')
+                return pickle.loads(pickled_data)
+
+            if self.cache is None:
+                tagger.tag(from_cache='false')
+                return None
+
+            compressed_pickled_data = self.cache.get(unicode(key))
+            if compressed_pickled_data is None:
+                tagger.tag(from_cache='false')
+                return None
+
+            tagger.tag(from_cache='shared')
+            tagger.measure('compressed_size', len(compressed_pickled_data))
+            pickled_data = zlib.decompress(compressed_pickled_data)
+            self._set_local(key, pickled_data)
+            return pickle.loads(pickled_data)
+
+    def set(self, key, structure, course_context=None):
+        """
+        Store ``structure`` under ``key`` in both tiers.
+        """
+        with TIMER.timer("CourseStructureCache.set", course_context) as tagger:
+            pickled_data = pickle.dumps(structure, pickle.HIGHEST_PROTOCOL)
+            tagger.measure('uncompressed_size', len(pickled_data))
+            self._set_local(key, pickled_data)
+
+            if self.cache is not None:
+                # 1 is the fastest compression level, at the cost of slightly larger results
+                compressed_pickled_data = zlib.compress(pickled_data, 1)
+                tagger.measure('compressed_size', len(compressed_pickled_data))
+                self.cache.set(unicode(key), compressed_pickled_data)
+
+    def clear(self):
+        """
+        Empty the in-process tier. The shared tier is left alone, since its entries never go stale.
+        """
+        with self._lock:
+            self._local.clear()
+
+    def _get_local(self, key):
+        """
+        Return the pickled structure for ``key`` from the in-process tier, marking it most recently used.
+        """
+        with self._lock:
+            pickled_data = self._local.pop(key, None)
+            if pickled_data is not None:
+                self._local[key] = pickled_data
+            return pickled_data
+
+    def _set_local(self, key, pickled_data):
+        """
+        Add the pickled structure for ``key`` to the in-process tier, evicting the least recently used entries.
+        """
+        if self.local_size <= 0:
+            return
+
+        with self._lock:
+            self._local.pop(key, None)
+            self._local[key] = pickled_data
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+
 class MongoConnection(object):
     """
     Segregation of pymongo functions from the data modeling mechanisms for split modulestore.
@@ -245,6 +359,8 @@ class MongoConnection(object):
         self.structures.write_concern = {'w': 1}
         self.definitions.write_concern = {'w': 1}
 
+        self.structure_cache = CourseStructureCache()
+
     def heartbeat(self):
         """
         Check that the db is reachable.
@@ -259,12 +375,17 @@ class MongoConnection(object):
         Get the structure from the persistence mechanism whose id is the given key
         """
         with TIMER.timer("get_structure", course_context) as tagger_get_structure:
-            with TIMER.timer("get_structure.find_one", course_context) as tagger_find_one:
-                doc = self.structures.find_one({'_id': key})
-                tagger_find_one.measure("blocks", len(doc['blocks']))
-            tagger_get_structure.measure("blocks", len(doc['blocks']))
-
-            return structure_from_mongo(doc, course_context)
+            structure = self.structure_cache.get(key, course_context)
+            tagger_get_structure.tag(from_cache=str(structure is not None).lower())
+            if structure is None:
+                with TIMER.timer("get_structure.find_one", course_context) as tagger_find_one:
+                    doc = self.structures.find_one({'_id': key})
+                    tagger_find_one.measure("blocks", len(doc['blocks']))
+                structure = structure_from_mongo(doc, course_context)
+                self.structure_cache.set(key, structure, course_context)
+            tagger_get_structure.measure("blocks", len(structure['blocks']))
+
+            return structure
 
     @autoretry_read()
     def find_structures_by_id(self, ids, course_context=None):
@@ -276,10 +397,21 @@ class MongoConnection(object):
         """
         with TIMER.timer("find_structures_by_id", course_context) as tagger:
             tagger.measure("requested_ids", len(ids))
-            docs = [
-                structure_from_mongo(structure, course_context)
-                for structure in self.structures.find({'_id': {'$in': ids}})
-            ]
+            docs = []
+            missing_ids = []
+            for structure_id in ids:
+                structure = self.structure_cache.get(structure_id, course_context)
+                if structure is None:
+                    missing_ids.append(structure_id)
+                else:
+                    docs.append(structure)
+            tagger.measure("cached_structures", len(docs))
+
+            if missing_ids:
+                for doc in self.structures.find({'_id': {'$in': missing_ids}}):
+                    structure = structure_from_mongo(doc, course_context)
+                    self.structure_cache.set(structure['_id'], structure, course_context)
+                    docs.append(structure)
             tagger.measure("structures", len(docs))
             return docs
 
@@ -931,6 +931,20 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         # get the blocks for each course index (s/b the root)
         return self._get_structures_for_branch_and_locator(branch, self._create_course_locator, **kwargs)
 
+    @autoretry_read()
+    def get_course_keys(self, branch, **kwargs):
+        """
+        Returns a list of the keys of the courses which have the given branch, read from the
+        course indexes without loading the courses' structures. This accepts an optional
+        parameter of 'org' to only get the keys of courses with the specified ORG.
+
+        :param branch: the branch for which to return course keys.
+        """
+        return [
+            self._create_course_locator(course_index, branch)
+            for course_index in self.find_matching_course_indexes(branch, org_target=kwargs.get('org'))
+        ]
+
     def get_libraries(self, branch="library", **kwargs):
         """
         Returns a list of "library" root blocks matching any given qualifiers.
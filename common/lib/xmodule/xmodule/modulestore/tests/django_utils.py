@@ -14,6 +14,7 @@ from django.contrib.auth.models import User
 from django.test import TestCase
 from django.test.utils import override_settings
 from request_cache.middleware import RequestCache
+from static_replace import clear_static_url_cache
 
 from courseware.field_overrides import OverrideFieldData  # pylint: disable=import-error
 from xmodule.contentstore.django import _CONTENTSTORE
@@ -256,6 +257,8 @@ class ModuleStoreTestCase(TestCase):
         self.addCleanup(self.drop_mongo_collections)
 
         self.addCleanup(RequestCache().clear_request_cache)
+        # Static urls resolve differently depending on which store a course is in
+        self.addCleanup(clear_static_url_cache)
 
         # Enable XModuleFactories for the space of this test (and its setUp).
         self.addCleanup(XMODULE_FACTORY_LOCK.disable)
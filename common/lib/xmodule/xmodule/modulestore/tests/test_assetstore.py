@@ -16,9 +16,12 @@ from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.modulestore.tests.factories import CourseFactory
 from xmodule.modulestore.tests.test_cross_modulestore_import_export import (
     MIXED_MODULESTORE_BOTH_SETUP, MODULESTORE_SETUPS,
-    XmlModulestoreBuilder, MixedModulestoreBuilder
+    XmlModulestoreBuilder, MixedModulestoreBuilder, MongoModulestoreBuilder
 )
 
+# Also test storing the asset metadata of Mongo courses per asset
+ASSET_STORE_SETUPS = MODULESTORE_SETUPS + (MongoModulestoreBuilder(asset_metadata_per_asset=True),)
+
 
 class AssetStoreTestData(object):
     """
@@ -156,7 +159,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
                 if store is not None and i not in (4, 5):
                     store.save_asset_metadata(asset_md, asset[4])
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_STORE_SETUPS)
     def test_save_one_and_confirm(self, storebuilder):
         """
         Save the metadata in each store and retrieve it singularly, as all assets, and after deleting all.
@@ -174,7 +177,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             self.assertEquals(new_asset_md, found_asset_md)
             self.assertEquals(len(store.get_all_asset_metadata(course.id, 'asset')), 1)
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_STORE_SETUPS)
     def test_delete(self, storebuilder):
         """
         Delete non-existent and existent metadata
@@ -191,7 +194,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             self.assertEquals(store.delete_asset_metadata(new_asset_loc, ModuleStoreEnum.UserID.test), 1)
             self.assertEquals(len(store.get_all_asset_metadata(course.id, 'asset')), 0)
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_STORE_SETUPS)
     def test_find_non_existing_assets(self, storebuilder):
         """
         Find a non-existent asset in an existing course.
@@ -203,7 +206,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             asset_md = store.find_asset_metadata(new_asset_loc)
             self.assertIsNone(asset_md)
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_STORE_SETUPS)
     def test_get_all_non_existing_assets(self, storebuilder):
         """
         Get all assets in an existing course when no assets exist.
@@ -214,7 +217,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             asset_md = store.get_all_asset_metadata(course.id, 'asset')
             self.assertEquals(asset_md, [])
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_STORE_SETUPS)
     def test_find_assets_in_non_existent_course(self, storebuilder):
         """
         Find asset metadata from a non-existent course.
@@ -231,7 +234,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             with self.assertRaises(ItemNotFoundError):
                 store.get_all_asset_metadata(fake_course_id, 'asset')
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_STORE_SETUPS)
     def test_add_same_asset_twice(self, storebuilder):
         """
         Add an asset's metadata, then add it again.
@@ -248,7 +251,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             # Still one here?
             self.assertEquals(len(store.get_all_asset_metadata(course.id, 'asset')), 1)
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_STORE_SETUPS)
     def test_different_asset_types(self, storebuilder):
         """
         Test saving assets with other asset types.
@@ -262,7 +265,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             self.assertEquals(len(store.get_all_asset_metadata(course.id, 'vrml')), 1)
             self.assertEquals(len(store.get_all_asset_metadata(course.id, 'asset')), 0)
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_STORE_SETUPS)
     def test_asset_types_with_other_field_names(self, storebuilder):
         """
         Test saving assets using an asset type of 'course_id'.
@@ -278,7 +281,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             all_assets = store.get_all_asset_metadata(course.id, 'course_id')
             self.assertEquals(all_assets[0].asset_id.path, new_asset_loc.path)
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_STORE_SETUPS)
     def test_lock_unlock_assets(self, storebuilder):
         """
         Save multiple metadata in each store and retrieve it singularly, as all assets, and after deleting all.
@@ -326,7 +329,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
         ('villain', 'Khan')
     )
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_STORE_SETUPS)
     def test_set_all_attrs(self, storebuilder):
         """
         Save setting each attr one at a time
@@ -345,7 +348,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
                 self.assertIsNotNone(getattr(updated_asset_md, attribute, None))
                 self.assertEquals(getattr(updated_asset_md, attribute, None), value)
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_STORE_SETUPS)
     def test_set_disallowed_attrs(self, storebuilder):
         """
         setting disallowed attrs should fail
@@ -366,7 +369,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
                 # Make sure that the attribute is unchanged from its original value.
                 self.assertEquals(getattr(updated_asset_md, attribute, None), original_attr_val)
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_STORE_SETUPS)
     def test_set_unknown_attrs(self, storebuilder):
         """
         setting unknown attrs should fail
@@ -386,7 +389,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
                 with self.assertRaises(AttributeError):
                     self.assertEquals(getattr(updated_asset_md, attribute), value)
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_STORE_SETUPS)
     def test_save_one_different_asset(self, storebuilder):
         """
         saving and deleting things which are not 'asset'
@@ -402,7 +405,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             self.assertEquals(store.delete_asset_metadata(asset_key, ModuleStoreEnum.UserID.test), 1)
             self.assertEquals(len(store.get_all_asset_metadata(course.id, 'different')), 0)
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_STORE_SETUPS)
     def test_find_different(self, storebuilder):
         """
         finding things which are of type other than 'asset'
@@ -427,7 +430,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             self.assertEquals(assets[idx].asset_id.asset_type, asset[0])
             self.assertEquals(assets[idx].asset_id.path, asset[1])
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_STORE_SETUPS)
     def test_get_multiple_types(self, storebuilder):
         """
         getting all things which are of type other than 'asset'
@@ -464,7 +467,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             self.assertEquals(len(assets), len(self.alls))
             self._check_asset_values(assets, self.alls)
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_STORE_SETUPS)
     def test_save_metadata_list(self, storebuilder):
         """
         Save a list of asset metadata all at once.
@@ -504,7 +507,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             self.assertEquals(len(assets), len(self.alls))
             self._check_asset_values(assets, self.alls)
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_STORE_SETUPS)
     def test_save_metadata_list_with_mismatched_asset(self, storebuilder):
         """
         Save a list of asset metadata all at once - but with one asset's metadata from a different course.
@@ -547,7 +550,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             self.assertEquals(len(assets), len(self.differents + self.vrmls))
             self._check_asset_values(assets, self.differents + self.vrmls)
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_STORE_SETUPS)
     def test_delete_all_different_type(self, storebuilder):
         """
         deleting all assets of a given but not 'asset' type
@@ -562,7 +565,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
 
             self.assertEquals(len(store.get_all_asset_metadata(course.id, 'different')), 1)
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_STORE_SETUPS)
     def test_get_all_assets_with_paging(self, storebuilder):
         """
         Save multiple metadata in each store and retrieve it singularly, as all assets, and after deleting all.
@@ -646,7 +649,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             self.assertEquals(store.find_asset_metadata(asset_key), None)
             self.assertEquals(store.get_all_asset_metadata(course_key, 'asset'), [])
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_STORE_SETUPS)
     def test_copy_all_assets_same_modulestore(self, storebuilder):
         """
         Create a course with assets, copy them all to another course in the same modulestore, and check on it.
@@ -666,7 +669,7 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             self.assertEquals(all_assets[0].asset_id.path, 'pic1.jpg')
             self.assertEquals(all_assets[1].asset_id.path, 'shout.ogg')
 
-    @ddt.data(*MODULESTORE_SETUPS)
+    @ddt.data(*ASSET_STORE_SETUPS)
     def test_copy_all_assets_from_course_with_no_assets(self, storebuilder):
         """
         Create a course with *no* assets, and try copy them all to another course in the same modulestore.
@@ -707,3 +710,36 @@ class TestMongoAssetMetadataStorage(unittest.TestCase):
             self.assertEquals(len(all_assets), 2)
             self.assertEquals(all_assets[0].asset_id.path, 'pic1.jpg')
             self.assertEquals(all_assets[1].asset_id.path, 'shout.ogg')
+
+    def test_migrate_asset_metadata_per_asset(self):
+        """
+        Save assets in course documents, copy them into documents per asset, and check on them.
+        """
+        with MongoModulestoreBuilder().build() as (__, store):
+            course1 = CourseFactory.create(modulestore=store)
+            course2 = CourseFactory.create(modulestore=store)
+            self.setup_assets(course1.id, course2.id, store)
+            by_upload_date = ('uploadDate', ModuleStoreEnum.SortOrder.ascending)
+            expected = store.get_all_asset_metadata(course2.id, 'asset', sort=by_upload_date)
+
+            self.assertEquals(store.migrate_asset_metadata_per_asset(course1.id), 2)
+            self.assertEquals(store.migrate_asset_metadata_per_asset(), 7)
+
+            store.asset_metadata_per_asset = True
+            self.assertEquals(len(store.get_all_asset_metadata(course1.id, 'asset')), 2)
+            migrated = store.get_all_asset_metadata(course2.id, 'asset', sort=by_upload_date)
+            self.assertEquals([md.asset_id for md in migrated], [md.asset_id for md in expected])
+            for expected_md, migrated_md in zip(expected, migrated):
+                self.assertEquals(expected_md, migrated_md)
+
+    def test_ensure_indexes_includes_asset_metadata(self):
+        """
+        Check that ensure_indexes makes asset documents unique per course, asset type and filename.
+        """
+        with MongoModulestoreBuilder(asset_metadata_per_asset=True).build() as (__, store):
+            store.ensure_indexes()
+            unique_keys = [
+                index['key'] for index in store.asset_metadata_collection.index_information().values()
+                if index.get('unique')
+            ]
+            self.assertIn([('course_id', 1), ('asset_type', 1), ('filename', 1)], unique_keys)
@@ -137,6 +137,13 @@ class MongoModulestoreBuilder(StoreBuilderBase):
     """
     A builder class for a DraftModuleStore.
     """
+    def __init__(self, **options):
+        """
+        Args:
+            options: Any options to pass to the DraftModuleStore on instantiation.
+        """
+        self.options = options
+
     @contextmanager
     def build_with_contentstore(self, contentstore):
         """
@@ -166,6 +173,7 @@ class MongoModulestoreBuilder(StoreBuilderBase):
             branch_setting_func=lambda: ModuleStoreEnum.Branch.draft_preferred,
             metadata_inheritance_cache_subsystem=MemoryCache(),
             xblock_mixins=XBLOCK_MIXINS,
+            **self.options
         )
         modulestore.ensure_indexes()
 
@@ -179,7 +187,9 @@ class MongoModulestoreBuilder(StoreBuilderBase):
             rmtree(fs_root, ignore_errors=True)
 
     def __repr__(self):
-        return 'MongoModulestoreBuilder()'
+        return 'MongoModulestoreBuilder({})'.format(
+            ', '.join('{}={!r}'.format(name, value) for name, value in sorted(self.options.items()))
+        )
 
 
 class VersioningModulestoreBuilder(StoreBuilderBase):
@@ -211,6 +221,7 @@ class VersioningModulestoreBuilder(StoreBuilderBase):
             fs_root,
             render_template=repr,
             xblock_mixins=XBLOCK_MIXINS,
+            **self.options
         )
         modulestore.ensure_indexes()
 
@@ -0,0 +1,77 @@
+"""
+Tests of the metadata inheritance tree of the Mongo modulestore.
+"""
+import pickle
+import unittest
+
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.mongo.inheritance_tree import MetadataInheritanceTree
+
+BRANCH = ModuleStoreEnum.Branch.draft_preferred
+
+
+class TestMetadataInheritanceTree(unittest.TestCase):
+    """
+    Tests of MetadataInheritanceTree.
+    """
+    def setUp(self):
+        super(TestMetadataInheritanceTree, self).setUp()
+        self.tree = MetadataInheritanceTree(root='course', branch=BRANCH)
+        self.tree.set_node('course', {'due': 'course due', 'graceperiod': '1 day'}, ['chapter'])
+        self.tree.set_node('chapter', {'due': 'chapter due'}, ['sequential', 'html'])
+        self.tree.set_node('sequential', {}, ['problem'])
+
+    def test_inherited_metadata(self):
+        self.assertEqual(self.tree.inherited_metadata('course'), {})
+        self.assertEqual(self.tree.inherited_metadata('chapter'), {'due': 'course due', 'graceperiod': '1 day'})
+        self.assertEqual(self.tree.inherited_metadata('problem'), {'due': 'chapter due', 'graceperiod': '1 day'})
+        # Siblings share what their parent passes on
+        self.assertIs(self.tree.inherited_metadata('sequential'), self.tree.inherited_metadata('html'))
+
+    def test_parent(self):
+        self.assertEqual(self.tree.parent('problem', BRANCH), 'sequential')
+        self.assertIsNone(self.tree.parent('course', BRANCH))
+        self.assertIsNone(self.tree.parent('problem', ModuleStoreEnum.Branch.published_only))
+
+    def test_set_node_updates_subtree(self):
+        self.tree.inherited_metadata('problem')
+        self.tree.set_node('chapter', {'due': 'new due'}, ['html'])
+        self.assertEqual(self.tree.inherited_metadata('html'), {'due': 'new due', 'graceperiod': '1 day'})
+        # The sequential is no longer beneath the root
+        self.assertEqual(self.tree.inherited_metadata('problem'), {})
+        self.assertIsNone(self.tree.parent('problem', BRANCH))
+        self.assertIsNone(self.tree.parent('sequential', BRANCH))
+
+        self.tree.set_node('vertical', {'due': 'vertical due'}, ['sequential'])
+        self.tree.set_node('chapter', {'due': 'new due'}, ['html', 'vertical'])
+        self.assertEqual(self.tree.inherited_metadata('problem'), {'due': 'vertical due', 'graceperiod': '1 day'})
+        self.assertEqual(self.tree.parent('sequential', BRANCH), 'vertical')
+
+    def test_remove_node(self):
+        self.tree.remove_node('sequential')
+        self.assertIsNone(self.tree.parent('problem', BRANCH))
+        self.assertEqual(self.tree.inherited_metadata('problem'), {})
+        self.assertEqual(self.tree.parent('sequential', BRANCH), 'chapter')
+
+    def test_cycle(self):
+        self.tree.set_node('vertical', {}, ['loop'])
+        self.tree.set_node('loop', {}, ['vertical', 'html'])
+        self.assertEqual(self.tree.inherited_metadata('html'), {})
+        self.assertIsNone(self.tree.parent('vertical', BRANCH))
+
+    def test_pickle(self):
+        tree = pickle.loads(pickle.dumps(self.tree))
+        self.assertEqual((tree.root, tree.branch), ('course', BRANCH))
+        self.assertEqual(tree.inherited_metadata('problem'), {'due': 'chapter due', 'graceperiod': '1 day'})
+        self.assertEqual(tree.parent('problem', BRANCH), 'sequential')
+
+    def test_unpickling_other_version(self):
+        state = self.tree.__getstate__()
+        state['version'] = MetadataInheritanceTree.VERSION - 1
+        tree = MetadataInheritanceTree()
+        tree.__setstate__(state)
+        self.assertFalse(tree)
+        self.assertNotEqual(
+            MetadataInheritanceTree.cache_key('org/course/run'),
+            'org/course/run'
+        )
@@ -858,6 +858,16 @@ class TestMixedModuleStore(CommonMixedModuleStoreSetup):
             published_courses = self.store.get_courses(remove_branch=True)
         self.assertEquals([c.id for c in draft_courses], [c.id for c in published_courses])
 
+    @ddt.data('draft', 'split')
+    def test_get_course_keys(self, default_ms):
+        self.initdb(default_ms)
+        course_keys = self.store.get_course_keys()
+        self.assertItemsEqual(course_keys, [course.id for course in self.store.get_courses()])
+        self.assertIn(self.course_locations[self.MONGO_COURSEID].course_key, course_keys)
+
+        mongo_org = self.course_locations[self.MONGO_COURSEID].course_key.org
+        self.assertTrue(all(course_key.org == mongo_org for course_key in self.store.get_course_keys(org=mongo_org)))
+
     @ddt.data('draft', 'split')
     def test_create_child_detached_tabs(self, default_ms):
         """
@@ -17,7 +17,7 @@ from uuid import uuid4
 from datetime import datetime
 from pytz import UTC
 import unittest
-from mock import patch
+from mock import patch, Mock
 from xblock.core import XBlock
 
 from xblock.fields import Scope, Reference, ReferenceList, ReferenceValueDict
@@ -40,7 +40,7 @@ from nose.tools import assert_in
 from xmodule.exceptions import NotFoundError
 from git.test.lib.asserts import assert_not_none
 from xmodule.x_module import XModuleMixin
-from xmodule.modulestore.mongo.base import as_draft
+from xmodule.modulestore.mongo.base import as_draft, as_published
 from xmodule.modulestore.tests.mongo_connection import MONGO_PORT_NUM, MONGO_HOST
 from xmodule.modulestore.tests.utils import LocationMixin, mock_tab_from_json
 from xmodule.modulestore.edit_info import EditInfoMixin
@@ -768,6 +768,39 @@ class TestMongoModuleStore(TestMongoModuleStoreBase):
         self.draft_store.delete_course(course.id, self.dummy_user)
 
 
+    def test_metadata_inheritance_tree_updates_incrementally(self):
+        """
+        Tests that saving a container updates the cached inheritance tree without recomputing it
+        """
+        course = self.draft_store.create_course("TestX", "Inheritance", "2015", self.dummy_user)
+        chapter = self.draft_store.create_child(self.dummy_user, course.location, 'chapter')
+        sequential = self.draft_store.create_child(self.dummy_user, chapter.location, 'sequential')
+        problem = self.draft_store.create_child(self.dummy_user, sequential.location, 'problem')
+
+        with patch.object(self.draft_store, 'request_cache', Mock(data={})):
+            # computes the tree and caches it
+            self.assertIsNone(self.draft_store.get_item(problem.location).days_early_for_beta)
+
+            # adding a child updates the tree too
+            other_sequential = self.draft_store.create_child(self.dummy_user, chapter.location, 'sequential')
+            chapter = self.draft_store.get_item(chapter.location)
+            chapter.days_early_for_beta = 2
+            with patch.object(self.draft_store, '_compute_metadata_inheritance_tree') as compute_tree:
+                self.draft_store.update_item(chapter, self.dummy_user)
+                self.assertEqual(self.draft_store.get_item(problem.location).days_early_for_beta, 2)
+                self.assertEqual(self.draft_store.get_item(other_sequential.location).days_early_for_beta, 2)
+
+                tree = self.draft_store._get_cached_metadata_inheritance_tree(course.id)
+                other_sequential_url = unicode(as_published(other_sequential.location))
+                self.assertEqual(
+                    tree.parent(other_sequential_url, ModuleStoreEnum.Branch.draft_preferred),
+                    unicode(as_published(chapter.location))
+                )
+            self.assertFalse(compute_tree.called)
+
+        self.draft_store.delete_course(course.id, self.dummy_user)
+
+
 class TestMongoModuleStoreWithNoAssetCollection(TestMongoModuleStore):
     '''
     Tests a situation where no asset_collection is specified.
@@ -0,0 +1,118 @@
+"""
+Tests of the two-tier structure cache used by the split modulestore's MongoConnection.
+"""
+import unittest
+
+from bson.objectid import ObjectId
+from mock import Mock, patch
+
+from xmodule.modulestore import BlockData
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.mongo_connection import CourseStructureCache
+
+
+class FakeDjangoCache(object):
+    """
+    A dict-backed stand-in for a Django cache.
+    """
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        """ Return the value stored for key, or None """
+        return self.data.get(key)
+
+    def set(self, key, value):
+        """ Store value under key """
+        self.data[key] = value
+
+
+def make_structure():
+    """
+    Return a minimal converted split structure.
+    """
+    root = BlockKey('course', 'root')
+    return {
+        '_id': ObjectId(),
+        'root': root,
+        'blocks': {
+            root: BlockData(block_type='course', fields={'children': []}, edit_info={}),
+        },
+    }
+
+
+class TestCourseStructureCache(unittest.TestCase):
+    """
+    Tests of CourseStructureCache.
+    """
+    def setUp(self):
+        super(TestCourseStructureCache, self).setUp()
+        self.shared_cache = FakeDjangoCache()
+        patcher = patch(
+            'xmodule.modulestore.split_mongo.mongo_connection.get_cache',
+            Mock(return_value=self.shared_cache),
+            create=True,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch('xmodule.modulestore.split_mongo.mongo_connection.DJANGO_AVAILABLE', True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_miss(self):
+        cache = CourseStructureCache()
+        self.assertIsNone(cache.get(ObjectId()))
+
+    def test_round_trip_returns_copies(self):
+        cache = CourseStructureCache()
+        structure = make_structure()
+        cache.set(structure['_id'], structure)
+
+        cached = cache.get(structure['_id'])
+        self.assertEqual(cached['root'], structure['root'])
+        self.assertEqual(cached['blocks'].keys(), structure['blocks'].keys())
+
+        # Mutating a returned structure must not affect what other callers see
+        cached['blocks'].clear()
+        self.assertEqual(len(cache.get(structure['_id'])['blocks']), 1)
+
+    def test_shared_tier(self):
+        structure = make_structure()
+        CourseStructureCache().set(structure['_id'], structure)
+        self.assertIn(unicode(structure['_id']), self.shared_cache.data)
+
+        # A fresh cache (e.g. in another process) finds it in the shared tier
+        other_cache = CourseStructureCache()
+        self.assertEqual(other_cache.get(structure['_id'])['_id'], structure['_id'])
+
+    def test_local_lru_eviction(self):
+        cache = CourseStructureCache(local_size=2)
+        cache.cache = None
+        structures = [make_structure() for __ in range(3)]
+        for structure in structures:
+            cache.set(structure['_id'], structure)
+
+        self.assertIsNone(cache.get(structures[0]['_id']))
+        self.assertIsNotNone(cache.get(structures[1]['_id']))
+        self.assertIsNotNone(cache.get(structures[2]['_id']))
+
+    def test_local_lru_recency(self):
+        cache = CourseStructureCache(local_size=2)
+        cache.cache = None
+        structures = [make_structure() for __ in range(3)]
+        cache.set(structures[0]['_id'], structures[0])
+        cache.set(structures[1]['_id'], structures[1])
+        # Touch the oldest entry so that the next insert evicts the other one
+        cache.get(structures[0]['_id'])
+        cache.set(structures[2]['_id'], structures[2])
+
+        self.assertIsNotNone(cache.get(structures[0]['_id']))
+        self.assertIsNone(cache.get(structures[1]['_id']))
+
+    def test_no_shared_tier(self):
+        with patch('xmodule.modulestore.split_mongo.mongo_connection.DJANGO_AVAILABLE', False):
+            cache = CourseStructureCache(local_size=0)
+        self.assertIsNone(cache.cache)
+        structure = make_structure()
+        cache.set(structure['_id'], structure)
+        self.assertIsNone(cache.get(structure['_id']))
@@ -828,6 +828,18 @@ class XMLModuleStore(ModuleStoreReadBase):
         """
         return self.courses.values()
 
+    def get_course_keys(self, **kwargs):
+        """
+        Returns a list of the keys of the courses, including those which failed to load.
+        This accepts an optional parameter of 'org' to only get the keys of courses with
+        the specified ORG.
+        """
+        course_org_filter = kwargs.get('org')
+        return [
+            course.location.course_key for course in self.courses.values()
+            if not course_org_filter or course.location.org == course_org_filter
+        ]
+
     def get_errored_courses(self):
         """
         Return a dictionary of course_dir -> [(msg, exception_str)], for each
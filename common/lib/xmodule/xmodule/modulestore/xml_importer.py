@@ -20,8 +20,10 @@ Modulestore virtual   |          XML physical (draft, published)
              (a, a)   |  (a, a) | (x, a) | (x, x) | (x, y) | (a, x)
              (a, b)   |  (a, b) | (x, b) | (x, x) | (x, y) | (a, x)
 """
+import hashlib
 import logging
 from abc import abstractmethod
+from multiprocessing.pool import ThreadPool
 from opaque_keys.edx.locator import LibraryLocator
 import os
 import mimetypes
@@ -53,10 +55,100 @@ from xmodule.modulestore.tests.utils import LocationMixin
 log = logging.getLogger(__name__)
 
 
+# The number of threads reading, hashing, thumbnailing and saving static content during import
+STATIC_CONTENT_IMPORT_WORKERS = 4
+
+# Static files this large or larger are streamed into the content store rather than read into memory
+STATIC_CONTENT_STREAM_SIZE = 4 * 1024 * 1024
+
+# The size of the chunks static files are hashed and streamed in
+STATIC_CONTENT_CHUNK_SIZE = 1024 * 1024
+
+
+def _read_static_file_chunks(content_path):
+    """
+    Yields the contents of the file at content_path in chunks.
+    """
+    with open(content_path, 'rb') as static_file:
+        for chunk in iter(lambda: static_file.read(STATIC_CONTENT_CHUNK_SIZE), ''):
+            yield chunk
+
+
+def _import_static_file(content_path, static_content_store, asset_key, content_kwargs, existing_asset):
+    """
+    Saves the static file at content_path, and its thumbnail, to the content store, unless the content
+    store already has the same file (by md5) for asset_key as existing_asset, in which case only its
+    changed attributes are saved.
+
+    Returns False if the file couldn't be read because it's an OS X "companion file", else True.
+    """
+    try:
+        length = os.path.getsize(content_path)
+        md5 = hashlib.md5()
+        if length >= STATIC_CONTENT_STREAM_SIZE:
+            data = None
+            for chunk in _read_static_file_chunks(content_path):
+                md5.update(chunk)
+        else:
+            with open(content_path, 'rb') as static_file:
+                data = static_file.read()
+            md5.update(data)
+    except (IOError, OSError):
+        if os.path.basename(content_path).startswith('._'):
+            # OS X "companion files". See
+            # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
+            return False
+        # Not a 'hidden file', then re-raise exception
+        raise
+
+    if (
+            existing_asset is not None and
+            existing_asset.get('md5') == md5.hexdigest() and
+            existing_asset.get('contentType') == content_kwargs['content_type']
+    ):
+        # The content store already has this file (and so its thumbnail), so just update any changed attributes
+        attrs = {
+            'displayname': content_kwargs['name'],
+            'import_path': content_kwargs['import_path'],
+            'locked': content_kwargs['locked'],
+        }
+        changed_attrs = {attr: value for attr, value in attrs.iteritems() if existing_asset.get(attr) != value}
+        if changed_attrs:
+            static_content_store.set_attrs(asset_key, changed_attrs)
+        return True
+
+    if data is None:
+        data = _read_static_file_chunks(content_path)
+    content = StaticContent(asset_key, data=data, length=length, **content_kwargs)
+
+    # first let's save a thumbnail so we can get back a thumbnail location
+    thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(
+        content, tempfile_path=content_path
+    )
+
+    if thumbnail_content is not None:
+        content.thumbnail_location = thumbnail_location
+
+    # then commit the content
+    try:
+        static_content_store.save(content)
+    except Exception as err:
+        log.exception(u'Error importing {0}, error={1}'.format(
+            content_kwargs['import_path'], err
+        ))
+    return True
+
+
 def import_static_content(
         course_data_path, static_content_store,
         target_id, subpath='static', verbose=False):
+    """
+    Imports the static files under subpath of course_data_path into the static_content_store for target_id,
+    returning a dict mapping their paths relative to subpath to their asset keys.
 
+    Files are read, hashed, thumbnailed and saved by a pool of STATIC_CONTENT_IMPORT_WORKERS threads.
+    Files the content store already has for the course, with the same md5, aren't saved again.
+    """
     remap_dict = {}
 
     # now import all static assets
@@ -64,7 +156,7 @@ def import_static_content(
     try:
         with open(course_data_path / 'policies/assets.json') as f:
             policy = json.load(f)
-    except (IOError, ValueError) as err:
+    except (IOError, ValueError):
         # xml backed courses won't have this file, only exported courses;
         # so, its absence is not really an exception.
         policy = {}
@@ -75,6 +167,13 @@ def import_static_content(
     mimetypes.add_type('application/octet-stream', '.srt')
     mimetypes_list = mimetypes.types_map.values()
 
+    # The assets the content store already has for the course, by name
+    existing_assets = {
+        asset['asset_key'].name: asset
+        for asset in static_content_store.get_all_content_for_course(target_id)[0]
+    }
+
+    static_files = []
     for dirname, _, filenames in os.walk(static_dir):
         for filename in filenames:
 
@@ -88,17 +187,6 @@ def import_static_content(
             if verbose:
                 log.debug('importing static content %s...', content_path)
 
-            try:
-                with open(content_path, 'rb') as f:
-                    data = f.read()
-            except IOError:
-                if filename.startswith('._'):
-                    # OS X "companion files". See
-                    # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
-                    continue
-                # Not a 'hidden file', then re-raise exception
-                raise
-
             # strip away leading path from the name
             fullname_with_subpath = content_path.replace(static_dir, '')
             if fullname_with_subpath.startswith('/'):
@@ -113,28 +201,35 @@ def import_static_content(
             # Check extracted contentType in list of all valid mimetypes
             if not mime_type or mime_type not in mimetypes_list:
                 mime_type = mimetypes.guess_type(filename)[0]   # Assign guessed mimetype
-            content = StaticContent(
-                asset_key, displayname, mime_type, data,
-                import_path=fullname_with_subpath, locked=locked
-            )
-
-            # first let's save a thumbnail so we can get back a thumbnail location
-            thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(content)
-
-            if thumbnail_content is not None:
-                content.thumbnail_location = thumbnail_location
-
-            # then commit the content
-            try:
-                static_content_store.save(content)
-            except Exception as err:
-                log.exception(u'Error importing {0}, error={1}'.format(
-                    fullname_with_subpath, err
-                ))
-
+            content_kwargs = {
+                'name': displayname,
+                'content_type': mime_type,
+                'import_path': fullname_with_subpath,
+                'locked': locked,
+            }
+            static_files.append((
+                fullname_with_subpath,
+                (content_path, static_content_store, asset_key, content_kwargs, existing_assets.get(asset_key.name)),
+            ))
+
+    if not static_files:
+        return remap_dict
+
+    pool = ThreadPool(min(STATIC_CONTENT_IMPORT_WORKERS, len(static_files)))
+    try:
+        imported = pool.map(lambda args: _import_static_file(*args), [args for __, args in static_files])
+    except Exception:
+        pool.terminate()
+        raise
+    finally:
+        pool.close()
+        pool.join()
+
+    for (fullname_with_subpath, args), was_imported in zip(static_files, imported):
+        if was_imported:
             # store the remapping information which will be needed
             # to subsitute in the module data
-            remap_dict[fullname_with_subpath] = asset_key
+            remap_dict[fullname_with_subpath] = args[2]
 
     return remap_dict
 
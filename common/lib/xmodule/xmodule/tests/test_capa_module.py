@@ -24,6 +24,8 @@ from capa.responsetypes import (StudentInputError, LoncapaProblemError,
                                 ResponseError)
 from capa.xqueue_interface import XQueueInterface
 from xmodule.capa_module import CapaModule, CapaDescriptor, ComplexEncoder
+from xmodule.capa_base import get_cached_static_metadata, static_metadata_cache_key
+from xmodule.exceptions import UndefinedContext
 from opaque_keys.edx.locations import Location
 from xblock.field_data import DictFieldData
 from xblock.fields import ScopeIds
@@ -1784,6 +1786,60 @@ class CapaDescriptorTest(unittest.TestCase):
         )
 
 
+class DictCache(dict):
+    """
+    A dict with the get and set methods of a Django cache.
+    """
+    def set(self, key, value):  # pylint: disable=missing-docstring
+        self[key] = value
+
+
+class CapaStaticMetadataTest(unittest.TestCase):
+    """
+    Tests of the caching of problems' static metadata.
+    """
+    def setUp(self):
+        super(CapaStaticMetadataTest, self).setUp()
+        self.cache = DictCache()
+        patcher = patch('xmodule.capa_base._static_metadata_cache', return_value=self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_max_score_caches_metadata(self):
+        module = CapaFactory.create()
+        self.assertIsNone(get_cached_static_metadata(module))
+        self.assertEqual(module.max_score(), 1)
+        self.assertEqual(get_cached_static_metadata(module), {
+            'max_score': 1,
+            'response_types': ['numericalresponse'],
+            'answer_ids': [CapaFactory.answer_key()],
+        })
+
+    def test_key_changes_with_definition(self):
+        module = CapaFactory.create()
+        key = static_metadata_cache_key(module)
+        module.data = module.data.replace('3.14', '3.1416')
+        self.assertNotEqual(static_metadata_cache_key(module), key)
+
+    def test_error_problems_not_cached(self):
+        module = CapaFactory.create()
+        module.lcp_has_error = True
+        module.max_score()
+        self.assertEqual(self.cache, {})
+
+    def test_descriptor_uses_cached_metadata(self):
+        module = CapaFactory.create()
+        module.max_score()
+        descriptor = CapaDescriptor(
+            get_test_system(), DictFieldData({'data': module.data}), module.scope_ids
+        )
+        # The descriptor isn't bound to a module system, so it can't construct the problem
+        self.assertEqual(descriptor.max_score(), 1)
+        self.cache.clear()
+        with self.assertRaises(UndefinedContext):
+            descriptor.max_score()
+
+
 class ComplexEncoderTest(unittest.TestCase):
     def test_default(self):
         """
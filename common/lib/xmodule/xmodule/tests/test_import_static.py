@@ -1,8 +1,9 @@
 """
 Tests that check that we ignore the appropriate files when importing courses.
 """
+import hashlib
 import unittest
-from mock import Mock
+from mock import Mock, patch
 from xmodule.modulestore.xml_importer import import_static_content
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from xmodule.tests import DATA_DIR
@@ -15,6 +16,7 @@ class IgnoredFilesTestCase(unittest.TestCase):
         course_id = SlashSeparatedCourseKey("edX", "tilde", "Fall_2012")
         content_store = Mock()
         content_store.generate_thumbnail.return_value = ("content", "location")
+        content_store.get_all_content_for_course.return_value = ([], 0)
         import_static_content(course_dir, content_store, course_id)
         saved_static_content = [call[0][0] for call in content_store.save.call_args_list]
         name_val = {sc.name: sc.data for sc in saved_static_content}
@@ -30,6 +32,7 @@ class IgnoredFilesTestCase(unittest.TestCase):
         course_id = SlashSeparatedCourseKey("edX", "dot-underscore", "2014_Fall")
         content_store = Mock()
         content_store.generate_thumbnail.return_value = ("content", "location")
+        content_store.get_all_content_for_course.return_value = ([], 0)
         import_static_content(course_dir, content_store, course_id)
         saved_static_content = [call[0][0] for call in content_store.save.call_args_list]
         name_val = {sc.name: sc.data for sc in saved_static_content}
@@ -39,3 +42,60 @@ class IgnoredFilesTestCase(unittest.TestCase):
         self.assertNotIn(".DS_Store", name_val)
         self.assertIn("GREEN", name_val["example.txt"])
         self.assertIn("BLUE", name_val[".example.txt"])
+
+
+class ImportStaticContentTestCase(unittest.TestCase):
+    "Tests for reusing and streaming static content"
+    def setUp(self):
+        super(ImportStaticContentTestCase, self).setUp()
+        self.course_dir = DATA_DIR / "tilde"
+        self.course_id = SlashSeparatedCourseKey("edX", "tilde", "Fall_2012")
+        self.content_store = Mock()
+        self.content_store.generate_thumbnail.return_value = (None, "location")
+        with open(self.course_dir / "static" / "example.txt", 'rb') as static_file:
+            self.data = static_file.read()
+
+    def existing_asset(self, **attrs):
+        """
+        Returns the content store's description of example.txt, as already imported.
+        """
+        asset = {
+            'asset_key': self.course_id.make_asset_key('asset', 'example.txt'),
+            'md5': hashlib.md5(self.data).hexdigest(),
+            'contentType': 'text/plain',
+            'displayname': 'example.txt',
+            'import_path': 'example.txt',
+            'locked': False,
+        }
+        asset.update(attrs)
+        return asset
+
+    def test_unchanged_content_not_saved(self):
+        self.content_store.get_all_content_for_course.return_value = ([self.existing_asset()], 1)
+        remap = import_static_content(self.course_dir, self.content_store, self.course_id)
+        self.assertIn('example.txt', remap)
+        self.assertFalse(self.content_store.save.called)
+        self.assertFalse(self.content_store.set_attrs.called)
+
+    def test_changed_attributes_saved(self):
+        self.content_store.get_all_content_for_course.return_value = ([self.existing_asset(locked=True)], 1)
+        import_static_content(self.course_dir, self.content_store, self.course_id)
+        self.assertFalse(self.content_store.save.called)
+        self.content_store.set_attrs.assert_called_once_with(
+            self.course_id.make_asset_key('asset', 'example.txt'), {'locked': False}
+        )
+
+    def test_changed_content_saved(self):
+        self.content_store.get_all_content_for_course.return_value = ([self.existing_asset(md5='changed')], 1)
+        import_static_content(self.course_dir, self.content_store, self.course_id)
+        saved_static_content = [call[0][0] for call in self.content_store.save.call_args_list]
+        self.assertEqual([sc.data for sc in saved_static_content], [self.data])
+
+    @patch('xmodule.modulestore.xml_importer.STATIC_CONTENT_CHUNK_SIZE', 2)
+    @patch('xmodule.modulestore.xml_importer.STATIC_CONTENT_STREAM_SIZE', 1)
+    def test_large_content_streamed(self):
+        self.content_store.get_all_content_for_course.return_value = ([], 0)
+        import_static_content(self.course_dir, self.content_store, self.course_id)
+        content = self.content_store.save.call_args[0][0]
+        self.assertEqual(content.length, len(self.data))
+        self.assertEqual(''.join(content.data), self.data)
@@ -63,8 +63,9 @@ def course_structure(course_key):
     """
     course = _retrieve_course(course_key)
     try:
-        requested_course_structure = models.CourseStructure.objects.get(course_id=course.id)
-        return serializers.CourseStructureSerializer(requested_course_structure.structure).data
+        requested_course_structure = models.CourseStructure.get_parsed_structure(course.id)
+        structure = requested_course_structure.structure if requested_course_structure else None
+        return serializers.CourseStructureSerializer(structure).data
     except models.CourseStructure.DoesNotExist:
         # If we don't have data stored, generate it and return an error.
         tasks.update_course_structure.delay(unicode(course_key))
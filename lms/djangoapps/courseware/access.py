@@ -73,8 +73,8 @@ def has_access(user, action, obj, course_key=None):
     user: a Django user object. May be anonymous. If none is passed,
                     anonymous is assumed
 
-    obj: The object to check access for.  A module, descriptor, location, or
-                    certain special strings (e.g. 'global')
+    obj: The object to check access for.  A module, descriptor, course overview,
+                    location, or certain special strings (e.g. 'global')
 
     action: A string specifying the action that the client is trying to perform.
 
@@ -122,6 +122,12 @@ def has_access(user, action, obj, course_key=None):
     if isinstance(obj, basestring):
         return _has_access_string(user, action, obj)
 
+    # Imported here rather than at the top of the module, since course
+    # overviews are created with courseware.courses, which imports this module.
+    from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+    if isinstance(obj, CourseOverview):
+        return _has_access_course_desc(user, action, obj)
+
     # Passing an unknown object here is a coding error, so rather than
     # returning a default, complain.
     raise TypeError("Unknown object type in has_access(): '{0}'"
@@ -131,7 +137,7 @@ def has_access(user, action, obj, course_key=None):
 # ================ Implementation helpers ================================
 def _has_access_course_desc(user, action, course):
     """
-    Check if user has access to a course descriptor.
+    Check if user has access to a course descriptor or a CourseOverview.
 
     Valid actions:
 
@@ -151,8 +157,14 @@ def _has_access_course_desc(user, action, course):
 
         NOTE: this is not checking whether user is actually enrolled in the course.
         """
-        # delegate to generic descriptor check to check start dates
-        return _has_access_descriptor(user, 'load', course, course.id)
+        if isinstance(course, XBlock):
+            # delegate to generic descriptor check to check start dates
+            return _has_access_descriptor(user, 'load', course, course.id)
+
+        # A course overview only has the course's own staff lock and start date
+        if course.visible_to_staff_only and not _has_staff_access_to_descriptor(user, course, course.id):
+            return False
+        return _can_access_descriptor_with_start_date(user, course, course.id)
 
     def can_load_mobile():
         """
@@ -417,27 +429,11 @@ def _has_access_descriptor(user, action, descriptor, course_key=None):
             # in which case immediately grant access.
             return _has_staff_access_to_descriptor(user, descriptor, course_key)
 
-        # If start dates are off, can always load
-        if settings.FEATURES['DISABLE_START_DATES'] and not is_masquerading_as_student(user, course_key):
-            debug("Allow: DISABLE_START_DATES")
-            return True
-
         # Check start date
-        if 'detached' not in descriptor._class_tags and descriptor.start is not None:
-            now = datetime.now(UTC())
-            effective_start = _adjust_start_date_for_beta_testers(
-                user,
-                descriptor,
-                course_key=course_key
-            )
-            if in_preview_mode() or now > effective_start:
-                # after start date, everyone can see it
-                debug("Allow: now > effective start date")
-                return True
-            # otherwise, need staff access
-            return _has_staff_access_to_descriptor(user, descriptor, course_key)
+        if 'detached' not in descriptor._class_tags:
+            return _can_access_descriptor_with_start_date(user, descriptor, course_key)
 
-        # No start date, so can always load.
+        # Detached blocks have no start date, so can always load.
         debug("Allow: no start date")
         return True
 
@@ -450,6 +446,39 @@ def _has_access_descriptor(user, action, descriptor, course_key=None):
     return _dispatch(checkers, action, user, descriptor)
 
 
+def _can_access_descriptor_with_start_date(user, descriptor, course_key):  # pylint: disable=invalid-name
+    """
+    Check if user can access descriptor as far as its start date is concerned:
+    either start dates are disabled, the descriptor has no start date, the
+    (beta tester adjusted) start date has passed, or the user is staff.
+
+    descriptor: anything with location, start and days_early_for_beta
+    attributes, such as an XModuleDescriptor or a CourseOverview.
+    """
+    # If start dates are off, can always load
+    if settings.FEATURES['DISABLE_START_DATES'] and not is_masquerading_as_student(user, course_key):
+        debug("Allow: DISABLE_START_DATES")
+        return True
+
+    if descriptor.start is None:
+        # No start date, so can always load.
+        debug("Allow: no start date")
+        return True
+
+    now = datetime.now(UTC())
+    effective_start = _adjust_start_date_for_beta_testers(
+        user,
+        descriptor,
+        course_key=course_key
+    )
+    if in_preview_mode() or now > effective_start:
+        # after start date, everyone can see it
+        debug("Allow: now > effective start date")
+        return True
+    # otherwise, need staff access
+    return _has_staff_access_to_descriptor(user, descriptor, course_key)
+
+
 def _has_access_xmodule(user, action, xmodule, course_key):
     """
     Check if user has access to this xmodule.
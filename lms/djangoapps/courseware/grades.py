@@ -1,13 +1,17 @@
 # Compute grades using real division, with no integer truncation
 from __future__ import division
 from collections import defaultdict
+import hashlib
+import itertools
 import json
 import random
 import logging
 
 from contextlib import contextmanager
+from multiprocessing.pool import ThreadPool
 from django.conf import settings
-from django.db import transaction
+from django.db import IntegrityError, connections, transaction
+from django.db.models import Max, Min
 from django.test.client import RequestFactory
 
 import dogstats_wrapper as dog_stats_api
@@ -19,18 +23,19 @@ from util.module_utils import yield_dynamic_descriptor_descendants
 from xmodule import graders
 from xmodule.graders import Score
 from xmodule.modulestore.django import modulestore
-from xmodule.modulestore.exceptions import ItemNotFoundError
-from .models import StudentModule
+from .models import StudentModule, PersistentSubsectionGrade, PersistentCourseGrade
 from .module_render import get_module_for_descriptor
 from submissions import api as sub_api  # installed from the edx-submissions repository
-from opaque_keys import InvalidKeyError
-from opaque_keys.edx.keys import CourseKey
+from opaque_keys.edx.keys import CourseKey, UsageKey
 
 
 log = logging.getLogger("edx.courseware")
 
+# The number of students whose StudentModule scores iterate_grades_for loads at once
+GRADING_BATCH_SIZE = 100
 
-def answer_distributions(course_key):
+
+def answer_distributions(course_key, num_shards=None):
     """
     Given a course_key, return answer distributions in the form of a dictionary
     mapping:
@@ -57,81 +62,166 @@ def answer_distributions(course_key):
     not be aware of problems that are not visible to the user being used to
     generate the report.
 
+    The StudentModule rows are streamed in batches, and split by id into
+    `num_shards` (by default, the ANSWER_DISTRIBUTION_SHARDS setting) ranges
+    that are counted concurrently (each in its own thread and database
+    connection) and merged at the end. Only the answer counts are kept in
+    memory.
+
     This method will try to use a read-replica database if one is available.
     """
-    # dict: { module.module_state_key : (url_name, display_name) }
-    state_keys_to_problem_info = {}  # For caching, used by url_and_display_name
+    if num_shards is None:
+        num_shards = settings.ANSWER_DISTRIBUTION_SHARDS
+    problem_info = _problem_info_for_course(course_key)
+    shards = answer_distribution_shards(course_key, num_shards)
+    if len(shards) <= 1:
+        shard_counts = [_answer_counts_for_shard(course_key, problem_info, shard) for shard in shards]
+    else:
+        pool = ThreadPool(len(shards))
+        try:
+            shard_counts = pool.map(
+                lambda shard: _answer_counts_for_shard(course_key, problem_info, shard, close_connections=True),
+                shards
+            )
+        finally:
+            pool.close()
 
-    def url_and_display_name(usage_key):
-        """
-        For a given usage_key, return the problem's url and display_name.
-        Handle modulestore access and caching. This method ignores permissions.
+    return merge_answer_distributions(shard_counts)
+
+
+# The number of StudentModule rows answer distributions are computed from per query
+ANSWER_DISTRIBUTION_BATCH_SIZE = 1000
 
-        Raises:
-            InvalidKeyError: if the usage_key does not parse
-            ItemNotFoundError: if there is no content that corresponds
-                to this usage_key.
-        """
-        problem_store = modulestore()
-        if usage_key not in state_keys_to_problem_info:
-            problem = problem_store.get_item(usage_key)
-            problem_info = (problem.url_name, problem.display_name_with_default)
-            state_keys_to_problem_info[usage_key] = problem_info
 
-        return state_keys_to_problem_info[usage_key]
+def _problem_info_for_course(course_key):
+    """
+    Return a dict mapping the StudentModule key of each problem in the course
+    to its (url_name, display_name), fetched in one modulestore query. This
+    ignores permissions.
+    """
+    return {
+        _student_module_key(problem.location): (problem.url_name, problem.display_name_with_default)
+        for problem in modulestore().get_items(course_key, qualifiers={'category': 'problem'})
+    }
+
+
+def answer_distribution_shards(course_key, num_shards):
+    """
+    Split the ids of the course's submitted problem StudentModules into at
+    most `num_shards` contiguous, inclusive (min_id, max_id) ranges, for
+    counting answer distributions in parallel. Returns an empty list if
+    nothing has been submitted.
+    """
+    id_range = StudentModule.all_submitted_problems_read_only(course_key).aggregate(Min('id'), Max('id'))
+    min_id, max_id = id_range['id__min'], id_range['id__max']
+    if min_id is None:
+        return []
+
+    shard_size = (max_id - min_id) // max(num_shards, 1) + 1
+    return [
+        (shard_min, min(shard_min + shard_size - 1, max_id))
+        for shard_min in xrange(min_id, max_id + 1, shard_size)
+    ]
+
+
+def _extract_student_answers(state):
+    """
+    Return the student_answers dict from a problem's JSON state.
+
+    Raises ValueError if the state can't be decoded.
+    """
+    if not state:
+        return {}
+    return json.loads(state).get("student_answers", {})
 
-    # Iterate through all problems submitted for this course in no particular
-    # order, and build up our answer_counts dict that we will eventually return
+
+def _answer_counts_for_shard(course_key, problem_info, shard, close_connections=False):
+    """
+    Count the submitted answers of the StudentModules in the course whose ids
+    are in the inclusive (min_id, max_id) range `shard`, reading the rows in
+    batches. `problem_info` is as returned by `_problem_info_for_course`.
+
+    If `close_connections` is set, close this thread's database connections
+    when done (for shards run in their own threads).
+    """
+    min_id, max_id = shard
     answer_counts = defaultdict(lambda: defaultdict(int))
-    for module in StudentModule.all_submitted_problems_read_only(course_key):
-        try:
-            state_dict = json.loads(module.state) if module.state else {}
-            raw_answers = state_dict.get("student_answers", {})
-        except ValueError:
-            log.error(
-                u"Answer Distribution: Could not parse module state for StudentModule id=%s, course=%s",
-                module.id,
-                course_key,
-            )
-            continue
+    rows_query = StudentModule.all_submitted_problems_read_only(course_key).filter(
+        id__lte=max_id
+    ).order_by('id').values_list('id', 'student_id', 'module_state_key', 'state')
 
-        try:
-            url, display_name = url_and_display_name(module.module_state_key.map_into_course(course_key))
-            # Each problem part has an ID that is derived from the
-            # module.module_state_key (with some suffix appended)
-            for problem_part_id, raw_answer in raw_answers.items():
-                # Convert whatever raw answers we have (numbers, unicode, None, etc.)
-                # to be unicode values. Note that if we get a string, it's always
-                # unicode and not str -- state comes from the json decoder, and that
-                # always returns unicode for strings.
-                answer = unicode(raw_answer)
-                answer_counts[(url, display_name, problem_part_id)][answer] += 1
-
-        except (ItemNotFoundError, InvalidKeyError):
-            msg = "Answer Distribution: Item {} referenced in StudentModule {} " + \
-                  "for user {} in course {} not found; " + \
-                  "This can happen if a student answered a question that " + \
-                  "was later deleted from the course. This answer will be " + \
-                  "omitted from the answer distribution CSV."
-            log.warning(
-                msg.format(module.module_state_key, module.id, module.student_id, course_key)
-            )
-            continue
+    try:
+        last_id = min_id - 1
+        while True:
+            rows = list(rows_query.filter(id__gt=last_id)[:ANSWER_DISTRIBUTION_BATCH_SIZE])
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            for module_id, student_id, module_state_key, state in rows:
+                try:
+                    raw_answers = _extract_student_answers(state)
+                except ValueError:
+                    log.error(
+                        u"Answer Distribution: Could not parse module state for StudentModule id=%s, course=%s",
+                        module_id,
+                        course_key,
+                    )
+                    continue
+
+                if unicode(module_state_key) not in problem_info:
+                    msg = "Answer Distribution: Item {} referenced in StudentModule {} " + \
+                          "for user {} in course {} not found; " + \
+                          "This can happen if a student answered a question that " + \
+                          "was later deleted from the course. This answer will be " + \
+                          "omitted from the answer distribution CSV."
+                    log.warning(
+                        msg.format(module_state_key, module_id, student_id, course_key)
+                    )
+                    continue
+
+                url, display_name = problem_info[unicode(module_state_key)]
+                # Each problem part has an ID that is derived from the
+                # module.module_state_key (with some suffix appended)
+                for problem_part_id, raw_answer in raw_answers.items():
+                    # Convert whatever raw answers we have (numbers, unicode, None, etc.)
+                    # to be unicode values. Note that if we get a string, it's always
+                    # unicode and not str -- state comes from the json decoder, and that
+                    # always returns unicode for strings.
+                    answer = unicode(raw_answer)
+                    answer_counts[(url, display_name, problem_part_id)][answer] += 1
+    finally:
+        if close_connections:
+            for connection in connections.all():
+                connection.close()
 
     return answer_counts
 
 
+def merge_answer_distributions(shard_counts):
+    """
+    Merge answer distributions computed for separate shards (as returned by
+    `_answer_counts_for_shard`) into one.
+    """
+    answer_counts = defaultdict(lambda: defaultdict(int))
+    for counts in shard_counts:
+        for problem_part, answers in counts.iteritems():
+            for answer, count in answers.iteritems():
+                answer_counts[problem_part][answer] += count
+    return answer_counts
+
+
 @transaction.commit_manually
-def grade(student, request, course, keep_raw_scores=False):
+def grade(student, request, course, keep_raw_scores=False, student_module_scores=None):
     """
     Wraps "_grade" with the manual_transaction context manager just in case
     there are unanticipated errors.
     """
     with manual_transaction():
-        return _grade(student, request, course, keep_raw_scores)
+        return _grade(student, request, course, keep_raw_scores, student_module_scores)
 
 
-def _grade(student, request, course, keep_raw_scores):
+def _grade(student, request, course, keep_raw_scores, student_module_scores=None):
     """
     Unwrapped version of "grade"
 
@@ -150,6 +240,10 @@ def _grade(student, request, course, keep_raw_scores):
     - keep_raw_scores : if True, then value for key 'raw_scores' contains scores
       for every graded module
 
+    student_module_scores, if given, is the student's StudentModule scores as
+    returned by `prefetch_student_module_scores`, and is used instead of
+    querying StudentModule for every section and problem.
+
     More information on the format is in the docstring for CourseGrader.
     """
     grading_context = course.grading_context
@@ -162,6 +256,8 @@ def _grade(student, request, course, keep_raw_scores):
         course.id.to_deprecated_string(), anonymous_id_for_user(student, course.id)
     )
 
+    persisted_grades = PersistedGrades(student, course)
+
     totaled_scores = {}
     # This next complicated loop is just to collect the totaled_scores, which is
     # passed to the grader
@@ -169,84 +265,33 @@ def _grade(student, request, course, keep_raw_scores):
         format_scores = []
         for section in sections:
             section_descriptor = section['section_descriptor']
-            section_name = section_descriptor.display_name_with_default
 
             # some problems have state that is updated independently of interaction
             # with the LMS, so they need to always be scored. (E.g. foldit.,
             # combinedopenended)
-            should_grade_section = any(
+            always_recalculate = any(
                 descriptor.always_recalculate_grades for descriptor in section['xmoduledescriptors']
             )
 
-            # If there are no problems that always have to be regraded, check to
-            # see if any of our locations are in the scores from the submissions
-            # API. If scores exist, we have to calculate grades for this section.
-            if not should_grade_section:
-                should_grade_section = any(
-                    descriptor.location.to_deprecated_string() in submissions_scores
-                    for descriptor in section['xmoduledescriptors']
-                )
-
-            if not should_grade_section:
-                with manual_transaction():
-                    should_grade_section = StudentModule.objects.filter(
-                        student=student,
-                        module_state_key__in=[
-                            descriptor.location for descriptor in section['xmoduledescriptors']
-                        ]
-                    ).exists()
-
-            # If we haven't seen a single problem in the section, we don't have
-            # to grade it at all! We can assume 0%
-            if should_grade_section:
-                scores = []
-
-                def create_module(descriptor):
-                    '''creates an XModule instance given a descriptor'''
-                    # TODO: We need the request to pass into here. If we could forego that, our arguments
-                    # would be simpler
-                    with manual_transaction():
-                        field_data_cache = FieldDataCache([descriptor], course.id, student)
-                    return get_module_for_descriptor(
-                        student, request, descriptor, field_data_cache, course.id, course=course
-                    )
-
-                for module_descriptor in yield_dynamic_descriptor_descendants(
-                        section_descriptor, student.id, create_module
-                ):
-
-                    (correct, total) = get_score(
-                        course.id, student, module_descriptor, create_module, scores_cache=submissions_scores
-                    )
-                    if correct is None and total is None:
-                        continue
-
-                    if settings.GENERATE_PROFILE_SCORES:  	# for debugging!
-                        if total > 1:
-                            correct = random.randrange(max(total - 2, 1), total + 1)
-                        else:
-                            correct = total
-
-                    graded = module_descriptor.graded
-                    if not total > 0:
-                        # We simply cannot grade a problem that is 12/0, because we might need it as a percentage
-                        graded = False
-
-                    scores.append(
-                        Score(
-                            correct,
-                            total,
-                            graded,
-                            module_descriptor.display_name_with_default,
-                            module_descriptor.location
-                        )
-                    )
+            # Sections with scores from outside the courseware (see above, and
+            # the submissions API) are never stored.
+            persistable = not always_recalculate and not any(
+                descriptor.location.to_deprecated_string() in submissions_scores
+                for descriptor in section['xmoduledescriptors']
+            )
 
-                _, graded_total = graders.aggregate_scores(scores, section_name)
-                if keep_raw_scores:
-                    raw_scores += scores
+            persisted = persisted_grades.get(section_descriptor) if persistable else None
+            if persisted is not None:
+                graded_total, scores = persisted
             else:
-                graded_total = Score(0.0, 1.0, True, section_name, None)
+                graded_total, scores = _grade_section(
+                    student, request, course, section, submissions_scores, always_recalculate, student_module_scores
+                )
+                if persistable:
+                    persisted_grades.add(section_descriptor.location, graded_total, scores)
+
+            if keep_raw_scores:
+                raw_scores += scores
 
             #Add the graded total to totaled_scores
             if graded_total.possible > 0:
@@ -259,6 +304,9 @@ def _grade(student, request, course, keep_raw_scores):
 
         totaled_scores[section_format] = format_scores
 
+    with manual_transaction():
+        persisted_grades.save()
+
     # Grading policy might be overriden by a CCX, need to reset it
     course.set_grading_policy(course.grading_policy)
     grade_summary = course.grader.grade(totaled_scores, generate_random_scores=settings.GENERATE_PROFILE_SCORES)
@@ -270,6 +318,10 @@ def _grade(student, request, course, keep_raw_scores):
     letter_grade = grade_for_percentage(course.grade_cutoffs, grade_summary['percent'])
     grade_summary['grade'] = letter_grade
     grade_summary['totaled_scores'] = totaled_scores  	# make this available, eg for instructor download & debugging
+
+    with manual_transaction():
+        persisted_grades.save_course_grade(grade_summary['percent'], letter_grade)
+
     if keep_raw_scores:
         # way to get all RAW scores out to instructor
         # so grader can be double-checked
@@ -277,6 +329,294 @@ def _grade(student, request, course, keep_raw_scores):
     return grade_summary
 
 
+def _grade_section(student, request, course, section, submissions_scores, should_grade_section=False,
+                   student_module_scores=None):
+    """
+    Grade a single graded section of the course (an entry of
+    `course.grading_context['graded_sections']`) by instantiating its scored
+    modules for the student.
+
+    Returns a tuple of the section's graded total and the list of Scores of
+    its scored modules.
+    """
+    section_descriptor = section['section_descriptor']
+    section_name = section_descriptor.display_name_with_default
+
+    # If there are no problems that always have to be regraded, check to
+    # see if any of our locations are in the scores from the submissions
+    # API. If scores exist, we have to calculate grades for this section.
+    if not should_grade_section:
+        should_grade_section = any(
+            descriptor.location.to_deprecated_string() in submissions_scores
+            for descriptor in section['xmoduledescriptors']
+        )
+
+    if not should_grade_section and student_module_scores is not None:
+        should_grade_section = any(
+            _student_module_key(descriptor.location) in student_module_scores
+            for descriptor in section['xmoduledescriptors']
+        )
+    elif not should_grade_section:
+        with manual_transaction():
+            should_grade_section = StudentModule.objects.filter(
+                student=student,
+                module_state_key__in=[
+                    descriptor.location for descriptor in section['xmoduledescriptors']
+                ]
+            ).exists()
+
+    # If we haven't seen a single problem in the section, we don't have
+    # to grade it at all! We can assume 0%
+    if not should_grade_section:
+        return Score(0.0, 1.0, True, section_name, None), []
+
+    scores = []
+
+    def create_module(descriptor):
+        '''creates an XModule instance given a descriptor'''
+        # TODO: We need the request to pass into here. If we could forego that, our arguments
+        # would be simpler
+        with manual_transaction():
+            field_data_cache = FieldDataCache([descriptor], course.id, student)
+        return get_module_for_descriptor(
+            student, request, descriptor, field_data_cache, course.id, course=course
+        )
+
+    for module_descriptor in yield_dynamic_descriptor_descendants(
+            section_descriptor, student.id, create_module
+    ):
+
+        (correct, total) = get_score(
+            course.id, student, module_descriptor, create_module, scores_cache=submissions_scores,
+            student_module_scores=student_module_scores
+        )
+        if correct is None and total is None:
+            continue
+
+        if settings.GENERATE_PROFILE_SCORES:  	# for debugging!
+            if total > 1:
+                correct = random.randrange(max(total - 2, 1), total + 1)
+            else:
+                correct = total
+
+        graded = module_descriptor.graded
+        if not total > 0:
+            # We simply cannot grade a problem that is 12/0, because we might need it as a percentage
+            graded = False
+
+        scores.append(
+            Score(
+                correct,
+                total,
+                graded,
+                module_descriptor.display_name_with_default,
+                module_descriptor.location
+            )
+        )
+
+    _, graded_total = graders.aggregate_scores(scores, section_name)
+    return graded_total, scores
+
+
+def _course_version(course):
+    """
+    Return a string identifying the version of the course content, for checking
+    whether persisted grades are still valid, or None if the course's store
+    doesn't track content versions.
+    """
+    edited_on = course.subtree_edited_on
+    if edited_on is None:
+        return None
+    return unicode(course.course_version or edited_on.isoformat())
+
+
+def _grades_version(course, student):
+    """
+    Return a string identifying the version of the course content and the
+    student's groups in the course's user partitions, which together decide
+    what the student is graded on, or None if the course's store doesn't
+    track content versions. Students aren't assigned to groups they aren't
+    in yet.
+    """
+    course_version = _course_version(course)
+    if course_version is None or not course.user_partitions:
+        return course_version
+    groups = []
+    for partition in course.user_partitions:
+        group = partition.scheme.get_group_for_user(course.id, student, partition, assign=False)
+        groups.append(u'{}:{}'.format(partition.id, group.id if group is not None else ''))
+    return u'{}/{}'.format(course_version, hashlib.sha1(u','.join(groups)).hexdigest())
+
+
+def _persistence_enabled():
+    """
+    Return whether grades are persisted, which they aren't when scores are
+    generated randomly for profiling.
+    """
+    return settings.FEATURES.get('ENABLE_PERSISTENT_GRADES', False) and not settings.GENERATE_PROFILE_SCORES
+
+
+class PersistedGrades(object):
+    """
+    The stored subsection grades of one student in one course (see
+    `PersistentSubsectionGrade`), and the new ones computed while grading them.
+
+    Stored grades are only used while the course content and the student's
+    partition groups are the same as when they were computed (see
+    `_grades_version`), and grades are only written when they were computed
+    again, after one of the student's scores changed or the stored grades
+    became stale, so grading with every grade stored writes nothing.
+
+    Persistence is disabled (every lookup misses and nothing is saved) unless
+    the ENABLE_PERSISTENT_GRADES feature is on and the course content is
+    versioned. It is also disabled when GENERATE_PROFILE_SCORES is set, since
+    those scores are random.
+    """
+    def __init__(self, student, course):
+        self.student = student
+        self.course = course
+        self.course_version = _grades_version(course, student) if _persistence_enabled() else None
+        self.enabled = self.course_version is not None
+        self._new_grades = []
+        self._stored_grades = {}
+        self._stored_course_grade = None
+
+        if self.enabled:
+            with manual_transaction():
+                self._stored_grades = {
+                    stored_grade.usage_key.map_into_course(course.id): stored_grade
+                    for stored_grade in PersistentSubsectionGrade.objects.filter(
+                        user=student, course_id=course.id, course_version=self.course_version
+                    )
+                }
+                try:
+                    self._stored_course_grade = PersistentCourseGrade.objects.get(user=student, course_id=course.id)
+                except PersistentCourseGrade.DoesNotExist:
+                    pass
+
+    def get(self, section_descriptor):
+        """
+        Return the stored (graded_total, scores) of the subsection, or None if
+        there is no valid stored grade for it.
+        """
+        stored_grade = self._stored_grades.get(section_descriptor.location)
+        if stored_grade is None:
+            return None
+
+        scores = [
+            Score(earned, possible, graded, display_name, UsageKey.from_string(location).map_into_course(self.course.id))
+            for earned, possible, graded, display_name, location in json.loads(stored_grade.raw_scores)
+        ]
+        graded_total = Score(
+            stored_grade.earned,
+            stored_grade.possible,
+            True,
+            section_descriptor.display_name_with_default,
+            None
+        )
+        return graded_total, scores
+
+    def add(self, usage_key, graded_total, scores):
+        """
+        Record a newly computed grade for the subsection at `usage_key`, to be stored by `save`.
+        """
+        if not self.enabled:
+            return
+
+        self._new_grades.append(PersistentSubsectionGrade(
+            user=self.student,
+            course_id=self.course.id,
+            usage_key=usage_key,
+            course_version=self.course_version,
+            earned=graded_total.earned,
+            possible=graded_total.possible,
+            raw_scores=json.dumps([
+                [score.earned, score.possible, score.graded, score.section, unicode(score.module_id)]
+                for score in scores
+            ]),
+        ))
+
+    def save(self):
+        """
+        Store the grades recorded by `add`, replacing any stale ones.
+        """
+        if not self._new_grades:
+            return
+
+        PersistentSubsectionGrade.objects.filter(
+            user=self.student,
+            course_id=self.course.id,
+            usage_key__in=[grade.usage_key for grade in self._new_grades],
+        ).delete()
+        try:
+            PersistentSubsectionGrade.objects.bulk_create(self._new_grades)
+        except IntegrityError:
+            # Another process stored the same grades concurrently
+            log.info("Persisted grades for %s in %s were saved concurrently", self.student.id, self.course.id)
+        self._new_grades = []
+
+    def save_course_grade(self, percent, letter_grade):
+        """
+        Store the student's overall grade in the course, unless the stored one
+        is already up to date.
+        """
+        if not self.enabled:
+            return
+
+        letter_grade = letter_grade or ''
+        course_grade = self._stored_course_grade
+        if course_grade is not None and (
+                (course_grade.course_version, course_grade.percent, course_grade.letter_grade) ==
+                (self.course_version, percent, letter_grade)
+        ):
+            return
+
+        if course_grade is None:
+            course_grade, created = PersistentCourseGrade.objects.get_or_create(
+                user=self.student,
+                course_id=self.course.id,
+                defaults={
+                    'course_version': self.course_version,
+                    'percent': percent,
+                    'letter_grade': letter_grade,
+                }
+            )
+            if created:
+                self._stored_course_grade = course_grade
+                return
+        course_grade.course_version = self.course_version
+        course_grade.percent = percent
+        course_grade.letter_grade = letter_grade
+        course_grade.save()
+        self._stored_course_grade = course_grade
+
+
+def get_persisted_course_grade(student, course):
+    """
+    Return the student's stored overall grade in the course as a dict with
+    'percent' and 'grade' keys, or None if there is no stored grade that is
+    valid for the current version of the course content and the student's
+    partition groups. This doesn't compute the grade; use `grade` for that.
+    """
+    if not _persistence_enabled():
+        return None
+    course_version = _grades_version(course, student)
+    if course_version is None:
+        return None
+
+    try:
+        course_grade = PersistentCourseGrade.objects.get(
+            user=student, course_id=course.id, course_version=course_version
+        )
+    except PersistentCourseGrade.DoesNotExist:
+        return None
+
+    return {
+        'percent': course_grade.percent,
+        'grade': course_grade.letter_grade or None,
+    }
+
+
 def grade_for_percentage(grade_cutoffs, percentage):
     """
     Returns a letter grade as defined in grading_policy (e.g. 'A' 'B' 'C' for 6.002x) or None.
@@ -415,7 +755,7 @@ def _progress_summary(student, request, course):
     return chapters
 
 
-def get_score(course_id, user, problem_descriptor, module_creator, scores_cache=None):
+def get_score(course_id, user, problem_descriptor, module_creator, scores_cache=None, student_module_scores=None):
     """
     Return the score for a user on a problem, as a tuple (correct, total).
     e.g. (5,7) if you got 5 out of 7 points.
@@ -429,6 +769,8 @@ def get_score(course_id, user, problem_descriptor, module_creator, scores_cache=
            Can return None if user doesn't have access, or if something else went wrong.
     scores_cache: A dict of location names to (earned, possible) point tuples.
            If an entry is found in this cache, it takes precedence.
+    student_module_scores: The user's StudentModule scores, as returned by
+           `prefetch_student_module_scores`. If given, StudentModule isn't queried.
     """
     scores_cache = scores_cache or {}
 
@@ -455,22 +797,28 @@ def get_score(course_id, user, problem_descriptor, module_creator, scores_cache=
         # These are not problems, and do not have a score
         return (None, None)
 
-    try:
-        student_module = StudentModule.objects.get(
-            student=user,
-            course_id=course_id,
-            module_state_key=problem_descriptor.location
-        )
-    except StudentModule.DoesNotExist:
-        student_module = None
+    if student_module_scores is not None:
+        grade, max_grade = student_module_scores.get(_student_module_key(problem_descriptor.location), (None, None))
+    else:
+        try:
+            student_module = StudentModule.objects.get(
+                student=user,
+                course_id=course_id,
+                module_state_key=problem_descriptor.location
+            )
+            grade, max_grade = student_module.grade, student_module.max_grade
+        except StudentModule.DoesNotExist:
+            grade, max_grade = None, None
 
-    if student_module is not None and student_module.max_grade is not None:
-        correct = student_module.grade if student_module.grade is not None else 0
-        total = student_module.max_grade
+    if max_grade is not None:
+        correct = grade if grade is not None else 0
+        total = max_grade
     else:
         # If the problem was not in the cache, or hasn't been graded yet,
-        # we need to instantiate the problem.
-        # Otherwise, the max score (cached in student_module) won't be available
+        # we need to bind the problem to the user to find its max score.
+        # Otherwise, the max score (cached in student_module) won't be available.
+        # Problems such as capa problems may find their max score without being
+        # fully constructed (see CapaDescriptor.static_metadata).
         problem = module_creator(problem_descriptor)
         if problem is None:
             return (None, None)
@@ -487,7 +835,7 @@ def get_score(course_id, user, problem_descriptor, module_creator, scores_cache=
     weight = problem_descriptor.weight
     if weight is not None:
         if total == 0:
-            log.exception("Cannot reweight a problem with zero total points. Problem: " + str(student_module))
+            log.exception("Cannot reweight a problem with zero total points. Problem: " + unicode(problem_descriptor.location))
             return (correct, total)
         correct = correct * weight / total
         total = weight
@@ -495,6 +843,38 @@ def get_score(course_id, user, problem_descriptor, module_creator, scores_cache=
     return (correct, total)
 
 
+def _student_module_key(location):
+    """
+    Return the string that `location` is stored as in StudentModule.module_state_key.
+    """
+    if hasattr(location, 'version_agnostic') and hasattr(location, 'for_branch'):
+        location = location.for_branch(None).version_agnostic()
+    return unicode(location)
+
+
+def prefetch_student_module_scores(course_key, students):
+    """
+    Load the scores of all of `students`' StudentModules in the course in
+    one query.
+
+    Returns a dict mapping each student's id to a dict of
+    {module_state_key string: (grade, max_grade)}, suitable for passing as
+    `student_module_scores` to `grade`.
+    """
+    student_module_scores = {student.id: {} for student in students}
+    if not student_module_scores:
+        return student_module_scores
+
+    rows = StudentModule.objects.filter(
+        course_id=course_key,
+        student_id__in=student_module_scores.keys(),
+    ).values_list('student_id', 'module_state_key', 'grade', 'max_grade')
+    for student_id, module_state_key, grade_value, max_grade in rows:
+        student_module_scores[student_id][unicode(module_state_key)] = (grade_value, max_grade)
+
+    return student_module_scores
+
+
 @contextmanager
 def manual_transaction():
     """A context manager for managing manual transactions"""
@@ -508,11 +888,15 @@ def manual_transaction():
         transaction.commit()
 
 
-def iterate_grades_for(course_or_id, students, keep_raw_scores=False):
+def iterate_grades_for(course_or_id, students, keep_raw_scores=False, batch_size=GRADING_BATCH_SIZE):
     """Given a course_id and an iterable of students (User), yield a tuple of:
 
     (student, gradeset, err_msg) for every student enrolled in the course.
 
+    Students are graded in batches of `batch_size`, and the StudentModule
+    scores of each batch are loaded in a single query up front rather than
+    queried section by section and problem by problem.
+
     If an error occurred, gradeset will be an empty dict and err_msg will be an
     exception message. If there was no error, err_msg is an empty string.
 
@@ -536,25 +920,36 @@ def iterate_grades_for(course_or_id, students, keep_raw_scores=False):
     # grading that student.
     request = RequestFactory().get('/')
 
-    for student in students:
-        with dog_stats_api.timer('lms.grades.iterate_grades_for', tags=[u'action:{}'.format(course.id)]):
-            try:
-                request.user = student
-                # Grading calls problem rendering, which calls masquerading,
-                # which checks session vars -- thus the empty session dict below.
-                # It's not pretty, but untangling that is currently beyond the
-                # scope of this feature.
-                request.session = {}
-                gradeset = grade(student, request, course, keep_raw_scores)
-                yield student, gradeset, ""
-            except Exception as exc:  # pylint: disable=broad-except
-                # Keep marching on even if this student couldn't be graded for
-                # some reason, but log it for future reference.
-                log.exception(
-                    'Cannot grade student %s (%s) in course %s because of exception: %s',
-                    student.username,
-                    student.id,
-                    course.id,
-                    exc.message
-                )
-                yield student, {}, exc.message
+    students = iter(students)
+    while True:
+        student_batch = list(itertools.islice(students, batch_size))
+        if not student_batch:
+            break
+
+        with manual_transaction():
+            batch_scores = prefetch_student_module_scores(course.id, student_batch)
+
+        for student in student_batch:
+            with dog_stats_api.timer('lms.grades.iterate_grades_for', tags=[u'action:{}'.format(course.id)]):
+                try:
+                    request.user = student
+                    # Grading calls problem rendering, which calls masquerading,
+                    # which checks session vars -- thus the empty session dict below.
+                    # It's not pretty, but untangling that is currently beyond the
+                    # scope of this feature.
+                    request.session = {}
+                    gradeset = grade(
+                        student, request, course, keep_raw_scores, student_module_scores=batch_scores[student.id]
+                    )
+                    yield student, gradeset, ""
+                except Exception as exc:  # pylint: disable=broad-except
+                    # Keep marching on even if this student couldn't be graded for
+                    # some reason, but log it for future reference.
+                    log.exception(
+                        'Cannot grade student %s (%s) in course %s because of exception: %s',
+                        student.username,
+                        student.id,
+                        course.id,
+                        exc.message
+                    )
+                    yield student, {}, exc.message
@@ -18,7 +18,7 @@ import itertools
 from django.contrib.auth.models import User
 from django.conf import settings
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver, Signal
 
 from model_utils.models import TimeStampedModel
@@ -276,6 +276,74 @@ class OfflineComputedGradeLog(models.Model):
         return "[OCGLog] %s: %s" % (self.course_id.to_deprecated_string(), self.created)  # pylint: disable=no-member
 
 
+class PersistentSubsectionGrade(TimeStampedModel):
+    """
+    A student's scores on one graded subsection (sequential) of a course, stored
+    so that grading doesn't have to instantiate every problem in the subsection
+    again. Rows are only trusted while their course_version matches the version
+    of the course content being graded and of the student's partition groups,
+    and are deleted whenever one of the student's scores in the subsection
+    changes. See `courseware.grades`.
+    """
+    class Meta(object):  # pylint: disable=missing-docstring
+        unique_together = (('user', 'course_id', 'usage_key'),)
+
+    user = models.ForeignKey(User, db_index=True)
+    course_id = CourseKeyField(max_length=255, db_index=True)
+
+    # The subsection these scores are for
+    usage_key = LocationKeyField(max_length=255)
+
+    # The version of the course content and of the student's partition groups
+    # these scores were computed against
+    course_version = models.CharField(max_length=255, blank=True)
+
+    # The graded total for the subsection
+    earned = models.FloatField()
+    possible = models.FloatField()
+
+    # The score of every scored block in the subsection, stored as a JSON list
+    # of [earned, possible, graded, display_name, usage_key] entries
+    raw_scores = models.TextField(default='[]')
+
+    @classmethod
+    def invalidate(cls, user_id, course_key, usage_keys):
+        """
+        Delete the stored grades for the subsections in `usage_keys`, along with
+        the student's stored course grade.
+        """
+        cls.objects.filter(user_id=user_id, course_id=course_key, usage_key__in=usage_keys).delete()
+        PersistentCourseGrade.objects.filter(user_id=user_id, course_id=course_key).delete()
+
+    def __unicode__(self):
+        return u"[PersistentSubsectionGrade] {}: {} {} = {}/{}".format(
+            self.user_id, self.course_id, self.usage_key, self.earned, self.possible
+        )
+
+
+class PersistentCourseGrade(TimeStampedModel):
+    """
+    The most recently computed overall grade of a student in a course.
+    """
+    class Meta(object):  # pylint: disable=missing-docstring
+        unique_together = (('user', 'course_id'),)
+
+    user = models.ForeignKey(User, db_index=True)
+    course_id = CourseKeyField(max_length=255, db_index=True)
+
+    # The version of the course content and of the student's partition groups
+    # this grade was computed against
+    course_version = models.CharField(max_length=255, blank=True)
+
+    percent = models.FloatField()
+    letter_grade = models.CharField(max_length=255, blank=True)
+
+    def __unicode__(self):
+        return u"[PersistentCourseGrade] {}: {} = {} ({})".format(
+            self.user_id, self.course_id, self.percent, self.letter_grade
+        )
+
+
 class StudentFieldOverride(TimeStampedModel):
     """
     Holds the value of a specific field overriden for a student.  This is used
@@ -389,3 +457,52 @@ def submissions_score_reset_handler(sender, **kwargs):  # pylint: disable=unused
             u"Failed to process score_reset signal from Submissions API. "
             "user: %s, course_id: %s, usage_id: %s", user, course_id, usage_id
         )
+
+
+@receiver(SCORE_CHANGED)
+def invalidate_persistent_grades(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Consume the SCORE_CHANGED signal and throw away the student's stored grade
+    for the subsection containing the scored block, so that only that subsection
+    is regraded the next time the student's grade is computed.
+    """
+    if not settings.FEATURES.get('ENABLE_PERSISTENT_GRADES'):
+        return
+
+    # Imported here to avoid loading the modulestore when the models are imported
+    from xmodule.modulestore.django import modulestore
+    from opaque_keys.edx.keys import UsageKey
+
+    usage_key = kwargs['usage_id']
+    if isinstance(usage_key, basestring):
+        usage_key = UsageKey.from_string(usage_key)
+    usage_key = usage_key.map_into_course(modulestore().fill_in_run(usage_key.course_key))
+
+    # Walk up to the enclosing subsection. If the block has been removed from
+    # the course, invalidate whatever we find on the way; the stale version will
+    # cause the rest to be regraded anyway.
+    ancestor_keys = [usage_key]
+    location = usage_key
+    while location is not None and location.block_type != 'sequential':
+        location = modulestore().get_parent_location(location)
+        if location is not None:
+            ancestor_keys.append(location)
+
+    PersistentSubsectionGrade.invalidate(kwargs['user_id'], usage_key.course_key, ancestor_keys)
+
+
+@receiver(post_delete, sender=StudentModule)
+def invalidate_persistent_grades_for_deleted_state(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Throw away stored grades when a student's state for a block is deleted
+    (e.g. when an instructor resets a student's attempts by deleting their state).
+    """
+    if instance.max_grade is None:
+        return
+
+    invalidate_persistent_grades(
+        sender=None,
+        user_id=instance.student_id,
+        course_id=instance.course_id,
+        usage_id=instance.module_state_key,
+    )
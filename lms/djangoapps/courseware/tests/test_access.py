@@ -9,8 +9,9 @@ from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
 import courseware.access as access
 from courseware.masquerade import CourseMasquerade
-from courseware.tests.factories import UserFactory, StaffFactory, InstructorFactory
+from courseware.tests.factories import BetaTesterFactory, UserFactory, StaffFactory, InstructorFactory
 from courseware.tests.helpers import LoginEnrollmentTestCase
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from student.tests.factories import AnonymousUserFactory, CourseEnrollmentAllowedFactory, CourseEnrollmentFactory
 from xmodule.course_module import (
     CATALOG_VISIBILITY_CATALOG_AND_ABOUT, CATALOG_VISIBILITY_ABOUT,
@@ -327,6 +328,34 @@ class AccessTestCase(LoginEnrollmentTestCase, ModuleStoreTestCase):
         fulfill_course_milestone(pre_requisite_course.id, user)
         self.assertTrue(access._has_access_course_desc(user, 'view_courseware_with_prerequisites', course))
 
+    @patch.dict('django.conf.settings.FEATURES', {'DISABLE_START_DATES': False})
+    def test_course_overview_access(self):
+        """
+        Test that a course's overview is given the same access as the course itself
+        """
+        tomorrow = datetime.datetime.now(pytz.utc) + datetime.timedelta(days=1)
+        courses = [
+            CourseFactory.create(org='test_org', number='786', run='test_run', start=tomorrow),
+            CourseFactory.create(
+                org='test_org', number='787', run='test_run', start=tomorrow, days_early_for_beta=2
+            ),
+            CourseFactory.create(org='test_org', number='788', run='test_run', visible_to_staff_only=True),
+            CourseFactory.create(
+                org='test_org', number='789', run='test_run', catalog_visibility=CATALOG_VISIBILITY_ABOUT
+            ),
+        ]
+        staff = StaffFactory.create(course_key=courses[0].id)
+        for course in courses:
+            course_overview = CourseOverview.get_from_id(course.id)
+            beta_tester = BetaTesterFactory.create(course_key=course.id)
+            for user in (self.student, beta_tester, staff, self.global_staff):
+                for action in ('load', 'see_in_catalog', 'see_about_page', 'staff'):
+                    self.assertEqual(
+                        access.has_access(user, action, course_overview),
+                        access.has_access(user, action, course),
+                        (course.id, user.username, action)
+                    )
+
     @patch.dict("django.conf.settings.FEATURES", {'ENABLE_PREREQUISITE_COURSES': True, 'MILESTONES_APP': True})
     def test_courseware_page_unfulfilled_prereqs(self):
         """
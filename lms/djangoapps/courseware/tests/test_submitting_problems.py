@@ -10,6 +10,7 @@ from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.urlresolvers import reverse
 from django.test.client import RequestFactory
+from django.test.utils import override_settings
 from mock import patch
 from nose.plugins.attrib import attr
 
@@ -18,14 +19,16 @@ from capa.tests.response_xml_factory import (
     CodeResponseXMLFactory,
 )
 from courseware import grades
-from courseware.models import StudentModule
+from courseware.models import StudentModule, PersistentCourseGrade, PersistentSubsectionGrade
 from courseware.tests.helpers import LoginEnrollmentTestCase
+from courseware.views import is_course_passed
 from lms.djangoapps.lms_xblock.runtime import quote_slashes
 from student.tests.factories import UserFactory
 from student.models import anonymous_id_for_user
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.partitions.partitions import Group, UserPartition
+from openedx.core.djangoapps.user_api.models import UserCourseTag
 from openedx.core.djangoapps.user_api.tests.factories import UserCourseTagFactory
 
 
@@ -464,6 +467,22 @@ class TestCourseGrader(TestSubmittingProblems):
         self.check_grade_percent(1.0)
         self.assertEqual(self.get_grade_summary()['grade'], 'A')
 
+    def test_iterate_grades_for_matches_grade(self):
+        """
+        Check that grading with prefetched StudentModule scores gives the same result.
+        """
+        self.basic_setup()
+        self.submit_question_answer('p1', {'2_1': 'Correct'})
+        self.submit_question_answer('p2', {'2_1': 'Incorrect'})
+        expected = self.get_grade_summary()
+
+        [(student, gradeset, err_msg)] = list(grades.iterate_grades_for(self.course, [self.student_user]))
+        self.assertEqual(student, self.student_user)
+        self.assertEqual(err_msg, "")
+        self.assertEqual(gradeset['percent'], expected['percent'])
+        self.assertEqual(gradeset['grade'], expected['grade'])
+        self.assertEqual(gradeset['section_breakdown'], expected['section_breakdown'])
+
     def test_wrong_answers(self):
         """
         Check that answering incorrectly is graded properly.
@@ -595,6 +614,66 @@ class TestCourseGrader(TestSubmittingProblems):
         self.assertEqual(self.score_for_hw('homework3'), [1.0, 1.0])
 
 
+@attr('shard_1')
+@patch.dict(settings.FEATURES, {'ENABLE_PERSISTENT_GRADES': True})
+class TestCourseGraderWithPersistentGrades(TestCourseGrader):
+    """
+    Run the course grader tests with subsection grades stored between gradings.
+    """
+    def test_grades_are_stored(self):
+        self.basic_setup()
+        self.submit_question_answer('p1', {'2_1': 'Correct'})
+        self.check_grade_percent(0.33)
+
+        stored_grades = PersistentSubsectionGrade.objects.filter(user=self.student_user, course_id=self.course.id)
+        self.assertEqual(stored_grades.count(), 1)
+        self.assertEqual((stored_grades[0].earned, stored_grades[0].possible), (1.0, 3.0))
+        self.assertEqual(
+            grades.get_persisted_course_grade(self.student_user, self.course),
+            {'percent': 0.33, 'grade': 'B'}
+        )
+
+        # Grading again reads the stored grades instead of regrading or storing them
+        with patch('courseware.grades._grade_section') as mock_grade_section:
+            with patch.object(PersistentCourseGrade, 'save') as mock_save:
+                with patch.object(PersistentSubsectionGrade.objects, 'bulk_create') as mock_bulk_create:
+                    self.check_grade_percent(0.33)
+        self.assertFalse(mock_grade_section.called)
+        self.assertFalse(mock_save.called)
+        self.assertFalse(mock_bulk_create.called)
+
+    def test_stored_course_grade_used_for_passing(self):
+        self.basic_setup()
+        self.submit_question_answer('p1', {'2_1': 'Correct'})
+        self.check_grade_percent(0.33)
+
+        with patch('courseware.grades._grade') as mock_grade:
+            self.assertTrue(is_course_passed(self.course, student=self.student_user, request=None))
+        self.assertFalse(mock_grade.called)
+
+    def test_grading_doesnt_assign_groups(self):
+        self.basic_setup()
+        self.course.user_partitions = [
+            UserPartition(0, 'first_partition', 'First Partition', [Group(0, 'alpha'), Group(1, 'beta')])
+        ]
+        self.update_course(self.course, self.student_user.id)
+        self.refresh_course()
+
+        self.submit_question_answer('p1', {'2_1': 'Correct'})
+        self.check_grade_percent(0.33)
+        self.assertFalse(UserCourseTag.objects.filter(user=self.student_user).exists())
+
+    def test_score_change_invalidates_stored_grades(self):
+        self.basic_setup()
+        self.submit_question_answer('p1', {'2_1': 'Correct'})
+        self.check_grade_percent(0.33)
+
+        self.submit_question_answer('p2', {'2_1': 'Correct'})
+        self.assertFalse(PersistentSubsectionGrade.objects.filter(user=self.student_user).exists())
+        self.assertIsNone(grades.get_persisted_course_grade(self.student_user, self.course))
+        self.check_grade_percent(0.67)
+
+
 @attr('shard_1')
 class ProblemWithUploadedFilesTest(TestSubmittingProblems):
     """Tests of problems with uploaded files."""
@@ -1022,6 +1101,62 @@ class TestAnswerDistributions(TestSubmittingProblems):
         empty_distribution = grades.answer_distributions(self.course.id)
         self.assertFalse(empty_distribution)  # should be empty
 
+    def test_shards(self):
+        # Counting shards separately and merging them gives the same result
+        # as counting everything at once.
+        self.submit_question_answer('p1', {'2_1': u'Correct'})
+        self.submit_question_answer('p2', {'2_1': u'Incorrect'})
+        self.submit_question_answer('p3', {'2_1': u'Correct'})
+
+        shards = grades.answer_distribution_shards(self.course.id, 2)
+        self.assertEqual(len(shards), 2)
+        problem_info = grades._problem_info_for_course(self.course.id)  # pylint: disable=protected-access
+        merged = grades.merge_answer_distributions(
+            grades._answer_counts_for_shard(self.course.id, problem_info, shard)  # pylint: disable=protected-access
+            for shard in shards
+        )
+        self.assertEqual(merged, grades.answer_distributions(self.course.id))
+        self.assertEqual(len(merged), 3)
+
+    @override_settings(ANSWER_DISTRIBUTION_SHARDS=3)
+    def test_shards_setting(self):
+        self.submit_question_answer('p1', {'2_1': u'Correct'})
+        self.submit_question_answer('p2', {'2_1': u'Incorrect'})
+        self.submit_question_answer('p3', {'2_1': u'Correct'})
+        expected = grades.answer_distributions(self.course.id, num_shards=1)
+
+        # The shards' threads can't see this test's uncommitted rows, so they're counted in this one, whose
+        # database connection has to stay open
+        with patch('courseware.grades.ThreadPool') as mock_pool, patch('courseware.grades.connections'):
+            mock_pool.return_value.map.side_effect = map
+            self.assertEqual(grades.answer_distributions(self.course.id), expected)
+        mock_pool.assert_called_once_with(3)
+
+    def test_extract_student_answers(self):
+        state = json.dumps({
+            'input_state': {'i4x-a-b-problem-c_2_1': {}},
+            'student_answers': {'i4x-a-b-problem-c_2_1': 'x "student_answers": {}'},
+            'attempts': 1,
+        })
+        self.assertEqual(
+            grades._extract_student_answers(state),  # pylint: disable=protected-access
+            {'i4x-a-b-problem-c_2_1': 'x "student_answers": {}'}
+        )
+        self.assertEqual(grades._extract_student_answers('{"attempts": 1}'), {})  # pylint: disable=protected-access
+        # Keys of nested objects aren't mistaken for the student answers
+        state = json.dumps({
+            'input_state': {'i4x-a-b-problem-c_2_1': {'student_answers': {'nested': 'x'}}},
+            'student_answers': {'i4x-a-b-problem-c_2_1': 'y'},
+        })
+        self.assertEqual(
+            grades._extract_student_answers(state),  # pylint: disable=protected-access
+            {'i4x-a-b-problem-c_2_1': 'y'}
+        )
+        state = json.dumps({'input_state': {'i4x-a-b-problem-c_2_1': {'student_answers': {'nested': 'x'}}}})
+        self.assertEqual(grades._extract_student_answers(state), {})  # pylint: disable=protected-access
+        with self.assertRaises(ValueError):
+            grades._extract_student_answers('invalid json!')  # pylint: disable=protected-access
+
     def test_broken_state(self):
         # Missing or broken state for a problem should be skipped without
         # causing the whole answer_distribution call to explode.
@@ -1256,3 +1391,28 @@ class TestConditionalContent(TestSubmittingProblems):
         homework_1_score = 1.0 / 2
         homework_2_score = 1.0 / 1
         self.check_grade_percent(round((homework_1_score + homework_2_score) / 2, 2))
+
+
+@attr('shard_1')
+@patch.dict(settings.FEATURES, {'ENABLE_PERSISTENT_GRADES': True})
+class TestConditionalContentWithPersistentGrades(TestConditionalContent):
+    """
+    Run the conditional content tests with subsection grades stored between gradings.
+    """
+    def possible_hw_scores(self):
+        """
+        Returns the possible points of each Problem Set.
+        """
+        return [s.possible for s in self.get_grade_summary()['totaled_scores']['Homework']]
+
+    def test_group_change_invalidates_stored_grades(self):
+        self.split_different_problems_setup(self.user_partition_group_0)
+        self.assertEqual(self.possible_hw_scores(), [2.0, 4.0])
+
+        # Moving the student to another group grades them on that group's problems
+        UserCourseTag.objects.filter(
+            user=self.student_user,
+            course_id=self.course.id,
+            key='xblock.partition_service.partition_{0}'.format(self.partition.id),  # pylint: disable=no-member
+        ).update(value=str(self.user_partition_group_1))
+        self.assertEqual(self.possible_hw_scores(), [2.0, 1.0])
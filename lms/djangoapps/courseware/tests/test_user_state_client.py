@@ -0,0 +1,80 @@
+"""
+Tests of the streaming iter_all_* methods of DjangoXBlockUserStateClient.
+"""
+import json
+
+from django.test import TestCase
+from nose.plugins.attrib import attr
+from xblock.fields import Scope
+
+from courseware.tests.factories import StudentModuleFactory, course_id, location
+from courseware.user_state_client import DjangoXBlockUserStateClient
+from student.tests.factories import UserFactory
+
+
+@attr('shard_1')
+class TestIterAll(TestCase):
+    """
+    Tests of iter_all_for_block and iter_all_for_course.
+    """
+    def setUp(self):
+        super(TestIterAll, self).setUp()
+        self.client = DjangoXBlockUserStateClient()
+        self.users = [UserFactory.create() for __ in range(3)]
+        self.block_key = location('problem1')
+        for index, user in enumerate(self.users):
+            StudentModuleFactory.create(
+                student=user,
+                course_id=course_id,
+                module_state_key=self.block_key,
+                state=json.dumps({'attempts': index}),
+            )
+        StudentModuleFactory.create(
+            student=self.users[0],
+            course_id=course_id,
+            module_type='video',
+            module_state_key=course_id.make_usage_key('video', 'video1'),
+            state=json.dumps({'position': 5}),
+        )
+        # Rows without state are skipped
+        StudentModuleFactory.create(
+            student=self.users[1],
+            course_id=course_id,
+            module_state_key=location('problem2'),
+            state=None,
+        )
+
+    def test_iter_all_for_block(self):
+        states = list(self.client.iter_all_for_block(self.block_key, batch_size=2))
+        self.assertItemsEqual(
+            [(state.username, state.state['attempts']) for state in states],
+            [(user.username, index) for index, user in enumerate(self.users)]
+        )
+        for state in states:
+            self.assertEqual(state.block_key, self.block_key)
+            self.assertEqual(state.scope, Scope.user_state)
+            self.assertIsNotNone(state.updated)
+
+    def test_iter_all_for_course(self):
+        states = list(self.client.iter_all_for_course(course_id, batch_size=1))
+        self.assertEqual(len(states), 4)
+        self.assertEqual(
+            set(state.block_key.block_type for state in states),
+            {'problem', 'video'}
+        )
+
+    def test_iter_all_for_course_by_type(self):
+        states = list(self.client.iter_all_for_course(course_id, block_type='video'))
+        self.assertEqual(len(states), 1)
+        self.assertEqual(states[0].state, {'position': 5})
+
+    def test_batches_are_queried_lazily(self):
+        states = self.client.iter_all_for_block(self.block_key, batch_size=1)
+        with self.assertNumQueries(1):
+            next(states)
+
+    def test_unsupported_scope(self):
+        with self.assertRaises(ValueError):
+            self.client.iter_all_for_block(self.block_key, scope=Scope.preferences)
+        with self.assertRaises(ValueError):
+            self.client.iter_all_for_course(course_id, scope=Scope.preferences)
@@ -4,6 +4,7 @@ data in a Django ORM model.
 """
 
 import itertools
+from functools import partial
 from operator import attrgetter
 
 try:
@@ -11,14 +12,16 @@ try:
 except ImportError:
     import json
 
+from django.conf import settings
 from django.contrib.auth.models import User
 from xblock.fields import Scope, ScopeBase
-from xblock_user_state.interface import XBlockUserStateClient
+from xblock_user_state.interface import XBlockUserState, XBlockUserStateClient
 from courseware.models import StudentModule, StudentModuleHistory
 from contracts import contract, new_contract
-from opaque_keys.edx.keys import UsageKey
+from opaque_keys.edx.keys import CourseKey, UsageKey
 
 new_contract('UsageKey', UsageKey)
+new_contract('CourseKey', CourseKey)
 
 
 class DjangoXBlockUserStateClient(XBlockUserStateClient):
@@ -44,6 +47,9 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         """
         pass
 
+    # The number of StudentModule rows fetched per query by the iter_all_* methods
+    DEFAULT_BATCH_SIZE = 1000
+
     def __init__(self, user=None):
         """
         Arguments:
@@ -344,22 +350,83 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
 
         return history_entries
 
+    @contract(block_key=UsageKey, scope=ScopeBase, batch_size="int,>0|None")
     def iter_all_for_block(self, block_key, scope=Scope.user_state, batch_size=None):
         """
         You get no ordering guarantees. Fetching will happen in batch_size
         increments. If you're using this method, you should be running in an
         async task.
+
+        Arguments:
+            block_key (UsageKey): The XBlock usage to load state for.
+            scope (Scope): The scope to load data from. Only Scope.user_state is supported.
+            batch_size (int): The number of rows to fetch per query. Defaults to DEFAULT_BATCH_SIZE.
+
+        Yields: an :class:`XBlockUserState` for every user that has state stored for
+            `block_key`. The state is only decoded when it is first accessed.
         """
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported")
-        raise NotImplementedError()
 
+        query = StudentModule.objects.filter(
+            course_id=block_key.course_key,
+            module_state_key=block_key,
+        )
+        return self._iter_student_modules(query, scope, batch_size)
+
+    @contract(course_key=CourseKey, block_type="basestring|None", scope=ScopeBase, batch_size="int,>0|None")
     def iter_all_for_course(self, course_key, block_type=None, scope=Scope.user_state, batch_size=None):
         """
         You get no ordering guarantees. Fetching will happen in batch_size
         increments. If you're using this method, you should be running in an
         async task.
+
+        Arguments:
+            course_key (CourseKey): The course to load state for.
+            block_type (str): If given, only load state for blocks of this type.
+            scope (Scope): The scope to load data from. Only Scope.user_state is supported.
+            batch_size (int): The number of rows to fetch per query. Defaults to DEFAULT_BATCH_SIZE.
+
+        Yields: an :class:`XBlockUserState` for every user and block in the course that
+            has state stored. The state is only decoded when it is first accessed.
         """
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported")
-        raise NotImplementedError()
+
+        query = StudentModule.objects.filter(course_id=course_key)
+        if block_type is not None:
+            query = query.filter(module_type=block_type)
+        return self._iter_student_modules(query, scope, batch_size)
+
+    def _iter_student_modules(self, query, scope, batch_size=None):
+        """
+        Yield an :class:`XBlockUserState` for every row of the StudentModule `query`
+        that has state stored.
+
+        Rows are fetched `batch_size` at a time, paging through the table by id
+        (rather than by offset, which gets slower the further into the table a page
+        is), from the read replica if there is one. Only one batch of rows is held
+        in memory at a time.
+        """
+        batch_size = batch_size or self.DEFAULT_BATCH_SIZE
+        if "read_replica" in settings.DATABASES:
+            query = query.using("read_replica")
+        query = query.order_by('id').values_list(
+            'id', 'student__username', 'course_id', 'module_state_key', 'state', 'modified'
+        )
+
+        last_id = 0
+        while True:
+            rows = list(query.filter(id__gt=last_id)[:batch_size])
+            if not rows:
+                return
+
+            for _id, username, course_id, module_state_key, state, modified in rows:
+                if state is None or state == '{}':
+                    continue
+
+                course_key = CourseKey.from_string(unicode(course_id))
+                usage_key = UsageKey.from_string(unicode(module_state_key)).map_into_course(course_key)
+                yield XBlockUserState(username, usage_key, partial(json.loads, state), modified, scope)
+
+            last_id = rows[-1][0]
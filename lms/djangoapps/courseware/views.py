@@ -1320,7 +1320,7 @@ def is_course_passed(course, grade_summary=None, student=None, request=None):
     success_cutoff = min(nonzero_cutoffs) if nonzero_cutoffs else None
 
     if grade_summary is None:
-        grade_summary = grades.grade(student, request, course)
+        grade_summary = grades.get_persisted_course_grade(student, course) or grades.grade(student, request, course)
 
     return success_cutoff and grade_summary['percent'] >= success_cutoff
 
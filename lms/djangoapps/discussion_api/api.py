@@ -2,6 +2,7 @@
 Discussion API internal interface
 """
 from collections import defaultdict
+from functools import partial
 from urllib import urlencode
 from urlparse import urlunparse
 
@@ -29,7 +30,8 @@ from django_comment_client.base.views import (
 from django_comment_client.utils import get_accessible_discussion_modules
 from lms.lib.comment_client.comment import Comment
 from lms.lib.comment_client.thread import Thread
-from lms.lib.comment_client.utils import CommentClientRequestError
+from lms.lib.comment_client.user import User as CommentClientUser
+from lms.lib.comment_client.utils import CommentClientRequestError, perform_concurrently
 from openedx.core.djangoapps.course_groups.cohorts import get_cohort_id, is_commentable_cohorted
 
 
@@ -57,10 +59,13 @@ def _get_thread_and_context(request, thread_id, retrieve_kwargs=None):
     try:
         if "mark_as_read" not in retrieve_kwargs:
             retrieve_kwargs["mark_as_read"] = False
-        cc_thread = Thread(id=thread_id).retrieve(**retrieve_kwargs)
+        cc_thread, cc_requester = perform_concurrently(
+            partial(Thread(id=thread_id).retrieve, **retrieve_kwargs),
+            CommentClientUser.from_django_user(request.user).retrieve
+        )
         course_key = CourseKey.from_string(cc_thread["course_id"])
         course = _get_course_or_404(course_key, request.user)
-        context = get_context(course, request, cc_thread)
+        context = get_context(course, request, cc_thread, cc_requester)
         if (
                 not context["is_requester_privileged"] and
                 cc_thread["group_id"] and
@@ -27,10 +27,11 @@ from openedx.core.djangoapps.course_groups.cohorts import get_cohort_names
 from openedx.core.lib.api.fields import NonEmptyCharField
 
 
-def get_context(course, request, thread=None):
+def get_context(course, request, thread=None, cc_requester=None):
     """
     Returns a context appropriate for use with ThreadSerializer or
-    (if thread is provided) CommentSerializer.
+    (if thread is provided) CommentSerializer. The requester is retrieved
+    from the comments service unless cc_requester is provided.
     """
     # TODO: cache staff_user_ids and ta_user_ids if we need to improve perf
     staff_user_ids = {
@@ -47,7 +48,8 @@ def get_context(course, request, thread=None):
         for user in role.users.all()
     }
     requester = request.user
-    cc_requester = CommentClientUser.from_django_user(requester).retrieve()
+    if cc_requester is None:
+        cc_requester = CommentClientUser.from_django_user(requester).retrieve()
     cc_requester["course_id"] = course.id
     return {
         "course": course,
@@ -934,7 +934,7 @@ class GetCommentListTest(CommentsServiceMockMixin, ModuleStoreTestCase):
             page_size=14
         )
         self.assert_query_params_equal(
-            httpretty.httpretty.latest_requests[-2],
+            self.get_last_request_to("/api/v1/threads/dummy"),
             {
                 "recursive": ["True"],
                 "user_id": [str(self.user.id)],
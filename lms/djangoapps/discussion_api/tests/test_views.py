@@ -533,6 +533,7 @@ class CommentViewSetListTest(DiscussionAPIViewTestMixin, ModuleStoreTestCase):
         )
 
     def test_404(self):
+        self.register_get_user_response(self.user)
         self.register_get_thread_error_response(self.thread_id, 404)
         response = self.client.get(self.url, {"thread_id": self.thread_id})
         self.assert_response_correct(
@@ -600,7 +601,7 @@ class CommentViewSetListTest(DiscussionAPIViewTestMixin, ModuleStoreTestCase):
             }
         )
         self.assert_query_params_equal(
-            httpretty.httpretty.latest_requests[-2],
+            self.get_last_request_to("/api/v1/threads/{}".format(self.thread_id)),
             {
                 "recursive": ["True"],
                 "resp_skip": ["0"],
@@ -634,7 +635,7 @@ class CommentViewSetListTest(DiscussionAPIViewTestMixin, ModuleStoreTestCase):
             {"developer_message": "Not found."}
         )
         self.assert_query_params_equal(
-            httpretty.httpretty.latest_requests[-2],
+            self.get_last_request_to("/api/v1/threads/{}".format(self.thread_id)),
             {
                 "recursive": ["True"],
                 "resp_skip": ["68"],
@@ -3,6 +3,7 @@ Discussion API test utilities
 """
 import json
 import re
+from urlparse import urlparse
 
 import httpretty
 
@@ -301,6 +302,16 @@ class CommentsServiceMockMixin(object):
         """
         self.assert_query_params_equal(httpretty.last_request(), expected_params)
 
+    def get_last_request_to(self, path):
+        """
+        Returns the last mock request to the given path, as requests made at
+        the same time may have been received in any order
+        """
+        return [
+            request for request in httpretty.httpretty.latest_requests
+            if urlparse(request.path).path == path
+        ][-1]
+
 
 def make_minimal_cs_thread(overrides=None):
     """
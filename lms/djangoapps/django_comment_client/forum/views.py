@@ -2,7 +2,7 @@
 Views handling read (GET) requests for the Discussion tab and inline discussions.
 """
 
-from functools import wraps
+from functools import partial, wraps
 import json
 import logging
 import xml.sax.saxutils as saxutils
@@ -307,7 +307,6 @@ def single_thread(request, course_key, discussion_id, thread_id):
     course = get_course_with_access(request.user, 'load', course_key, check_if_enrolled=True)
     course_settings = make_course_settings(course, request.user)
     cc_user = cc.User.from_django_user(request.user)
-    user_info = cc_user.to_dict()
     is_moderator = has_permission(request.user, "see_all_cohorts", course_key)
 
     # Verify that the student has access to this thread if belongs to a discussion module
@@ -318,11 +317,15 @@ def single_thread(request, course_key, discussion_id, thread_id):
     # page; it would be a nice optimization to avoid that extra round trip to
     # the comments service.
     try:
-        thread = cc.Thread.find(thread_id).retrieve(
-            recursive=request.is_ajax(),
-            user_id=request.user.id,
-            response_skip=request.GET.get("resp_skip"),
-            response_limit=request.GET.get("resp_limit")
+        thread, user_info = cc.utils.perform_concurrently(
+            partial(
+                cc.Thread.find(thread_id).retrieve,
+                recursive=request.is_ajax(),
+                user_id=request.user.id,
+                response_skip=request.GET.get("resp_skip"),
+                response_limit=request.GET.get("resp_limit")
+            ),
+            cc_user.to_dict
         )
     except cc.utils.CommentClientRequestError as e:
         if e.status_code == 404:
@@ -427,10 +430,19 @@ def user_profile(request, course_key, user_id):
         else:
             profiled_user = cc.User(id=user_id, course_id=course_key)
 
-        threads, page, num_pages = profiled_user.active_threads(query_params)
+        calls = [
+            partial(profiled_user.active_threads, query_params),
+            cc.User.from_django_user(request.user).to_dict,
+        ]
+        if request.is_ajax():
+            (threads, page, num_pages), user_info = cc.utils.perform_concurrently(*calls)
+        else:
+            # Retrieve the profiled user for the page at the same time
+            (threads, page, num_pages), user_info, profiled_user_info = cc.utils.perform_concurrently(
+                *(calls + [profiled_user.to_dict])
+            )
         query_params['page'] = page
         query_params['num_pages'] = num_pages
-        user_info = cc.User.from_django_user(request.user).to_dict()
 
         with newrelic.agent.FunctionTrace(nr_transaction, "get_metadata_for_threads"):
             annotated_content_info = utils.get_metadata_for_threads(course_key, threads, request.user, user_info)
@@ -450,7 +462,7 @@ def user_profile(request, course_key, user_id):
                 'course': course,
                 'user': request.user,
                 'django_user': django_user,
-                'profiled_user': profiled_user.to_dict(),
+                'profiled_user': profiled_user_info,
                 'threads': _attr_safe_json(threads),
                 'user_info': _attr_safe_json(user_info),
                 'annotated_content_info': _attr_safe_json(annotated_content_info),
@@ -508,10 +520,12 @@ def followed_threads(request, course_key, user_id):
         if group_id is not None:
             query_params['group_id'] = group_id
 
-        threads, page, num_pages = profiled_user.subscribed_threads(query_params)
+        (threads, page, num_pages), user_info = cc.utils.perform_concurrently(
+            partial(profiled_user.subscribed_threads, query_params),
+            cc.User.from_django_user(request.user).to_dict
+        )
         query_params['page'] = page
         query_params['num_pages'] = num_pages
-        user_info = cc.User.from_django_user(request.user).to_dict()
 
         with newrelic.agent.FunctionTrace(nr_transaction, "get_metadata_for_threads"):
             annotated_content_info = utils.get_metadata_for_threads(course_key, threads, request.user, user_info)
@@ -14,6 +14,7 @@ from django.contrib.auth.models import User
 from django.core.urlresolvers import reverse
 import xmodule.graders as xmgraders
 from django.core.exceptions import ObjectDoesNotExist
+from instructor_analytics.learner_attributes import LearnerAttributes
 from microsite_configuration import microsite
 from student.models import CourseEnrollmentAllowed
 
@@ -176,7 +177,8 @@ def enrolled_students_features(course_key, features):
     ).order_by('username').select_related('profile')
 
     if include_cohort_column:
-        students = students.prefetch_related('course_groups')
+        # The cohorts of every student in the course, loaded in a single query.
+        learner_attributes = LearnerAttributes(course_key)
 
     def extract_student(student, features):
         """ convert student to dictionary """
@@ -206,13 +208,7 @@ def enrolled_students_features(course_key, features):
                 student_dict[meta_feature] = meta_dict.get(meta_key)
 
         if include_cohort_column:
-            # Note that we use student.course_groups.all() here instead of
-            # student.course_groups.filter(). The latter creates a fresh query,
-            # therefore negating the performance gain from prefetch_related().
-            student_dict['cohort'] = next(
-                (cohort.name for cohort in student.course_groups.all() if cohort.course_id == course_key),
-                "[unassigned]"
-            )
+            student_dict['cohort'] = learner_attributes.cohort_name(student.id, default="[unassigned]")
         return student_dict
 
     return [extract_student(student, features) for student in students]
@@ -0,0 +1,170 @@
+"""
+Bulk loading of the per-learner columns of instructor reports.
+
+The grade and profile reports describe each learner by their cohort,
+experiment groups, enrollment track, verification status and certificate
+status.  Looking those up one learner at a time costs several queries per row,
+so `LearnerAttributes` loads each of them for a whole batch of learners with a
+single query, the first time it is needed.
+"""
+from lazy import lazy
+
+from certificates.models import CertificateStatuses, CertificateWhitelist, GeneratedCertificate
+from course_modes.models import CourseMode
+from openedx.core.djangoapps.course_groups.models import CourseUserGroup
+from openedx.core.djangoapps.user_api.models import UserCourseTag
+from openedx.core.djangoapps.user_api.partition_schemes import RandomUserPartitionScheme
+from student.models import CourseEnrollment, UserProfile
+from verify_student.models import SoftwareSecurePhotoVerification
+from xmodule.partitions.partitions import NoSuchUserPartitionGroupError
+
+
+class LearnerAttributes(object):
+    """
+    The report columns describing a batch of learners in a course.
+
+    Each kind of column is loaded for the whole batch with one query when it is
+    first asked for, so a report built from batches makes a constant number of
+    queries per batch rather than per learner.
+    """
+    def __init__(self, course_key, user_ids=None, experiment_partitions=()):
+        """
+        Arguments:
+            course_key (CourseKey): the course the learners are enrolled in
+            user_ids (iterable): ids of the learners in the batch, or None for
+                every learner in the course
+            experiment_partitions (list): the course's split test user
+                partitions, as returned by `get_split_user_partitions`
+        """
+        self.course_key = course_key
+        self.user_ids = list(user_ids) if user_ids is not None else None
+        self.experiment_partitions = experiment_partitions
+
+    def _for_batch(self, queryset, user_field='user'):
+        """
+        Restricts `queryset` to the learners in the batch, given the name of
+        its field referring to the learner.
+        """
+        if self.user_ids is None:
+            return queryset.filter(**{user_field + '__courseenrollment__course_id': self.course_key})
+        return queryset.filter(**{user_field + '__in': self.user_ids})
+
+    @lazy
+    def _cohort_names(self):
+        """Maps user ids to the names of their cohorts in the course."""
+        memberships = CourseUserGroup.users.through.objects.filter(
+            courseusergroup__course_id=self.course_key,
+            courseusergroup__group_type=CourseUserGroup.COHORT,
+        )
+        if self.user_ids is not None:
+            memberships = memberships.filter(user__in=self.user_ids)
+        return dict(memberships.values_list('user', 'courseusergroup__name'))
+
+    @lazy
+    def _course_tags(self):
+        """Maps (user id, tag key) to the learners' course tags for the experiment partitions."""
+        if not self.experiment_partitions:
+            return {}
+        tags = UserCourseTag.objects.filter(
+            course_id=self.course_key,
+            key__in=[RandomUserPartitionScheme.key_for_partition(partition) for partition in self.experiment_partitions],
+        )
+        if self.user_ids is not None:
+            tags = tags.filter(user__in=self.user_ids)
+        return {(user_id, key): value for user_id, key, value in tags.values_list('user', 'key', 'value')}
+
+    @lazy
+    def _enrollment_modes(self):
+        """Maps user ids to their enrollment modes in the course."""
+        enrollments = CourseEnrollment.objects.filter(course_id=self.course_key)
+        if self.user_ids is not None:
+            enrollments = enrollments.filter(user__in=self.user_ids)
+        return dict(enrollments.values_list('user', 'mode'))
+
+    @lazy
+    def _verified_user_ids(self):
+        """The ids of the learners whose identity verification is approved and current."""
+        verifications = self._for_batch(
+            SoftwareSecurePhotoVerification.objects.filter(
+                status='approved',
+                # pylint: disable=protected-access
+                created_at__gte=SoftwareSecurePhotoVerification._earliest_allowed_date(),
+            )
+        )
+        return set(verifications.values_list('user', flat=True))
+
+    @lazy
+    def _whitelisted_user_ids(self):
+        """The ids of the learners on the course's certificate whitelist."""
+        whitelist = CertificateWhitelist.objects.filter(course_id=self.course_key, whitelist=True)
+        if self.user_ids is not None:
+            whitelist = whitelist.filter(user__in=self.user_ids)
+        return set(whitelist.values_list('user', flat=True))
+
+    @lazy
+    def _certificate_allowed_user_ids(self):
+        """The ids of the learners whose profiles allow them to be issued certificates."""
+        profiles = self._for_batch(UserProfile.objects.filter(allow_certificate=True))
+        return set(profiles.values_list('user', flat=True))
+
+    @lazy
+    def _certificates(self):
+        """Maps user ids to the (status, mode) of their generated certificates for the course."""
+        certificates = GeneratedCertificate.objects.filter(course_id=self.course_key)
+        if self.user_ids is not None:
+            certificates = certificates.filter(user__in=self.user_ids)
+        return {user_id: (status, mode) for user_id, status, mode in certificates.values_list('user', 'status', 'mode')}
+
+    def cohort_name(self, user_id, default=''):
+        """
+        Returns the name of the learner's cohort, or `default` if they are not in one.
+        """
+        return self._cohort_names.get(user_id, default)
+
+    def group_names(self, user_id):
+        """
+        Returns the names of the learner's groups in each of the experiment
+        partitions, with '' for partitions they have not been assigned to.
+        Like `LmsPartitionService.get_group(partition, assign=False)`, this
+        never assigns a group.
+        """
+        names = []
+        for partition in self.experiment_partitions:
+            group_id = self._course_tags.get((user_id, RandomUserPartitionScheme.key_for_partition(partition)))
+            try:
+                group = partition.get_group(int(group_id)) if group_id is not None else None
+            except (NoSuchUserPartitionGroupError, ValueError):
+                group = None
+            names.append(group.name if group else '')
+        return names
+
+    def enrollment_mode(self, user_id):
+        """
+        Returns the learner's enrollment mode, as `CourseEnrollment.enrollment_mode_for_user` does.
+        """
+        return self._enrollment_modes.get(user_id)
+
+    def verification_status(self, user_id):
+        """
+        Returns the learner's verification status, as
+        `SoftwareSecurePhotoVerification.verification_status_for_user` does.
+        """
+        if self.enrollment_mode(user_id) not in CourseMode.VERIFIED_MODES:
+            return 'N/A'
+        return 'ID Verified' if user_id in self._verified_user_ids else 'Not ID Verified'
+
+    def certificate_info(self, user_id, grade):
+        """
+        Returns the learner's [eligible, delivered, type] certificate columns
+        for a learner with the given letter `grade`, as `certificate_info_for_user` does.
+        """
+        is_whitelisted = user_id in self._whitelisted_user_ids
+        if not ((is_whitelisted or grade is not None) and user_id in self._certificate_allowed_user_ids):
+            return ['N', 'N', 'N/A']
+
+        status, mode = self._certificates.get(
+            user_id, (CertificateStatuses.unavailable, GeneratedCertificate.MODES.honor)
+        )
+        if status == CertificateStatuses.downloadable:
+            return ['Y', 'Y', mode]
+        return ['Y', 'N', 'N/A']
@@ -0,0 +1,95 @@
+"""
+Tests for instructor_analytics.learner_attributes
+"""
+from django.test import TestCase
+from opaque_keys.edx.locator import CourseLocator
+
+from certificates.models import CertificateStatuses
+from certificates.tests.factories import GeneratedCertificateFactory, CertificateWhitelistFactory
+from instructor_analytics.learner_attributes import LearnerAttributes
+from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory
+import openedx.core.djangoapps.user_api.course_tag.api as course_tag_api
+from openedx.core.djangoapps.user_api.partition_schemes import RandomUserPartitionScheme
+from student.models import CourseEnrollment
+from student.tests.factories import UserFactory
+from verify_student.tests.factories import SoftwareSecurePhotoVerificationFactory
+from xmodule.partitions.partitions import Group, UserPartition
+
+
+class TestLearnerAttributes(TestCase):
+    """ Test bulk loading of learners' report columns. """
+
+    def setUp(self):
+        super(TestLearnerAttributes, self).setUp()
+        self.course_key = CourseLocator(org='robot', course='course', run='id')
+        self.partition = UserPartition(
+            0, 'Experiment', 'An experiment', [Group(0, 'Group A'), Group(1, 'Group B')], scheme_id='random'
+        )
+        self.users = [UserFactory.create() for __ in range(3)]
+        for user, mode in zip(self.users, ['honor', 'verified', 'verified']):
+            CourseEnrollment.enroll(user, self.course_key, mode=mode)
+        self.user_ids = [user.id for user in self.users]
+
+    def learner_attributes(self, user_ids=None):
+        """ Return a LearnerAttributes for the given users of the test course. """
+        return LearnerAttributes(self.course_key, user_ids, [self.partition])
+
+    def test_cohort_name(self):
+        cohort = CohortFactory.create(name='cohort', course_id=self.course_key)
+        cohort.users.add(self.users[0])
+        for learner_attributes in (self.learner_attributes(self.user_ids), self.learner_attributes()):
+            self.assertEqual(learner_attributes.cohort_name(self.users[0].id), 'cohort')
+            self.assertEqual(learner_attributes.cohort_name(self.users[1].id), '')
+            self.assertEqual(learner_attributes.cohort_name(self.users[1].id, default='[unassigned]'), '[unassigned]')
+
+    def test_group_names(self):
+        partition_key = RandomUserPartitionScheme.key_for_partition(self.partition)
+        course_tag_api.set_course_tag(self.users[0], self.course_key, partition_key, 1)
+        # A group which no longer exists in the partition
+        course_tag_api.set_course_tag(self.users[1], self.course_key, partition_key, 7)
+
+        learner_attributes = self.learner_attributes(self.user_ids)
+        self.assertEqual(learner_attributes.group_names(self.users[0].id), ['Group B'])
+        self.assertEqual(learner_attributes.group_names(self.users[1].id), [''])
+        self.assertEqual(learner_attributes.group_names(self.users[2].id), [''])
+
+    def test_enrollment_and_verification(self):
+        SoftwareSecurePhotoVerificationFactory.create(user=self.users[0], status='approved')
+        SoftwareSecurePhotoVerificationFactory.create(user=self.users[1], status='approved')
+        SoftwareSecurePhotoVerificationFactory.create(user=self.users[2], status='denied')
+
+        learner_attributes = self.learner_attributes(self.user_ids)
+        self.assertEqual(learner_attributes.enrollment_mode(self.users[0].id), 'honor')
+        self.assertEqual(learner_attributes.enrollment_mode(self.users[1].id), 'verified')
+        self.assertEqual(learner_attributes.verification_status(self.users[0].id), 'N/A')
+        self.assertEqual(learner_attributes.verification_status(self.users[1].id), 'ID Verified')
+        self.assertEqual(learner_attributes.verification_status(self.users[2].id), 'Not ID Verified')
+
+    def test_certificate_info(self):
+        GeneratedCertificateFactory.create(
+            user=self.users[0], course_id=self.course_key, status=CertificateStatuses.downloadable, mode='verified'
+        )
+        CertificateWhitelistFactory.create(user=self.users[1], course_id=self.course_key, whitelist=True)
+        profile = self.users[2].profile
+        profile.allow_certificate = False
+        profile.save()
+
+        learner_attributes = self.learner_attributes(self.user_ids)
+        self.assertEqual(learner_attributes.certificate_info(self.users[0].id, 'Pass'), ['Y', 'Y', 'verified'])
+        self.assertEqual(learner_attributes.certificate_info(self.users[0].id, None), ['N', 'N', 'N/A'])
+        self.assertEqual(learner_attributes.certificate_info(self.users[1].id, None), ['Y', 'N', 'N/A'])
+        self.assertEqual(learner_attributes.certificate_info(self.users[2].id, 'Pass'), ['N', 'N', 'N/A'])
+
+    def test_constant_queries(self):
+        users = self.users + [UserFactory.create() for __ in range(10)]
+        for user in users[3:]:
+            CourseEnrollment.enroll(user, self.course_key, mode='verified')
+        learner_attributes = self.learner_attributes([user.id for user in users])
+
+        # One query for each kind of column, however many learners there are
+        with self.assertNumQueries(7):
+            for user in users:
+                learner_attributes.cohort_name(user.id)
+                learner_attributes.group_names(user.id)
+                learner_attributes.verification_status(user.id)
+                learner_attributes.certificate_info(user.id, 'Pass')
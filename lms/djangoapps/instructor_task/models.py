@@ -19,6 +19,7 @@ import csv
 import json
 import hashlib
 import os.path
+import shutil
 import urllib
 
 from boto.s3.connection import S3Connection
@@ -35,6 +36,9 @@ from xmodule_django.models import CourseKeyField
 QUEUING = 'QUEUING'
 PROGRESS = 'PROGRESS'
 
+# S3 rejects multipart uploads with a part, other than the last, smaller than this.
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+
 
 class InstructorTask(models.Model):
     """
@@ -218,6 +222,28 @@ class ReportStore(object):
         for row in rows:
             yield [unicode(item).encode('utf-8') for item in row]
 
+    def store_rows_part(self, course_id, filename, part_name, rows):
+        """
+        Store `rows` as the part `part_name` of the CSV file `filename`. Parts
+        are not listed by `links_for`; `concatenate_parts` joins them into
+        `filename` in the order of their names.
+        """
+        raise NotImplementedError
+
+    def concatenate_parts(self, course_id, filename):
+        """
+        Join the stored parts of `filename`, in the order of their names, into
+        `filename` and delete the parts. Returns False, without creating the
+        file, if there are no parts.
+        """
+        raise NotImplementedError
+
+    def delete_parts(self, course_id, filename):
+        """
+        Delete the stored parts of `filename` without joining them.
+        """
+        raise NotImplementedError
+
 
 class S3ReportStore(ReportStore):
     """
@@ -275,6 +301,13 @@ class S3ReportStore(ReportStore):
 
         return key
 
+    def part_prefix_for(self, course_id, filename):
+        """Return the S3 key prefix under which the parts of the given filename
+        are stored. It is outside of the course's directory, so that parts are
+        never listed as reports."""
+        hashed_course_id = hashlib.sha1(course_id.to_deprecated_string())
+        return "{}/parts/{}/{}/".format(self.root_path, hashed_course_id.hexdigest(), filename)
+
     def store(self, course_id, filename, buff, config=None):
         """
         Store the contents of `buff` in a directory determined by hashing
@@ -327,6 +360,65 @@ class S3ReportStore(ReportStore):
 
         self.store(course_id, filename, output_buffer)
 
+    def store_rows_part(self, course_id, filename, part_name, rows):
+        """
+        Store `rows` as a gzip'd csv part of `filename`. Since a concatenation
+        of gzip files is itself a valid gzip file, the parts can be joined
+        without recompressing them.
+        """
+        output_buffer = StringIO()
+        gzip_file = GzipFile(fileobj=output_buffer, mode="wb")
+        csvwriter = csv.writer(gzip_file)
+        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
+        gzip_file.close()
+
+        key = Key(self.bucket)
+        key.key = self.part_prefix_for(course_id, filename) + part_name
+        key.set_contents_from_string(output_buffer.getvalue())
+
+    def concatenate_parts(self, course_id, filename):
+        """
+        Join the parts of `filename` with a multipart upload. S3 requires every
+        part of a multipart upload but the last to be at least
+        `S3_MIN_PART_SIZE`, so small report parts are buffered together into
+        upload parts of at least that size.
+        """
+        part_keys = sorted(self.bucket.list(prefix=self.part_prefix_for(course_id, filename)), key=lambda k: k.key)
+        if not part_keys:
+            return False
+
+        upload = self.bucket.initiate_multipart_upload(
+            self.key_for(course_id, filename).key,
+            headers={
+                "Content-Encoding": "gzip",
+                "Content-Type": "text/csv",
+            }
+        )
+        try:
+            upload_buffer = StringIO()
+            upload_part_number = 0
+            for index, part_key in enumerate(part_keys):
+                upload_buffer.write(part_key.get_contents_as_string())
+                if upload_buffer.tell() >= S3_MIN_PART_SIZE or index == len(part_keys) - 1:
+                    upload_part_number += 1
+                    upload_buffer.seek(0)
+                    upload.upload_part_from_file(upload_buffer, upload_part_number)
+                    upload_buffer = StringIO()
+            upload.complete_upload()
+        except Exception:
+            upload.cancel_upload()
+            raise
+
+        self.bucket.delete_keys([part_key.key for part_key in part_keys])
+        return True
+
+    def delete_parts(self, course_id, filename):
+        """
+        Delete the parts of `filename`.
+        """
+        part_keys = self.bucket.list(prefix=self.part_prefix_for(course_id, filename))
+        self.bucket.delete_keys([part_key.key for part_key in part_keys])
+
     def links_for(self, course_id):
         """
         For a given `course_id`, return a list of `(filename, url)` tuples. `url`
@@ -376,6 +468,14 @@ class LocalFSReportStore(ReportStore):
         """Return the full path to a given file for a given course."""
         return os.path.join(self.root_path, urllib.quote(course_id.to_deprecated_string(), safe=''), filename)
 
+    def parts_path_to(self, course_id, filename):
+        """Return the directory holding the parts of a given file for a given
+        course. It is outside of the course's directory, so that parts are
+        never listed as reports."""
+        return os.path.join(
+            self.root_path, '_parts', urllib.quote(course_id.to_deprecated_string(), safe=''), filename
+        )
+
     def store(self, course_id, filename, buff, config=None):  # pylint: disable=unused-argument
         """
         Given the `course_id` and `filename`, store the contents of `buff` in
@@ -402,6 +502,49 @@ class LocalFSReportStore(ReportStore):
 
         self.store(course_id, filename, output_buffer)
 
+    def store_rows_part(self, course_id, filename, part_name, rows):
+        """
+        Write `rows` out as a csv part of `filename`.
+        """
+        directory = self.parts_path_to(course_id, filename)
+        if not os.path.exists(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                # Another subtask created it first
+                if not os.path.isdir(directory):
+                    raise
+
+        with open(os.path.join(directory, part_name), "wb") as f:
+            csv.writer(f).writerows(self._get_utf8_encoded_rows(rows))
+
+    def concatenate_parts(self, course_id, filename):
+        """
+        Join the parts of `filename` by appending each of them to the file.
+        """
+        directory = self.parts_path_to(course_id, filename)
+        part_names = sorted(os.listdir(directory)) if os.path.exists(directory) else []
+        if not part_names:
+            return False
+
+        full_path = self.path_to(course_id, filename)
+        if not os.path.exists(os.path.dirname(full_path)):
+            os.makedirs(os.path.dirname(full_path))
+
+        with open(full_path, "wb") as report_file:
+            for part_name in part_names:
+                with open(os.path.join(directory, part_name), "rb") as part_file:
+                    shutil.copyfileobj(part_file, report_file)
+
+        shutil.rmtree(directory)
+        return True
+
+    def delete_parts(self, course_id, filename):
+        """
+        Delete the parts of `filename`.
+        """
+        shutil.rmtree(self.parts_path_to(course_id, filename), ignore_errors=True)
+
     def links_for(self, course_id):
         """
         For a given `course_id`, return a list of `(filename, url)` tuples. `url`
@@ -31,10 +31,12 @@ from instructor_task.tasks_helper import (
     run_main_task,
     BaseInstructorTask,
     perform_module_state_update,
+    perform_module_state_update_subtask,
     rescore_problem_module_state,
     reset_attempts_module_state,
     delete_problem_module_state,
     upload_grades_csv,
+    upload_grades_csv_part,
     upload_problem_grade_report,
     upload_students_csv,
     cohort_students_and_upload,
@@ -70,14 +72,39 @@ def rescore_problem(entry_id, xmodule_instance_args):
     action_name = ugettext_noop('rescored')
     update_fcn = partial(rescore_problem_module_state, xmodule_instance_args)
 
-    def filter_fcn(modules_to_update):
-        """Filter that matches problems which are marked as being done"""
-        return modules_to_update.filter(state__contains='"done": true')
+    def create_subtask_fcn(modules, subtask_status):
+        """Creates a subtask rescoring the StudentModules with ids in the range of `modules`."""
+        return rescore_problem_subtask.subtask(
+            (entry_id, xmodule_instance_args, modules[0]['pk'], modules[-1]['pk'], subtask_status.to_dict()),
+            task_id=subtask_status.task_id,
+        )
 
-    visit_fcn = partial(perform_module_state_update, update_fcn, filter_fcn)
+    visit_fcn = partial(
+        perform_module_state_update, update_fcn, _filter_done_problems, create_subtask_fcn=create_subtask_fcn
+    )
     return run_main_task(entry_id, visit_fcn, action_name)
 
 
+@task  # pylint: disable=not-callable
+def rescore_problem_subtask(entry_id, xmodule_instance_args, first_module_id, last_module_id, subtask_status_dict):
+    """
+    Rescores the problem submissions in the StudentModules with ids from `first_module_id`
+    to `last_module_id`, as a subtask of the `rescore_problem` task `entry_id`.
+
+    Queued by `rescore_problem` when there are more than `settings.RESCORE_STUDENT_MODULES_PER_TASK`
+    submissions to rescore.  `subtask_status_dict` is the dict form of the subtask's `SubtaskStatus`.
+    """
+    update_fcn = partial(rescore_problem_module_state, xmodule_instance_args)
+    return perform_module_state_update_subtask(
+        update_fcn, _filter_done_problems, entry_id, first_module_id, last_module_id, subtask_status_dict
+    )
+
+
+def _filter_done_problems(modules_to_update):
+    """Filter that matches problems which are marked as being done"""
+    return modules_to_update.filter(state__contains='"done": true')
+
+
 @task(base=BaseInstructorTask)  # pylint: disable=not-callable
 def reset_problem_attempts(entry_id, xmodule_instance_args):
     """Resets problem attempts to zero for a particular problem for all students in a course.
@@ -159,6 +186,17 @@ def calculate_grades_csv(entry_id, xmodule_instance_args):
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@task(routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
+def calculate_grades_csv_part(entry_id, course_id, report_filenames, part_number, user_ids, subtask_status_dict):
+    """
+    Grade a range of a course's students and store their rows as a part of the course's grade report.
+
+    Queued by `calculate_grades_csv` for courses with many students.  `subtask_status_dict`
+    is the dict form of the subtask's `SubtaskStatus`.
+    """
+    return upload_grades_csv_part(entry_id, course_id, report_filenames, part_number, user_ids, subtask_status_dict)
+
+
 @task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
 def calculate_problem_grade_report(entry_id, xmodule_instance_args):
     """
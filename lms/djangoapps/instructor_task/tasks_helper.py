@@ -8,11 +8,12 @@ from collections import OrderedDict
 from datetime import datetime
 from django.conf import settings
 from eventtracking import tracker
-from itertools import chain
+from itertools import chain, count, islice
 from time import time
 import unicodecsv
 import logging
 
+from capa.capa_problem import problem_templates
 from celery import Task, current_task
 from celery.states import SUCCESS, FAILURE
 from django.contrib.auth.models import User
@@ -32,24 +33,27 @@ from track.views import task_track
 from util.file import course_filename_prefix_generator, UniversalNewlineIterator
 from xmodule.modulestore.django import modulestore
 from xmodule.split_test_module import get_split_user_partitions
-from django.utils.translation import ugettext as _
-from certificates.models import CertificateWhitelist, certificate_info_for_user
+from django.utils.translation import ugettext as _, ugettext_noop
 from courseware.courses import get_course_by_id, get_problems_in_section
-from courseware.grades import iterate_grades_for
+from courseware.grades import GRADING_BATCH_SIZE, iterate_grades_for
 from courseware.models import StudentModule
 from courseware.model_data import FieldDataCache
 from courseware.module_render import get_module_for_descriptor_internal
 from instructor_analytics.basic import enrolled_students_features, list_may_enroll
+from instructor_analytics.learner_attributes import LearnerAttributes
 from instructor_analytics.csvs import format_dictlist
 from instructor_task.models import ReportStore, InstructorTask, PROGRESS
-from lms.djangoapps.lms_xblock.runtime import LmsPartitionService
-from openedx.core.djangoapps.course_groups.cohorts import get_cohort
+from instructor_task.subtasks import (
+    SubtaskStatus,
+    check_subtask_is_valid,
+    queue_subtasks_for_query,
+    update_subtask_status,
+)
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
 from openedx.core.djangoapps.content.course_structures.models import CourseStructure
-from opaque_keys.edx.keys import UsageKey
+from opaque_keys.edx.keys import CourseKey, UsageKey
 from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort, is_course_cohorted
 from student.models import CourseEnrollment, CourseAccessRole
-from verify_student.models import SoftwareSecurePhotoVerification
 
 
 # define different loggers for use within tasks and on client side
@@ -63,9 +67,17 @@ UPDATE_STATUS_SUCCEEDED = 'succeeded'
 UPDATE_STATUS_FAILED = 'failed'
 UPDATE_STATUS_SKIPPED = 'skipped'
 
+# The number of StudentModules updated by perform_module_state_update in each transaction.
+STUDENT_MODULE_UPDATE_BATCH_SIZE = 100
+
 # The setting name used for events when "settings" (account settings, preferences, profile information) change.
 REPORT_REQUESTED_EVENT_NAME = u'edx.instructor.report.requested'
 
+# Names of the parts of a grade report stored by its subtasks. Parts are joined
+# in the order of their names, so the header part sorts before the numbered ones.
+GRADE_REPORT_HEADER_PART_NAME = 'header'
+GRADE_REPORT_PART_NAME = 'part-{:06d}'
+
 
 class BaseInstructorTask(Task):
     """
@@ -280,7 +292,8 @@ def run_main_task(entry_id, task_fcn, action_name):
     return task_progress
 
 
-def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, task_input, action_name):
+def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, task_input, action_name,
+                                create_subtask_fcn=None):
     """
     Performs generic update by visiting StudentModule instances with the update_fcn provided.
 
@@ -298,6 +311,12 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     the update is successful; False indicates the update on the particular student module failed.
     A raised exception indicates a fatal condition -- that no other student modules should be considered.
 
+    If `create_subtask_fcn` is not None, and the update is for all students and there are more than
+    `settings.RESCORE_STUDENT_MODULES_PER_TASK` StudentModules to update, the StudentModules are
+    instead split by id into ranges that are each updated by a subtask (see
+    `perform_module_state_update_subtask`).  `create_subtask_fcn` is passed to
+    `queue_subtasks_for_query`.
+
     The return value is a dict containing the task's results, with the following keys:
 
           'attempted': number of attempts made
@@ -315,6 +334,81 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
 
     """
     start_time = time()
+    problems, modules_to_update, student = _get_modules_to_update(course_id, task_input, filter_fcn)
+    total_num_modules = modules_to_update.count()
+
+    modules_per_task = settings.RESCORE_STUDENT_MODULES_PER_TASK
+    if create_subtask_fcn is not None and student is None and modules_per_task and total_num_modules > modules_per_task:
+        entry = InstructorTask.objects.get(pk=_entry_id)
+        return queue_subtasks_for_query(
+            entry,
+            action_name,
+            create_subtask_fcn,
+            [modules_to_update.order_by('id')],
+            [],
+            modules_per_task,
+            total_num_modules,
+        )
+
+    task_progress = TaskProgress(action_name, total_num_modules, start_time)
+    task_progress.update_task_state()
+
+    _update_module_states(update_fcn, problems, modules_to_update, task_progress)
+
+    return task_progress.update_task_state()
+
+
+def perform_module_state_update_subtask(update_fcn, filter_fcn, entry_id, first_module_id, last_module_id,
+                                        subtask_status_dict):
+    """
+    Performs the update of `perform_module_state_update` for the StudentModules with ids from
+    `first_module_id` to `last_module_id`, as a subtask of InstructorTask `entry_id`.
+
+    The subtask's results are added to the InstructorTask's through `update_subtask_status`.
+    Returns the subtask's status.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+
+    # Raises DuplicateTaskException if this subtask has already been run.
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+    task_progress = TaskProgress(json.loads(entry.task_output)['action_name'], 0, time())
+    try:
+        problems, modules_to_update, __ = _get_modules_to_update(
+            entry.course_id, json.loads(entry.task_input), filter_fcn
+        )
+        modules_to_update = modules_to_update.filter(id__gte=first_module_id, id__lte=last_module_id)
+        task_progress.total = modules_to_update.count()
+        _update_module_states(update_fcn, problems, modules_to_update, task_progress)
+    except Exception:
+        TASK_LOG.exception(
+            u'Subtask: %s, InstructorTask ID: %s, update of StudentModules %s to %s failed',
+            current_task_id, entry_id, first_module_id, last_module_id
+        )
+        # As the batch being updated was rolled back, we don't know how many updates
+        # were saved, so we count all of them as having failed.
+        subtask_status.increment(failed=task_progress.total, state=FAILURE)
+        update_subtask_status(entry_id, current_task_id, subtask_status)
+        raise
+
+    subtask_status.increment(
+        succeeded=task_progress.succeeded,
+        failed=task_progress.failed,
+        skipped=task_progress.skipped,
+        state=SUCCESS
+    )
+    update_subtask_status(entry_id, current_task_id, subtask_status)
+    return subtask_status.to_dict()
+
+
+def _get_modules_to_update(course_id, task_input, filter_fcn):
+    """
+    Returns the problems to update, as a dict mapping usage key strings to descriptors, the
+    queryset of StudentModules to update and the student whose StudentModules are updated, or
+    None if they are updated for all students.  See `perform_module_state_update`.
+    """
     usage_keys = []
     problem_url = task_input.get('problem_url')
     entrance_exam_url = task_input.get('entrance_exam_url')
@@ -355,28 +449,46 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     if filter_fcn is not None:
         modules_to_update = filter_fcn(modules_to_update)
 
-    task_progress = TaskProgress(action_name, modules_to_update.count(), start_time)
-    task_progress.update_task_state()
+    return problems, modules_to_update, student
 
-    for module_to_update in modules_to_update:
-        task_progress.attempted += 1
-        module_descriptor = problems[unicode(module_to_update.module_state_key)]
-        # There is no try here:  if there's an error, we let it throw, and the task will
-        # be marked as FAILED, with a stack trace.
-        with dog_stats_api.timer('instructor_tasks.module.time.step', tags=[u'action:{name}'.format(name=action_name)]):
-            update_status = update_fcn(module_descriptor, module_to_update)
-            if update_status == UPDATE_STATUS_SUCCEEDED:
-                # If the update_fcn returns true, then it performed some kind of work.
-                # Logging of failures is left to the update_fcn itself.
-                task_progress.succeeded += 1
-            elif update_status == UPDATE_STATUS_FAILED:
-                task_progress.failed += 1
-            elif update_status == UPDATE_STATUS_SKIPPED:
-                task_progress.skipped += 1
-            else:
-                raise UpdateProblemModuleStateError("Unexpected update_status returned: {}".format(update_status))
 
-    return task_progress.update_task_state()
+def _update_module_states(update_fcn, problems, modules_to_update, task_progress):
+    """
+    Calls `update_fcn` on each of `modules_to_update`, counting the results in `task_progress`.
+
+    The StudentModules are updated in batches of STUDENT_MODULE_UPDATE_BATCH_SIZE, each saved in
+    one transaction.  Problems are parsed once per seed rather than once per StudentModule (see
+    `capa.capa_problem.problem_templates`), which is safe since update functions only grade.
+    """
+    modules = modules_to_update.select_related('student').order_by('id').iterator()
+    with problem_templates():
+        while True:
+            batch = list(islice(modules, STUDENT_MODULE_UPDATE_BATCH_SIZE))
+            if not batch:
+                break
+            with transaction.commit_on_success():
+                for module_to_update in batch:
+                    task_progress.attempted += 1
+                    module_descriptor = problems[unicode(module_to_update.module_state_key)]
+                    # There is no try here:  if there's an error, we let it throw, and the task will
+                    # be marked as FAILED, with a stack trace.
+                    with dog_stats_api.timer(
+                        'instructor_tasks.module.time.step',
+                        tags=[u'action:{name}'.format(name=task_progress.action_name)]
+                    ):
+                        update_status = update_fcn(module_descriptor, module_to_update)
+                        if update_status == UPDATE_STATUS_SUCCEEDED:
+                            # If the update_fcn returns true, then it performed some kind of work.
+                            # Logging of failures is left to the update_fcn itself.
+                            task_progress.succeeded += 1
+                        elif update_status == UPDATE_STATUS_FAILED:
+                            task_progress.failed += 1
+                        elif update_status == UPDATE_STATUS_SKIPPED:
+                            task_progress.skipped += 1
+                        else:
+                            raise UpdateProblemModuleStateError(
+                                "Unexpected update_status returned: {}".format(update_status)
+                            )
 
 
 def _get_task_id_from_xmodule_args(xmodule_instance_args):
@@ -450,12 +562,14 @@ def _get_module_instance_for_task(course_id, student, module_descriptor, xmodule
     )
 
 
-@transaction.autocommit
 def rescore_problem_module_state(xmodule_instance_args, module_descriptor, student_module):
     '''
     Takes an XModule descriptor and a corresponding StudentModule object, and
     performs rescoring on the student's problem submission.
 
+    Unlike the other update functions, this doesn't commit its changes itself, so that
+    perform_module_state_update can save rescored StudentModules in batches.
+
     Throws exceptions if the rescoring is fatal and should be aborted if in a loop.
     In particular, raises UpdateProblemModuleStateError if module fails to instantiate,
     or if the module doesn't support rescoring.
@@ -596,15 +710,7 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp, config_name
         course_id: ID of the course
     """
     report_store = ReportStore.from_config(config_name)
-    report_store.store_rows(
-        course_id,
-        u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
-            course_prefix=course_filename_prefix_generator(course_id),
-            csv_name=csv_name,
-            timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
-        ),
-        rows
-    )
+    report_store.store_rows(course_id, report_filename(course_id, csv_name, timestamp), rows)
     tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": csv_name, })
 
 
@@ -638,35 +744,49 @@ def upload_exec_summary_to_store(data_dict, report_name, course_id, generated_at
     tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": report_name})
 
 
-def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):  # pylint: disable=too-many-statements
+def report_filename(course_id, csv_name, timestamp):
     """
-    For a given `course_id`, generate a grades CSV file for all students that
-    are enrolled, and store using a `ReportStore`. Once created, the files can
-    be accessed by instantiating another `ReportStore` (via
-    `ReportStore.from_config()`) and calling `link_for()` on it. Writes are
-    buffered, so we'll never write part of a CSV file to S3 -- i.e. any files
-    that are visible in ReportStore will be complete ones.
+    Returns the name under which the `csv_name` report of `course_id` generated
+    at `timestamp` is stored.
+    """
+    return u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
+        course_prefix=course_filename_prefix_generator(course_id),
+        csv_name=csv_name,
+        timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
+    )
+
 
-    As we start to add more CSV downloads, it will probably be worthwhile to
-    make a more general CSVDoc class instead of building out the rows like we
-    do here.
+def _iterate_grades_with_attributes(course, students, experiment_partitions=(), keep_raw_scores=False):
     """
-    start_time = time()
-    start_date = datetime.now(UTC)
-    status_interval = 100
-    enrolled_students = CourseEnrollment.objects.users_enrolled_in(course_id)
-    task_progress = TaskProgress(action_name, enrolled_students.count(), start_time)
+    Grades `students` in `course` in batches, yielding for each student the
+    (student, gradeset, err_msg) tuple of `iterate_grades_for` followed by
+    the `LearnerAttributes` of the student's batch, which loads the report
+    columns of the whole batch at once.
+    """
+    students = iter(students)
+    while True:
+        student_batch = list(islice(students, GRADING_BATCH_SIZE))
+        if not student_batch:
+            break
+        learner_attributes = LearnerAttributes(
+            course.id, [student.id for student in student_batch], experiment_partitions
+        )
+        for student, gradeset, err_msg in iterate_grades_for(course, student_batch, keep_raw_scores=keep_raw_scores):
+            yield student, gradeset, err_msg, learner_attributes
 
-    fmt = u'Task: {task_id}, InstructorTask ID: {entry_id}, Course: {course_id}, Input: {task_input}'
-    task_info_string = fmt.format(
-        task_id=_xmodule_instance_args.get('task_id') if _xmodule_instance_args is not None else None,
-        entry_id=_entry_id,
-        course_id=course_id,
-        task_input=_task_input
-    )
-    TASK_LOG.info(u'%s, Task type: %s, Starting task execution', task_info_string, action_name)
 
-    course = get_course_by_id(course_id)
+def _iterate_grade_report_rows(course, students, task_progress, err_rows, task_info_string):
+    """
+    Grades `students` in `course` and yields the rows of the grade report: a
+    header row, once the first student has been graded successfully, followed
+    by one row for each student who was graded successfully. A row for each
+    student who could not be graded is appended to `err_rows`.
+
+    The rows are generated as they are consumed, so that the report can be
+    written out without holding all of it in memory.
+    """
+    action_name = task_progress.action_name
+    status_interval = 100
     course_is_cohorted = is_course_cohorted(course.id)
     cohorts_header = ['Cohort Name'] if course_is_cohorted else []
 
@@ -674,25 +794,21 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     group_configs_header = [u'Experiment Group ({})'.format(partition.name) for partition in experiment_partitions]
 
     certificate_info_header = ['Certificate Eligible', 'Certificate Delivered', 'Certificate Type']
-    certificate_whitelist = CertificateWhitelist.objects.filter(course_id=course_id, whitelist=True)
-    whitelisted_user_ids = [entry.user_id for entry in certificate_whitelist]
 
-    # Loop over all our students and build our CSV lists in memory
     header = None
-    rows = []
-    err_rows = [["id", "username", "error_msg"]]
     current_step = {'step': 'Calculating Grades'}
 
-    total_enrolled_students = enrolled_students.count()
     student_counter = 0
     TASK_LOG.info(
         u'%s, Task type: %s, Current step: %s, Starting grade calculation for total students: %s',
         task_info_string,
         action_name,
         current_step,
-        total_enrolled_students
+        task_progress.total
     )
-    for student, gradeset, err_msg in iterate_grades_for(course_id, enrolled_students):
+    for student, gradeset, err_msg, learner_attributes in _iterate_grades_with_attributes(
+            course, students, experiment_partitions
+    ):
         # Periodically update task status (this is a cache write)
         if task_progress.attempted % status_interval == 0:
             task_progress.update_task_state(extra_meta=current_step)
@@ -707,7 +823,7 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
             action_name,
             current_step,
             student_counter,
-            total_enrolled_students
+            task_progress.total
         )
 
         if gradeset:
@@ -715,7 +831,7 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
             task_progress.succeeded += 1
             if not header:
                 header = [section['label'] for section in gradeset[u'section_breakdown']]
-                rows.append(
+                yield (
                     ["id", "email", "username", "grade"] + header + cohorts_header +
                     group_configs_header + ['Enrollment Track', 'Verification Status'] + certificate_info_header
                 )
@@ -728,26 +844,12 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
 
             cohorts_group_name = []
             if course_is_cohorted:
-                group = get_cohort(student, course_id, assign=False)
-                cohorts_group_name.append(group.name if group else '')
-
-            group_configs_group_names = []
-            for partition in experiment_partitions:
-                group = LmsPartitionService(student, course_id).get_group(partition, assign=False)
-                group_configs_group_names.append(group.name if group else '')
-
-            enrollment_mode = CourseEnrollment.enrollment_mode_for_user(student, course_id)[0]
-            verification_status = SoftwareSecurePhotoVerification.verification_status_for_user(
-                student,
-                course_id,
-                enrollment_mode
-            )
-            certificate_info = certificate_info_for_user(
-                student,
-                course_id,
-                gradeset['grade'],
-                student.id in whitelisted_user_ids
-            )
+                cohorts_group_name.append(learner_attributes.cohort_name(student.id))
+
+            group_configs_group_names = learner_attributes.group_names(student.id)
+            enrollment_mode = learner_attributes.enrollment_mode(student.id)
+            verification_status = learner_attributes.verification_status(student.id)
+            certificate_info = learner_attributes.certificate_info(student.id, gradeset['grade'])
 
             # Not everybody has the same gradable items. If the item is not
             # found in the user's gradeset, just assume it's a 0. The aggregated
@@ -756,7 +858,7 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
             # possible for a student to have a 0.0 show up in their row but
             # still have 100% for the course.
             row_percents = [percents.get(label, 0.0) for label in header]
-            rows.append(
+            yield (
                 [student.id, student.email, student.username, gradeset['percent']] +
                 row_percents + cohorts_group_name + group_configs_group_names +
                 [enrollment_mode] + [verification_status] + certificate_info
@@ -772,17 +874,64 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
         action_name,
         current_step,
         student_counter,
-        total_enrolled_students
+        task_progress.total
     )
 
-    # By this point, we've got the rows we're going to stuff into our CSV files.
+
+def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
+    """
+    For a given `course_id`, generate a grades CSV file for all students that
+    are enrolled, and store using a `ReportStore`. Once created, the files can
+    be accessed by instantiating another `ReportStore` (via
+    `ReportStore.from_config()`) and calling `link_for()` on it. Writes are
+    buffered, so we'll never write part of a CSV file to S3 -- i.e. any files
+    that are visible in ReportStore will be complete ones.
+
+    If the course has more enrolled students than
+    `settings.GRADES_DOWNLOAD_STUDENTS_PER_TASK`, the students are instead
+    split among subtasks (see `upload_grades_csv_part`), and the report is
+    stored once the last of them completes.
+    """
+    start_time = time()
+    start_date = datetime.now(UTC)
+    enrolled_students = CourseEnrollment.objects.users_enrolled_in(course_id)
+    total_enrolled_students = enrolled_students.count()
+
+    fmt = u'Task: {task_id}, InstructorTask ID: {entry_id}, Course: {course_id}, Input: {task_input}'
+    task_info_string = fmt.format(
+        task_id=_xmodule_instance_args.get('task_id') if _xmodule_instance_args is not None else None,
+        entry_id=_entry_id,
+        course_id=course_id,
+        task_input=_task_input
+    )
+    TASK_LOG.info(u'%s, Task type: %s, Starting task execution', task_info_string, action_name)
+
+    students_per_task = settings.GRADES_DOWNLOAD_STUDENTS_PER_TASK
+    if students_per_task and total_enrolled_students > students_per_task:
+        TASK_LOG.info(
+            u'%s, Task type: %s, Queuing subtasks of %s students for total students: %s',
+            task_info_string,
+            action_name,
+            students_per_task,
+            total_enrolled_students
+        )
+        return _queue_grade_report_subtasks(
+            _entry_id, action_name, enrolled_students, total_enrolled_students, students_per_task, start_date
+        )
+
+    task_progress = TaskProgress(action_name, total_enrolled_students, start_time)
+    course = get_course_by_id(course_id)
+    err_rows = [["id", "username", "error_msg"]]
+
+    # The rows are graded as they are written out, so the upload step
+    # is also the grading step.
+    rows = _iterate_grade_report_rows(course, enrolled_students, task_progress, err_rows, task_info_string)
+    upload_csv_to_report_store(rows, 'grade_report', course_id, start_date)
+
     current_step = {'step': 'Uploading CSVs'}
     task_progress.update_task_state(extra_meta=current_step)
     TASK_LOG.info(u'%s, Task type: %s, Current step: %s', task_info_string, action_name, current_step)
 
-    # Perform the actual upload
-    upload_csv_to_report_store(rows, 'grade_report', course_id, start_date)
-
     # If there are any error rows (don't count the header), write them out as well
     if len(err_rows) > 1:
         upload_csv_to_report_store(err_rows, 'grade_report_err', course_id, start_date)
@@ -792,6 +941,148 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     return task_progress.update_task_state(extra_meta=current_step)
 
 
+def _queue_grade_report_subtasks(entry_id, action_name, students, total_num_students, students_per_task, start_date):
+    """
+    Splits the grading of `students` among subtasks of InstructorTask `entry_id`.
+
+    Each subtask grades a range of students, ordered by id, and stores their
+    rows as a numbered part of the report files named for `start_date`.
+    Returns the task progress as stored in the InstructorTask.
+    """
+    # Imported here since the tasks module imports this one.
+    from instructor_task.tasks import calculate_grades_csv_part
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+    report_filenames = {
+        csv_name: report_filename(entry.course_id, csv_name, start_date)
+        for csv_name in ('grade_report', 'grade_report_err')
+    }
+    part_numbers = count()
+
+    def _create_subtask(to_list, subtask_status):
+        """Creates the subtask grading the students in `to_list`."""
+        return calculate_grades_csv_part.subtask(
+            (
+                entry_id,
+                unicode(entry.course_id),
+                report_filenames,
+                next(part_numbers),
+                [item['pk'] for item in to_list],
+                subtask_status.to_dict(),
+            ),
+            task_id=subtask_status.task_id,
+            routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+        )
+
+    return queue_subtasks_for_query(
+        entry,
+        action_name,
+        _create_subtask,
+        [students.order_by('id')],
+        [],
+        students_per_task,
+        total_num_students,
+    )
+
+
+def upload_grades_csv_part(entry_id, course_id, report_filenames, part_number, user_ids, subtask_status_dict):
+    """
+    Grades the students with ids `user_ids` as a subtask of the grade report
+    InstructorTask `entry_id`, and stores their rows as part `part_number` of
+    the report files named in `report_filenames`.
+
+    The subtask which completes the InstructorTask joins the parts of the
+    report or, if any of the subtasks failed, deletes them (see
+    `_finish_grade_report`).  Returns the subtask's status.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    course_key = CourseKey.from_string(course_id)
+    task_info_string = u'Subtask: {task_id}, InstructorTask ID: {entry_id}, Course: {course_id}, Part: {part}'.format(
+        task_id=current_task_id,
+        entry_id=entry_id,
+        course_id=course_id,
+        part=part_number
+    )
+
+    # Raises DuplicateTaskException if this subtask has already been run.
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+    task_progress = TaskProgress(ugettext_noop('graded'), len(user_ids), time())
+    part_name = GRADE_REPORT_PART_NAME.format(part_number)
+    report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+    try:
+        course = get_course_by_id(course_key)
+        students = User.objects.filter(id__in=user_ids).order_by('id')
+        err_rows = []
+
+        rows = _iterate_grade_report_rows(course, students, task_progress, err_rows, task_info_string)
+        header = next(rows, None)
+        if header is not None:
+            # Every subtask with graded students stores the same header part.
+            report_store.store_rows_part(
+                course_key, report_filenames['grade_report'], GRADE_REPORT_HEADER_PART_NAME, [header]
+            )
+        report_store.store_rows_part(course_key, report_filenames['grade_report'], part_name, rows)
+
+        if err_rows:
+            report_store.store_rows_part(
+                course_key,
+                report_filenames['grade_report_err'],
+                GRADE_REPORT_HEADER_PART_NAME,
+                [["id", "username", "error_msg"]]
+            )
+            report_store.store_rows_part(course_key, report_filenames['grade_report_err'], part_name, err_rows)
+    except Exception:
+        TASK_LOG.exception(u'%s, Grade report subtask failed', task_info_string)
+        subtask_status.increment(
+            succeeded=task_progress.succeeded,
+            failed=len(user_ids) - task_progress.succeeded,
+            state=FAILURE
+        )
+        subtasks = update_subtask_status(entry_id, current_task_id, subtask_status)
+        _finish_grade_report(report_store, course_key, report_filenames, subtasks, task_info_string)
+        raise
+
+    subtask_status.increment(succeeded=task_progress.succeeded, failed=task_progress.failed, state=SUCCESS)
+    subtasks = update_subtask_status(entry_id, current_task_id, subtask_status)
+    _finish_grade_report(report_store, course_key, report_filenames, subtasks, task_info_string)
+
+    return subtask_status.to_dict()
+
+
+def _finish_grade_report(report_store, course_key, report_filenames, subtasks, task_info_string):
+    """
+    Joins the parts of the grade report once every one of its subtasks has
+    finished, given the InstructorTask's `subtasks` counters as returned by
+    `update_subtask_status`.  If any subtask failed, the report would be
+    missing students, so its parts are deleted instead and no report is
+    stored.
+
+    The InstructorTask is marked as succeeded by the update of its last
+    subtask's status, so it shows as done while the parts are being joined,
+    before the report is listed for download.
+    """
+    if subtasks['succeeded'] + subtasks['failed'] < subtasks['total']:
+        return
+
+    if subtasks['failed']:
+        TASK_LOG.error(
+            u'%s, %s of %s grade report subtasks failed, deleting report parts without storing the report',
+            task_info_string,
+            subtasks['failed'],
+            subtasks['total'],
+        )
+        report_store.delete_parts(course_key, report_filenames['grade_report'])
+        report_store.delete_parts(course_key, report_filenames['grade_report_err'])
+        return
+
+    TASK_LOG.info(u'%s, Last grade report subtask completed, joining report parts', task_info_string)
+    report_store.concatenate_parts(course_key, report_filenames['grade_report'])
+    report_store.concatenate_parts(course_key, report_filenames['grade_report_err'])
+    tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": 'grade_report', })
+
+
 def _order_problems(blocks):
     """
     Sort the problems by the assignment type and assignment that it belongs to.
@@ -859,8 +1150,8 @@ def upload_problem_grade_report(_xmodule_instance_args, _entry_id, course_id, _t
     header_row = OrderedDict([('id', 'Student ID'), ('email', 'Email'), ('username', 'Username')])
 
     try:
-        course_structure = CourseStructure.objects.get(course_id=course_id)
-        blocks = course_structure.ordered_blocks
+        course_structure = CourseStructure.get_parsed_structure(course_id)
+        blocks = course_structure.ordered_blocks if course_structure else None
         problems = _order_problems(blocks)
     except CourseStructure.DoesNotExist:
         return task_progress.update_task_state(
@@ -85,6 +85,41 @@ class ReportStoreTestMixin(object):
         )
 
 
+class LocalFSReportStorePartsTestCase(TestReportMixin, TestCase):
+    """
+    Test storing and joining the parts of a LocalFSReportStore file.
+    """
+    def setUp(self):
+        super(LocalFSReportStorePartsTestCase, self).setUp()
+        self.course_id = CourseLocator(org="testx", course="coursex", run="runx")
+        self.report_store = LocalFSReportStore.from_config(config_name='GRADES_DOWNLOAD')
+
+    def test_concatenate_parts(self):
+        # Parts are joined in the order of their names, not the order they were stored in.
+        self.report_store.store_rows_part(self.course_id, 'report.csv', 'part-2', [['c', 3]])
+        self.report_store.store_rows_part(self.course_id, 'report.csv', 'part-1', [['b', 2]])
+        self.report_store.store_rows_part(self.course_id, 'report.csv', 'header', [['name', 'value']])
+        self.assertEqual(self.report_store.links_for(self.course_id), [])
+
+        self.assertTrue(self.report_store.concatenate_parts(self.course_id, 'report.csv'))
+        self.assertEqual([link[0] for link in self.report_store.links_for(self.course_id)], ['report.csv'])
+        with open(self.report_store.path_to(self.course_id, 'report.csv')) as report_file:
+            self.assertEqual(report_file.read(), 'name,value\r\nb,2\r\nc,3\r\n')
+
+        # The parts are removed once joined.
+        self.assertFalse(self.report_store.concatenate_parts(self.course_id, 'report.csv'))
+
+    def test_delete_parts(self):
+        self.report_store.store_rows_part(self.course_id, 'report.csv', 'part-1', [['b', 2]])
+        self.report_store.delete_parts(self.course_id, 'report.csv')
+        self.assertFalse(self.report_store.concatenate_parts(self.course_id, 'report.csv'))
+        self.assertEqual(self.report_store.links_for(self.course_id), [])
+
+    def test_concatenate_no_parts(self):
+        self.assertFalse(self.report_store.concatenate_parts(self.course_id, 'report.csv'))
+        self.assertEqual(self.report_store.links_for(self.course_id), [])
+
+
 class LocalFSReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, TestCase):
     """
     Test the LocalFSReportStore model.
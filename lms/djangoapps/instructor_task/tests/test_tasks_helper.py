@@ -6,19 +6,27 @@ Unit tests for LMS instructor-initiated background tasks helper functions.
 Tests that CSV grade report generation works with unicode emails.
 
 """
+import json
+import os
+from uuid import uuid4
+
+from celery.states import SUCCESS
 import ddt
 from mock import Mock, patch
 import tempfile
 import unicodecsv
 from django.core.urlresolvers import reverse
+from django.test.utils import override_settings
 
 from capa.tests.response_xml_factory import MultipleChoiceResponseXMLFactory
 from certificates.tests.factories import GeneratedCertificateFactory, CertificateWhitelistFactory
 from course_modes.models import CourseMode
 from courseware.tests.factories import InstructorFactory
-from instructor_task.models import ReportStore
+from instructor_task.models import InstructorTask, ReportStore
 from instructor_task.tasks_helper import cohort_students_and_upload, upload_grades_csv, upload_students_csv, \
-    upload_enrollment_report, upload_exec_summary_report
+    upload_enrollment_report, upload_exec_summary_report, upload_problem_grade_report, upload_may_enroll_csv, \
+    _iterate_grade_report_rows
+from instructor_task.tests.factories import InstructorTaskFactory
 from instructor_task.tests.test_base import InstructorTaskCourseTestCase, TestReportMixin, InstructorTaskModuleTestCase
 from openedx.core.djangoapps.course_groups.models import CourseUserGroupPartitionGroup
 from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory
@@ -31,14 +39,6 @@ from student.models import CourseEnrollment, CourseEnrollmentAllowed, ManualEnro
 from verify_student.tests.factories import SoftwareSecurePhotoVerificationFactory
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.partitions.partitions import Group, UserPartition
-from instructor_task.models import ReportStore
-from instructor_task.tasks_helper import (
-    cohort_students_and_upload,
-    upload_grades_csv,
-    upload_problem_grade_report,
-    upload_students_csv,
-    upload_may_enroll_csv,
-)
 from openedx.core.djangoapps.util.testing import ContentGroupTestCase, TestConditionalContent
 
 
@@ -274,6 +274,67 @@ class TestInstructorGradeReport(TestReportMixin, InstructorTaskCourseTestCase):
         result = upload_grades_csv(None, None, self.course.id, None, 'graded')
         self.assertDictContainsSubset({'attempted': 1, 'succeeded': 1, 'failed': 0}, result)
 
+    @patch('instructor_task.tasks_helper._get_current_task')
+    def test_grade_report_subtasks(self, _mock_current_task):
+        """
+        Test that a grade report split among subtasks is joined into one report.
+        """
+        usernames = [u'student{}'.format(index) for index in range(5)]
+        for username in usernames:
+            self.create_student(username, u'{}@example.com'.format(username))
+        entry = InstructorTaskFactory.create(
+            course_id=self.course.id, task_type='grade_course', task_key='', task_id=str(uuid4())
+        )
+
+        with override_settings(GRADES_DOWNLOAD_STUDENTS_PER_TASK=2):
+            upload_grades_csv(None, entry.id, self.course.id, None, 'graded')
+
+        entry = InstructorTask.objects.get(pk=entry.id)
+        self.assertEqual(entry.task_state, SUCCESS)
+        self.assertEqual(json.loads(entry.subtasks)['succeeded'], 3)
+        self.assertDictContainsSubset(
+            {'attempted': 5, 'succeeded': 5, 'failed': 0},
+            json.loads(entry.task_output)
+        )
+
+        # Only the joined report is listed, with a single header row.
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        links = report_store.links_for(self.course.id)
+        self.assertEqual(len(links), 1)
+        with open(report_store.path_to(self.course.id, links[0][0])) as csv_file:
+            self.assertEqual([row['username'] for row in unicodecsv.DictReader(csv_file)], usernames)
+
+    @patch('instructor_task.tasks_helper._get_current_task')
+    @patch('instructor_task.tasks_helper.TASK_LOG')
+    def test_grade_report_subtask_failure(self, mock_log, _mock_current_task):
+        """
+        Test that a grade report is dropped, along with its parts, if one of its subtasks fails.
+        """
+        for index in range(5):
+            self.create_student(u'student{}'.format(index), u'student{}@example.com'.format(index))
+        entry = InstructorTaskFactory.create(
+            course_id=self.course.id, task_type='grade_course', task_key='', task_id=str(uuid4())
+        )
+
+        def iterate_grade_report_rows(course, students, *args):
+            """Fail to grade the subtask's students if student2 is among them."""
+            if any(student.username == u'student2' for student in students):
+                raise Exception('Grading failed')
+            return _iterate_grade_report_rows(course, students, *args)
+
+        with override_settings(GRADES_DOWNLOAD_STUDENTS_PER_TASK=2):
+            with patch('instructor_task.tasks_helper._iterate_grade_report_rows', iterate_grade_report_rows):
+                upload_grades_csv(None, entry.id, self.course.id, None, 'graded')
+
+        subtasks = json.loads(InstructorTask.objects.get(pk=entry.id).subtasks)
+        self.assertEqual((subtasks['succeeded'], subtasks['failed']), (2, 1))
+        self.assertTrue(mock_log.error.called)
+
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        self.assertEqual(report_store.links_for(self.course.id), [])
+        parts_directory = report_store.parts_path_to(self.course.id, '')
+        self.assertEqual(os.listdir(parts_directory) if os.path.exists(parts_directory) else [], [])
+
 
 @ddt.ddt
 @patch.dict('django.conf.settings.FEATURES', {'ENABLE_PAID_COURSE_REGISTRATION': True})
@@ -11,6 +11,47 @@ from xblock.fields import Scope, ScopeBase
 new_contract('UsageKey', UsageKey)
 
 
+class XBlockUserState(object):
+    """
+    The stored state of a single XBlock usage for a single user, as yielded by
+    :meth:`XBlockUserStateClient.iter_all_for_block` and
+    :meth:`XBlockUserStateClient.iter_all_for_course`.
+
+    Attributes:
+        username: The name of the user the state belongs to
+        block_key (UsageKey): The XBlock usage the state belongs to
+        state (dict): A dictionary mapping field names to values
+        updated (datetime): When the state was last modified
+        scope (Scope): The scope the state was stored in
+    """
+    __slots__ = ('username', 'block_key', 'updated', 'scope', '_state')
+
+    def __init__(self, username, block_key, state, updated, scope):
+        """
+        Arguments are as for the attributes of the same name, except that `state`
+        may also be a callable returning the state dict. It is then called
+        the first time `state` is read, so that clients can defer decoding stored
+        state until (and unless) it is used.
+        """
+        self.username = username
+        self.block_key = block_key
+        self.updated = updated
+        self.scope = scope
+        self._state = state
+
+    @property
+    def state(self):
+        """
+        A dictionary mapping field names to values.
+        """
+        if callable(self._state):
+            self._state = self._state()
+        return self._state
+
+    def __repr__(self):
+        return "XBlockUserState({!r}, {!r}, updated={!r})".format(self.username, self.block_key, self.updated)
+
+
 class XBlockUserStateClient(object):
     """
     First stab at an interface for accessing XBlock User State. This will have
@@ -243,6 +284,8 @@ class XBlockUserStateClient(object):
         You get no ordering guarantees. Fetching will happen in batch_size
         increments. If you're using this method, you should be running in an
         async task.
+
+        Yields: an :class:`XBlockUserState` for every user that has state stored for `block_key`.
         """
         raise NotImplementedError()
 
@@ -251,5 +294,8 @@ class XBlockUserStateClient(object):
         You get no ordering guarantees. Fetching will happen in batch_size
         increments. If you're using this method, you should be running in an
         async task.
+
+        Yields: an :class:`XBlockUserState` for every user and block in the course
+            (restricted to blocks of `block_type`, if given) that has state stored.
         """
         raise NotImplementedError()
@@ -408,6 +408,10 @@ FEATURES = {
 
     # Credit course API
     'ENABLE_CREDIT_API': False,
+
+    # Store students' subsection and course grades, and only regrade the
+    # subsections whose scores have changed since they were stored.
+    'ENABLE_PERSISTENT_GRADES': False,
 }
 
 # Ignore static asset files on import which match this pattern
@@ -485,6 +489,9 @@ OAUTH_OIDC_USERINFO_HANDLERS = (
 # templates
 import tempfile
 MAKO_MODULE_DIR = os.path.join(tempfile.gettempdir(), 'mako_lms')
+# Load all the templates at startup rather than on first use, and don't check
+# their files for changes; see the precompile_templates management command
+MAKO_PRELOAD_TEMPLATES = False
 MAKO_TEMPLATES = {}
 MAKO_TEMPLATES['main'] = [PROJECT_ROOT / 'templates',
                           COMMON_ROOT / 'templates',
@@ -2107,9 +2114,26 @@ BADGR_API_TOKEN = None
 BADGR_BASE_URL = "http://localhost:8005"
 BADGR_ISSUER_SLUG = "example-issuer"
 
+###################### Problem Rescoring ######################
+
+# Rescoring a problem for all students with more submissions than this is split
+# into subtasks that each rescore this many submissions, ranged by StudentModule
+# id.  A value of None rescores every submission in a single task.
+RESCORE_STUDENT_MODULES_PER_TASK = None
+
 ###################### Grade Downloads ######################
 GRADES_DOWNLOAD_ROUTING_KEY = HIGH_MEM_QUEUE
 
+# Grade reports for courses with more enrolled students than this are generated by
+# subtasks that each grade this many students and store their rows as a part of the
+# report.  The parts are joined once the last subtask completes.  A value of None
+# grades every student in a single task.
+GRADES_DOWNLOAD_STUDENTS_PER_TASK = None
+
+# Answer distributions are counted from this many ranges of StudentModule ids at
+# once, each in its own thread and database connection.
+ANSWER_DISTRIBUTION_SHARDS = 1
+
 GRADES_DOWNLOAD = {
     'STORAGE_TYPE': 'localfs',
     'BUCKET': 'edx-grades',
@@ -0,0 +1,90 @@
+"""
+Tests of the comments service client utilities
+"""
+from functools import partial
+import threading
+from unittest import TestCase
+
+from django.utils import translation
+import mock
+import requests
+
+from lms.lib.comment_client import utils
+
+
+class PerformRequestTestCase(TestCase):
+    """
+    Tests of sending requests with the shared session
+    """
+    def setUp(self):
+        super(PerformRequestTestCase, self).setUp()
+        patcher = mock.patch('lms.lib.comment_client.utils.requests.Session.request')
+        self.mock_request = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_request.return_value = mock.Mock(status_code=200, text='{}', json=lambda: {})
+
+    def test_session_reused(self):
+        self.assertIs(utils.get_session(), utils.get_session())
+
+    def test_session_not_reused_after_fork(self):
+        session = utils.get_session()
+        with mock.patch('lms.lib.comment_client.utils.os.getpid', return_value=-1):
+            self.assertIsNot(utils.get_session(), session)
+
+    def test_get_retried(self):
+        self.mock_request.side_effect = [requests.exceptions.ConnectionError, self.mock_request.return_value]
+        self.assertEqual(utils.perform_request('get', 'http://localhost:4567/api/v1/users/1'), {})
+        self.assertEqual(self.mock_request.call_count, 2)
+
+    def test_get_retries_limited(self):
+        self.mock_request.side_effect = requests.exceptions.ConnectionError
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            utils.perform_request('get', 'http://localhost:4567/api/v1/users/1')
+        self.assertEqual(self.mock_request.call_count, utils.MAX_RETRIES + 1)
+
+    def test_post_not_retried(self):
+        self.mock_request.side_effect = requests.exceptions.ConnectionError
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            utils.perform_request('post', 'http://localhost:4567/api/v1/users/1', {})
+        self.assertEqual(self.mock_request.call_count, 1)
+
+
+class PerformConcurrentlyTestCase(TestCase):
+    """
+    Tests of making calls to the comments service concurrently
+    """
+    def test_results_in_order(self):
+        # Each call waits for the next to start, so that they only finish if they're made at the same time
+        started = [threading.Event() for __ in range(3)]
+
+        def call(index):
+            """Wait for the next call to start, then return index."""
+            started[index].set()
+            if index + 1 < len(started):
+                self.assertTrue(started[index + 1].wait(5))
+            return index
+
+        self.assertEqual(utils.perform_concurrently(*[partial(call, index) for index in range(3)]), [0, 1, 2])
+
+    def test_first_exception_raised(self):
+        def fail(message):
+            """Raise an exception with the message."""
+            raise utils.CommentClientError(message)
+
+        with self.assertRaises(utils.CommentClientError) as context:
+            utils.perform_concurrently(lambda: 0, partial(fail, 'first'), partial(fail, 'second'))
+        self.assertEqual(context.exception.message, 'first')
+
+    def test_language(self):
+        translation.activate('eo')
+        self.addCleanup(translation.deactivate)
+        self.assertEqual(utils.perform_concurrently(translation.get_language, translation.get_language), ['eo', 'eo'])
+
+    def test_nested_calls_made_in_worker(self):
+        def nested():
+            """Return the thread the nested calls are made in."""
+            return utils.perform_concurrently(threading.current_thread, threading.current_thread)
+
+        __, threads = utils.perform_concurrently(lambda: None, nested)
+        self.assertEqual(len(set(threads)), 1)
+        self.assertIsNot(threads[0], threading.current_thread())
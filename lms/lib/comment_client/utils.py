@@ -1,14 +1,31 @@
 from contextlib import contextmanager
+import cookielib
 import dogstats_wrapper as dog_stats_api
 import logging
+from multiprocessing.pool import ThreadPool
+import os
 import requests
+from requests.adapters import HTTPAdapter
+import threading
 from django.conf import settings
 from time import time
 from uuid import uuid4
+from django.utils import translation
 from django.utils.translation import get_language
 
 log = logging.getLogger(__name__)
 
+# The most connections to the comments service each process keeps open
+POOL_SIZE = getattr(settings, "COMMENTS_SERVICE_POOL_SIZE", 10)
+# How many times to retry a GET request which fails to connect to the comments service
+MAX_RETRIES = getattr(settings, "COMMENTS_SERVICE_MAX_RETRIES", 2)
+# The most requests perform_concurrently makes at the same time from each process
+MAX_CONCURRENT_REQUESTS = getattr(settings, "COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS", 4)
+
+_per_process_lock = threading.Lock()
+_per_process = {}
+_worker = threading.local()
+
 
 def strip_none(dic):
     return dict([(k, v) for k, v in dic.iteritems() if v is not None])
@@ -50,6 +67,90 @@ def request_timer(request_id, method, url, tags=None):
     )
 
 
+def _get_per_process(name, factory):
+    """
+    Returns the value called name in this process, which factory creates
+    when it's first needed, and again in a forked process.
+    """
+    pid = os.getpid()
+    value = _per_process.get(name)
+    if value is None or value[0] != pid:
+        with _per_process_lock:
+            value = _per_process.get(name)
+            if value is None or value[0] != pid:
+                value = _per_process[name] = (pid, factory())
+    return value[1]
+
+
+def _create_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    # The session is shared by every user of the process, so it mustn't keep cookies
+    session.cookies.set_policy(cookielib.DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def get_session():
+    """
+    Returns the requests session this process uses for the comments service,
+    which keeps its connections open between requests.
+    """
+    return _get_per_process('session', _create_session)
+
+
+def _send_request(method, url, metric_tags, **kwargs):
+    """
+    Sends the request with the shared session, retrying GET requests which
+    fail to connect to the comments service.
+    """
+    retries = MAX_RETRIES if method == 'get' else 0
+    while True:
+        try:
+            return get_session().request(method, url, **kwargs)
+        except requests.exceptions.ConnectionError:
+            if retries <= 0:
+                raise
+            retries -= 1
+            dog_stats_api.increment('comment_client.request.retry', tags=metric_tags)
+            log.warning(u"Retrying comments service request which failed to connect: %s %s", method, url)
+
+
+def _perform_call(call, language):
+    """
+    Makes the call in a thread of the pool, in the language of the request it's for.
+    """
+    _worker.active = True
+    if language:
+        translation.activate(language)
+    try:
+        return call()
+    finally:
+        translation.deactivate()
+        _worker.active = False
+
+
+def perform_concurrently(*calls):
+    """
+    Makes independent calls to the comments service at the same time,
+    returning their results in the same order.
+
+    Each call is a function taking no arguments, such as a bound method or a
+    functools.partial, which makes requests to the comments service and
+    doesn't use the database. If any calls raise an exception, the first
+    of them to do so in the given order is raised.
+    """
+    if len(calls) < 2 or getattr(_worker, 'active', False):
+        return [call() for call in calls]
+    pool = _get_per_process('pool', lambda: ThreadPool(MAX_CONCURRENT_REQUESTS))
+    language = get_language()
+    # Make the first call in this thread while the pool makes the others
+    pending = [pool.apply_async(_perform_call, (call, language)) for call in calls[1:]]
+    first = calls[0]()
+    return [first] + [result.get() for result in pending]
+
+
 def perform_request(method, url, data_or_params=None, raw=False,
                     metric_action=None, metric_tags=None, paged_results=False):
 
@@ -76,9 +177,10 @@ def perform_request(method, url, data_or_params=None, raw=False,
         data = None
         params = merge_dict(data_or_params, request_id_dict)
     with request_timer(request_id, method, url, metric_tags):
-        response = requests.request(
+        response = _send_request(
             method,
             url,
+            metric_tags,
             data=data,
             params=params,
             headers=headers,
@@ -11,6 +11,7 @@ settings.INSTALLED_APPS  # pylint: disable=pointless-statement
 
 from openedx.core.lib.django_startup import autostartup
 import edxmako
+from edxmako.startup import preload_all_templates
 import logging
 from monkey_patch import django_utils_translation
 import analytics
@@ -43,6 +44,9 @@ def run():
     if settings.FEATURES.get('SEGMENT_IO_LMS') and hasattr(settings, 'SEGMENT_IO_LMS_KEY'):
         analytics.init(settings.SEGMENT_IO_LMS_KEY, flush_at=50)
 
+    # Once the theme and microsites have added their template directories
+    preload_all_templates()
+
 
 def add_mimetypes():
     """
@@ -0,0 +1,49 @@
+import logging
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+from opaque_keys.edx.keys import CourseKey
+from xmodule.modulestore.django import modulestore
+
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    args = '<course_id course_id ...>'
+    help = 'Generates and stores course overviews for one or more courses.'
+
+    option_list = BaseCommand.option_list + (
+        make_option('--all',
+                    action='store_true',
+                    default=False,
+                    help='Generate overviews for all courses.'),
+    )
+
+    def handle(self, *args, **options):
+
+        if options['all']:
+            course_keys = modulestore().get_course_keys()
+        else:
+            course_keys = [CourseKey.from_string(arg) for arg in args]
+
+        if not course_keys:
+            log.fatal('No courses specified.')
+            return
+
+        log.info('Generating course overviews for %d courses.', len(course_keys))
+        log.debug('Generating course overview(s) for the following courses: %s', course_keys)
+
+        for course_key in course_keys:
+            try:
+                # Regenerate the overview even if an up to date one is stored
+                CourseOverview.invalidate(course_key)
+                if CourseOverview.get_from_id(course_key) is None:
+                    log.warning('Course %s does not exist or could not be loaded.', unicode(course_key))
+            except Exception as ex:  # pylint: disable=broad-except
+                log.exception('An error occurred while generating course overview for %s: %s',
+                              unicode(course_key), ex.message)
+
+        log.info('Finished generating course overviews.')
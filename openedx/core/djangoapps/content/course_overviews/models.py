@@ -2,19 +2,26 @@
 Declaration of CourseOverview model
 """
 
+from datetime import datetime
 import json
 
 import django.db.models
-from django.db.models.fields import BooleanField, DateTimeField, DecimalField, TextField
+from django.db.models.fields import BooleanField, DateTimeField, DecimalField, FloatField, IntegerField, TextField
+from django.utils.timezone import UTC
 from django.utils.translation import ugettext
 
 from lms.djangoapps.certificates.api import get_active_web_certificate
 from lms.djangoapps.courseware.courses import course_image_url
+from request_cache.middleware import RequestCache, get_cache
 from util.date_utils import strftime_localized
 from xmodule import course_metadata_utils
+from xmodule.course_module import CourseDescriptor
 from xmodule.modulestore.django import modulestore
 from xmodule_django.models import CourseKeyField, UsageKeyField
 
+# The request cache namespace in which loaded overviews are kept
+CACHE_NAMESPACE = 'course_overviews'
+
 
 class CourseOverview(django.db.models.Model):
     """
@@ -25,6 +32,12 @@ class CourseOverview(django.db.models.Model):
     a course as part of a user dashboard or enrollment API.
     """
 
+    # The version of the data stored in an overview. Bump this whenever fields
+    # are added, so that overviews stored by older code are regenerated.
+    VERSION = 2
+
+    version = IntegerField(default=0)
+
     # Course identification
     id = CourseKeyField(db_index=True, primary_key=True, max_length=255)  # pylint: disable=invalid-name
     _location = UsageKeyField(max_length=255)
@@ -36,6 +49,7 @@ class CourseOverview(django.db.models.Model):
     start = DateTimeField(null=True)
     end = DateTimeField(null=True)
     advertised_start = TextField(null=True)
+    announcement = DateTimeField(null=True)
 
     # URLs
     course_image_url = TextField()
@@ -57,6 +71,14 @@ class CourseOverview(django.db.models.Model):
     mobile_available = BooleanField()
     visible_to_staff_only = BooleanField()
     _pre_requisite_courses_json = TextField()  # JSON representation of list of CourseKey strings
+    days_early_for_beta = FloatField(null=True)
+    catalog_visibility = TextField(null=True)
+
+    # Enrollment parameters
+    enrollment_start = DateTimeField(null=True)
+    enrollment_end = DateTimeField(null=True)
+    enrollment_domain = TextField(null=True)
+    invitation_only = BooleanField()
 
     @staticmethod
     def _create_from_course(course):
@@ -73,6 +95,7 @@ class CourseOverview(django.db.models.Model):
             CourseOverview: overview extracted from the given course
         """
         return CourseOverview(
+            version=CourseOverview.VERSION,
             id=course.id,
             _location=course.location,
             display_name=course.display_name,
@@ -82,6 +105,7 @@ class CourseOverview(django.db.models.Model):
             start=course.start,
             end=course.end,
             advertised_start=course.advertised_start,
+            announcement=course.announcement,
 
             course_image_url=course_image_url(course),
             facebook_url=course.facebook_url,
@@ -97,9 +121,83 @@ class CourseOverview(django.db.models.Model):
 
             mobile_available=course.mobile_available,
             visible_to_staff_only=course.visible_to_staff_only,
-            _pre_requisite_courses_json=json.dumps(course.pre_requisite_courses)
+            _pre_requisite_courses_json=json.dumps(course.pre_requisite_courses),
+            days_early_for_beta=course.days_early_for_beta,
+            catalog_visibility=course.catalog_visibility,
+
+            enrollment_start=course.enrollment_start,
+            enrollment_end=course.enrollment_end,
+            enrollment_domain=course.enrollment_domain,
+            invitation_only=course.invitation_only,
         )
 
+    @staticmethod
+    def _load_from_module_store(course_id):
+        """
+        Loads a course from the modulestore, then creates and saves an overview of it.
+
+        Arguments:
+            course_id (CourseKey): the ID of the course to be loaded
+
+        Returns:
+            CourseOverview: overview of the course, or None if the course
+                doesn't exist or can't be loaded
+        """
+        store = modulestore()
+        with store.bulk_operations(course_id):
+            course = store.get_course(course_id)
+            if isinstance(course, CourseDescriptor):
+                course_overview = CourseOverview._create_from_course(course)
+                course_overview.save()  # Save new overview to the cache
+                return course_overview
+        return None
+
+    @staticmethod
+    def get_from_ids(course_ids):
+        """
+        Load the CourseOverview objects for a number of course IDs.
+
+        Overviews already loaded during this request are reused. The rest are
+        loaded from the database with a single query; any that are missing, or
+        were stored by an older version of this model, are created from the
+        modulestore and saved for future use. Outside of a request (in Celery
+        tasks and management commands) nothing clears the request cache, so
+        overviews are always loaded from the database there.
+
+        Arguments:
+            course_ids (iterable[CourseKey]): the IDs of the course overviews
+                to be loaded
+
+        Returns:
+            dict: maps each of the course IDs to its CourseOverview, or to None
+                if the course doesn't exist or can't be loaded
+        """
+        if RequestCache.get_current_request() is None:
+            cache = {}
+        else:
+            cache = get_cache(CACHE_NAMESPACE)
+        course_overviews = {}
+        uncached_ids = []
+        for course_id in course_ids:
+            if course_id in cache:
+                course_overviews[course_id] = cache[course_id]
+            else:
+                uncached_ids.append(course_id)
+
+        if uncached_ids:
+            stored_overviews = {
+                course_overview.id: course_overview
+                for course_overview in CourseOverview.objects.filter(
+                    id__in=uncached_ids, version__gte=CourseOverview.VERSION
+                )
+            }
+            for course_id in uncached_ids:
+                course_overview = stored_overviews.get(course_id)
+                if course_overview is None:
+                    course_overview = CourseOverview._load_from_module_store(course_id)
+                cache[course_id] = course_overviews[course_id] = course_overview
+        return course_overviews
+
     @staticmethod
     def get_from_id(course_id):
         """
@@ -116,17 +214,34 @@ class CourseOverview(django.db.models.Model):
         Returns:
             CourseOverview: overview of the requested course
         """
-        course_overview = None
-        try:
-            course_overview = CourseOverview.objects.get(id=course_id)
-        except CourseOverview.DoesNotExist:
-            store = modulestore()
-            with store.bulk_operations(course_id):
-                course = store.get_course(course_id)
-                if course:
-                    course_overview = CourseOverview._create_from_course(course)
-                    course_overview.save()  # Save new overview to the cache
-        return course_overview
+        return CourseOverview.get_from_ids([course_id])[course_id]
+
+    @staticmethod
+    def get_all_courses(org=None):
+        """
+        Load the CourseOverview objects of every course in the modulestore.
+
+        The modulestore is only asked for the keys of its courses; the
+        overviews themselves are loaded as by get_from_ids.
+
+        Arguments:
+            org (str): if given, only courses in this organization are loaded
+
+        Returns:
+            list[CourseOverview]: overviews of the courses which could be loaded
+        """
+        course_ids = modulestore().get_course_keys(org=org)
+        course_overviews = CourseOverview.get_from_ids(course_ids)
+        return [course_overviews[course_id] for course_id in course_ids if course_overviews[course_id] is not None]
+
+    @staticmethod
+    def invalidate(course_id):
+        """
+        Removes the overview of the given course from the database and from
+        this request's cache, so that it is regenerated when next loaded.
+        """
+        CourseOverview.objects.filter(id=course_id).delete()
+        get_cache(CACHE_NAMESPACE).pop(course_id, None)
 
     def clean_id(self, padding_char='='):
         """
@@ -164,6 +279,13 @@ class CourseOverview(django.db.models.Model):
         """
         return course_metadata_utils.number_for_course_location(self.location)
 
+    @property
+    def org(self):
+        """
+        Returns this course's organization, as given in its key.
+        """
+        return self.location.org
+
     @property
     def url_name(self):
         """
@@ -235,6 +357,17 @@ class CourseOverview(django.db.models.Model):
             self.has_ended()
         )
 
+    @property
+    def sorting_score(self):
+        """
+        Returns a number that can be used to sort courses according to how
+        "new" they are, like CourseDescriptor.sorting_score.
+        """
+        announcement, start = course_metadata_utils.sorting_dates(
+            self.start, self.advertised_start, self.announcement
+        )
+        return course_metadata_utils.sorting_score(announcement, start, datetime.now(UTC()))
+
     @property
     def pre_requisite_courses(self):
         """
@@ -7,10 +7,12 @@ import itertools
 import pytz
 import math
 
+from django.test.client import RequestFactory
 from django.utils import timezone
 
 from lms.djangoapps.certificates.api import get_active_web_certificate
 from lms.djangoapps.courseware.courses import course_image_url
+from request_cache.middleware import RequestCache
 from xmodule.course_metadata_utils import DEFAULT_START_DATE
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
@@ -256,3 +258,81 @@ class CourseOverviewTestCase(ModuleStoreTestCase):
         # we expect no modulestore queries to be made.
         with check_mongo_calls(0):
             _course_overview_2 = CourseOverview.get_from_id(course.id)
+
+    @ddt.data(ModuleStoreEnum.Type.mongo, ModuleStoreEnum.Type.split)
+    def test_get_from_ids(self, modulestore_type):
+        """
+        Tests that overviews of several courses are loaded together, and that
+        courses which don't exist map to None.
+        """
+        courses = [
+            CourseFactory.create(org="edX", course="TEST{}".format(number), run="Run1", default_store=modulestore_type)
+            for number in range(3)
+        ]
+        course_ids = [course.id for course in courses]
+        missing_id = self.store.make_course_key("edX", "missing", "Run1")
+        RequestCache().process_request(RequestFactory().get('/'))
+        self.addCleanup(RequestCache.clear_request_cache)
+
+        course_overviews = CourseOverview.get_from_ids(course_ids + [missing_id])
+        self.assertIsNone(course_overviews.pop(missing_id))
+        self.assertEqual(
+            {course_id: course_overview.id for course_id, course_overview in course_overviews.items()},
+            {course_id: course_id for course_id in course_ids}
+        )
+
+        # Overviews loaded earlier in the request are reused
+        with self.assertNumQueries(0):
+            with check_mongo_calls(0):
+                self.assertEqual(CourseOverview.get_from_ids(course_ids), {
+                    course_id: course_overviews[course_id] for course_id in course_ids
+                })
+
+        # Stored overviews are loaded with a single query
+        RequestCache.clear_request_cache()
+        with self.assertNumQueries(1):
+            with check_mongo_calls(0):
+                course_overviews = CourseOverview.get_from_ids(course_ids)
+        self.assertEqual(sorted(course_overviews.keys()), sorted(course_ids))
+
+    def test_get_from_ids_outside_request(self):
+        """
+        Tests that overviews aren't kept in the request cache when there is no
+        request to clear it, as in Celery tasks and management commands.
+        """
+        course = CourseFactory.create(course="TEST101", org="edX", run="Run1")
+        CourseOverview.get_from_id(course.id)
+        CourseOverview.objects.filter(id=course.id).update(display_name="Changed")
+
+        self.assertEqual(CourseOverview.get_from_id(course.id).display_name, "Changed")
+
+    def test_outdated_overview_regenerated(self):
+        """
+        Tests that overviews stored by an older version of the model are
+        regenerated from the modulestore.
+        """
+        course = CourseFactory.create(course="TEST101", org="edX", run="Run1", catalog_visibility="about")
+        CourseOverview.get_from_id(course.id)
+        CourseOverview.objects.filter(id=course.id).update(version=CourseOverview.VERSION - 1, catalog_visibility=None)
+        RequestCache.clear_request_cache()
+
+        course_overview = CourseOverview.get_from_id(course.id)
+        self.assertEqual(course_overview.version, CourseOverview.VERSION)
+        self.assertEqual(course_overview.catalog_visibility, "about")
+        self.assertEqual(CourseOverview.objects.get(id=course.id).catalog_visibility, "about")
+
+    def test_get_all_courses(self):
+        """
+        Tests that overviews of all courses in the modulestore, optionally
+        limited to an organization, are loaded.
+        """
+        course_ids = [
+            CourseFactory.create(org=org, course="TEST101", run="Run1").id
+            for org in ("edX", "MITx")
+        ]
+        self.assertEqual(
+            sorted(course_overview.id for course_overview in CourseOverview.get_all_courses()),
+            sorted(course_ids)
+        )
+        self.assertEqual([course_overview.id for course_overview in CourseOverview.get_all_courses(org="MITx")],
+                         course_ids[1:])
@@ -1,15 +1,75 @@
 import json
 import logging
+import threading
 
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
+from django.core.cache import cache
+from django.db import models, transaction
 from model_utils.models import TimeStampedModel
 
+from request_cache.middleware import NamespacedCache
 from util.models import CompressedTextField
 from xmodule_django.models import CourseKeyField
 
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
+# Bump this when the contents of ParsedCourseStructure change, so that the
+# parsed structures cached by earlier code aren't used
+PARSED_STRUCTURE_VERSION = 1
+
+# How many parsed course structures each process keeps
+PARSED_STRUCTURE_CACHE_SIZE = 8
+
+# How long parsed course structures are kept in the shared cache, in seconds.
+# They are cached by modification time and revision, so they never go out of date.
+PARSED_STRUCTURE_CACHE_TIMEOUT = 24 * 60 * 60
+
+_parsed_structures = NamespacedCache('course_structures.parsed', max_size=PARSED_STRUCTURE_CACHE_SIZE)
+_parsed_structures_lock = threading.Lock()
+
+
+class ParsedCourseStructure(object):
+    """
+    A course structure decoded from its JSON, along with the orderings of its
+    blocks. One of these may be shared by every caller asking for the same
+    version of a course's structure, so nothing in it should be changed.
+    """
+    def __init__(self, structure):
+        self.structure = structure
+        self.root = structure['root']
+        self.blocks = structure['blocks']
+
+        # Maps block ids to the id of their parent
+        self.parents = {}
+        # Maps block ids to their blocks, in the order with which they're seen in the courseware
+        self.ordered_blocks = OrderedDict()
+        # Maps block types to the ids of the blocks of that type, in courseware order
+        self.block_ids_by_type = defaultdict(list)
+
+        self._traverse_tree(self.root)
+        for block_id, block in self.ordered_blocks.iteritems():
+            if block_id in self.parents:
+                self.ordered_blocks[block_id] = dict(block, parent=self.parents[block_id])
+            self.block_ids_by_type[block.get('block_type')].append(block_id)
+
+    def _traverse_tree(self, block_id, parent=None):
+        """
+        Adds the block and its descendants to ordered_blocks and parents.
+        """
+        block = self.blocks[block_id]
+        if parent:
+            self.parents[block_id] = parent
+        self.ordered_blocks[block_id] = block
+        for child_id in block['children']:
+            self._traverse_tree(child_id, parent=block_id)
+
+    def blocks_of_type(self, block_type):
+        """
+        Returns the ids of the blocks of the given type, in courseware order.
+        """
+        return self.block_ids_by_type.get(block_type, [])
+
 
 class CourseStructure(TimeStampedModel):
     course_id = CourseKeyField(max_length=255, db_index=True, unique=True, verbose_name='Course ID')
@@ -21,37 +81,108 @@ class CourseStructure(TimeStampedModel):
     # we'd have to be careful about caching.
     structure_json = CompressedTextField(verbose_name='Structure JSON', blank=True, null=True)
 
-    @property
-    def structure(self):
-        if self.structure_json:
-            return json.loads(self.structure_json)
-        return None
+    # The version of the course's split modulestore structure this was generated
+    # from, so that later versions can be applied to it incrementally
+    course_version = models.CharField(max_length=255, blank=True, null=True)
 
-    @property
-    def ordered_blocks(self):
+    # Incremented on every save, so that saves within the resolution of
+    # `modified` can be told apart when caching the parsed structure
+    revision = models.PositiveIntegerField(default=0)
+
+    def save(self, *args, **kwargs):
+        with transaction.commit_on_success():
+            if self.pk is not None:
+                # Lock the row and count from its stored revision, so that concurrent saves
+                # (or saves of stale instances) get distinct revisions
+                stored_revisions = CourseStructure.objects.select_for_update().filter(
+                    pk=self.pk
+                ).values_list('revision', flat=True)
+                if stored_revisions:
+                    self.revision = stored_revisions[0]
+            self.revision += 1
+            super(CourseStructure, self).save(*args, **kwargs)
+
+    @classmethod
+    def get_parsed_structure(cls, course_key):
         """
-        Return the blocks in the order with which they're seen in the courseware. Parents are ordered before children.
+        Returns the ParsedCourseStructure of the course, or None if it has no
+        structure yet.
+
+        Parsed structures are cached, both in this process and in the shared
+        cache, by course, modification time and revision, so finding one takes
+        a single small query rather than loading and decoding the structure JSON.
+
+        Raises:
+            CourseStructure.DoesNotExist
         """
-        if self.structure:
-            ordered_blocks = OrderedDict()
-            self._traverse_tree(self.structure['root'], self.structure['blocks'], ordered_blocks)
-            return ordered_blocks
+        versions = cls.objects.filter(course_id=course_key).values_list('modified', 'revision')
+        if not versions:
+            raise cls.DoesNotExist
+        cache_key = cls._parsed_structure_cache_key(course_key, *versions[0])
+
+        with _parsed_structures_lock:
+            parsed_structure = _parsed_structures.get(cache_key)
+        if parsed_structure is None:
+            try:
+                parsed_structure = cache.get(cache_key)
+            except Exception:  # pylint: disable=broad-except
+                # The cache backend could raise an exception (for example, if the structure is too large)
+                logger.exception(u"Error retrieving the course structure of %s from the cache", course_key)
+            if parsed_structure is None:
+                course_structure = cls.objects.get(course_id=course_key)
+                parsed_structure = course_structure.parsed_structure
+                if parsed_structure is None:
+                    return None
+                cache_key = cls._parsed_structure_cache_key(
+                    course_key, course_structure.modified, course_structure.revision
+                )
+                try:
+                    cache.set(cache_key, parsed_structure, PARSED_STRUCTURE_CACHE_TIMEOUT)
+                except Exception:  # pylint: disable=broad-except
+                    logger.exception(u"Error storing the course structure of %s in the cache", course_key)
+            with _parsed_structures_lock:
+                _parsed_structures[cache_key] = parsed_structure
+        return parsed_structure
 
-    def _traverse_tree(self, block, unordered_structure, ordered_blocks, parent=None):
+    @staticmethod
+    def _parsed_structure_cache_key(course_key, modified, revision):
         """
-        Traverses the tree and fills in the ordered_blocks OrderedDict with the blocks in
-        the order that they appear in the course.
+        Returns the key under which the parsed structure of the course, as of
+        the given modification time and revision, is cached.
         """
-        # find the dictionary entry for the current node
-        cur_block = unordered_structure[block]
+        return u'course_structures.parsed.{version}.{course_key}.{modified}.{revision}'.format(
+            version=PARSED_STRUCTURE_VERSION,
+            course_key=course_key,
+            modified=modified.isoformat(),
+            revision=revision,
+        )
 
-        if parent:
-            cur_block['parent'] = parent
+    @property
+    def parsed_structure(self):
+        """
+        The ParsedCourseStructure of structure_json, which is only decoded the
+        first time it's needed.
+        """
+        if not self.structure_json:
+            return None
+        parsed_json, parsed_structure = getattr(self, '_parsed', (None, None))
+        if parsed_json is not self.structure_json:
+            parsed_structure = ParsedCourseStructure(json.loads(self.structure_json))
+            self._parsed = (self.structure_json, parsed_structure)  # pylint: disable=attribute-defined-outside-init
+        return parsed_structure
 
-        ordered_blocks[block] = cur_block
+    @property
+    def structure(self):
+        parsed_structure = self.parsed_structure
+        return parsed_structure.structure if parsed_structure else None
 
-        for child_node in cur_block['children']:
-            self._traverse_tree(child_node, unordered_structure, ordered_blocks, parent=block)
+    @property
+    def ordered_blocks(self):
+        """
+        Return the blocks in the order with which they're seen in the courseware. Parents are ordered before children.
+        """
+        parsed_structure = self.parsed_structure
+        return parsed_structure.ordered_blocks if parsed_structure else None
 
 # Signals must be imported in a file that is automatically loaded at app startup (e.g. models.py). We import them
 # at the end of this file to avoid circular dependencies.
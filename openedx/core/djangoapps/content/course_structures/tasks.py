@@ -1,53 +1,163 @@
 import json
 import logging
 
+from bson.objectid import ObjectId
 from celery.task import task
 from opaque_keys.edx.keys import CourseKey
 from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.split_mongo import BlockKey
 
 
 log = logging.getLogger('edx.celery.task')
 
 
+def _generate_block(block):
+    """
+    Generates the course structure dictionary entry for the specified block.
+    """
+    key = unicode(block.scope_ids.usage_id)
+    children = block.get_children() if block.has_children else []
+    generated = {
+        "usage_key": key,
+        "block_type": block.category,
+        "display_name": block.display_name,
+        "children": [unicode(child.scope_ids.usage_id) for child in children]
+    }
+
+    # Retrieve these attributes separately so that we can fail gracefully
+    # if the block doesn't have the attribute.
+    attrs = (('graded', False), ('format', None))
+    for attr, default in attrs:
+        if hasattr(block, attr):
+            generated[attr] = getattr(block, attr, default)
+        else:
+            log.warning('Failed to retrieve %s attribute of block %s. Defaulting to %s.', attr, key, default)
+            generated[attr] = default
+    return generated, children
+
+
+def _generate_blocks(root, blocks_dict):
+    """
+    Adds the course structure dictionary entries for the specified block and
+    all its descendants to blocks_dict.
+    """
+    blocks_stack = [root]
+    while blocks_stack:
+        curr_block = blocks_stack.pop()
+        block, children = _generate_block(curr_block)
+        blocks_dict[block['usage_key']] = block
+
+        # Add this blocks children to the stack so that we can traverse them as well.
+        blocks_stack.extend(children)
+
+
 def _generate_course_structure(course_key):
     """
     Generates a course structure dictionary for the specified course.
     """
     with modulestore().bulk_operations(course_key):
         course = modulestore().get_course(course_key, depth=None)
-        blocks_stack = [course]
         blocks_dict = {}
-        while blocks_stack:
-            curr_block = blocks_stack.pop()
-            children = curr_block.get_children() if curr_block.has_children else []
-            key = unicode(curr_block.scope_ids.usage_id)
-            block = {
-                "usage_key": key,
-                "block_type": curr_block.category,
-                "display_name": curr_block.display_name,
-                "children": [unicode(child.scope_ids.usage_id) for child in children]
-            }
-
-            # Retrieve these attributes separately so that we can fail gracefully
-            # if the block doesn't have the attribute.
-            attrs = (('graded', False), ('format', None))
-            for attr, default in attrs:
-                if hasattr(curr_block, attr):
-                    block[attr] = getattr(curr_block, attr, default)
-                else:
-                    log.warning('Failed to retrieve %s attribute of block %s. Defaulting to %s.', attr, key, default)
-                    block[attr] = default
-
-            blocks_dict[key] = block
-
-            # Add this blocks children to the stack so that we can traverse them as well.
-            blocks_stack.extend(children)
+        _generate_blocks(course, blocks_dict)
         return {
             "root": unicode(course.scope_ids.usage_id),
             "blocks": blocks_dict
         }
 
 
+def _course_version(course):
+    """
+    Returns the version of the split modulestore structure the course was
+    loaded from, or None if it wasn't loaded from split.
+    """
+    course_entry = getattr(getattr(course, 'runtime', None), 'course_entry', None)
+    if course_entry is None:
+        return None
+    return unicode(course_entry.structure['_id'])
+
+
+def _block_changed(old_block_data, block_data):
+    """
+    Returns whether anything but the children of a split block changed between versions.
+    """
+    return (
+        block_data.definition != old_block_data.definition or
+        block_data.defaults != old_block_data.defaults or
+        dict(block_data.fields, children=None) != dict(old_block_data.fields, children=None)
+    )
+
+
+def _update_course_structure(course, structure, version):
+    """
+    Updates the course structure dictionary generated from the given version of
+    the course's split structure to match the version the course was loaded
+    from, regenerating only the blocks which changed or moved in between.
+
+    Returns the updated course structure, or None if it has to be regenerated
+    in full.
+    """
+    runtime = course.runtime
+    new_structure = runtime.course_entry.structure
+    old_structure = runtime.modulestore.get_structure(runtime.course_entry.course_key, ObjectId(version))
+
+    def usage_key(block_key):
+        """
+        Returns the usage key of the block, as it appears in the course structure.
+        """
+        return course.id.make_usage_key(block_key.type, block_key.id)
+
+    if old_structure is None or old_structure['root'] != new_structure['root']:
+        return None
+    if unicode(usage_key(new_structure['root'])) != structure['root']:
+        return None
+
+    old_blocks = old_structure['blocks']
+    blocks_dict = structure['blocks']
+    old_parents = {}
+    for parent_key, old_block_data in old_blocks.iteritems():
+        for child in old_block_data.fields.get('children', []):
+            old_parents[BlockKey(*child)] = parent_key
+
+    # Walk the new version of the structure, regenerating the blocks which are
+    # new, changed or moved along with their descendants, whose inherited
+    # settings may have changed with them, and updating the children of the others.
+    changed = []
+    block_keys = [(new_structure['root'], None)]
+    while block_keys:
+        block_key, parent_key = block_keys.pop()
+        block_data = new_structure['blocks'][block_key]
+        old_block_data = old_blocks.get(block_key)
+        key = unicode(usage_key(block_key))
+        if (
+                old_block_data is None or key not in blocks_dict or
+                old_parents.get(block_key) != parent_key or _block_changed(old_block_data, block_data)
+        ):
+            changed.append(block_key)
+            continue
+        children = [BlockKey(*child) for child in block_data.fields.get('children', [])]
+        blocks_dict[key]['children'] = [unicode(usage_key(child)) for child in children]
+        block_keys.extend((child, block_key) for child in children)
+
+    if new_structure['root'] in changed:
+        return None
+    for block_key in changed:
+        _generate_blocks(modulestore().get_item(usage_key(block_key), depth=None), blocks_dict)
+
+    # Drop the blocks which are no longer in the course
+    reachable = set()
+    keys = [structure['root']]
+    while keys:
+        key = keys.pop()
+        if key in blocks_dict:
+            reachable.add(key)
+            keys.extend(blocks_dict[key]['children'])
+    for key in set(blocks_dict) - reachable:
+        del blocks_dict[key]
+
+    log.info('Updated %d changed blocks in the course structure of %s', len(changed), course.id)
+    return structure
+
+
 @task(name=u'openedx.core.djangoapps.content.course_structures.tasks.update_course_structure')
 def update_course_structure(course_key):
     """
@@ -64,18 +174,36 @@ def update_course_structure(course_key):
     course_key = CourseKey.from_string(course_key)
 
     try:
-        structure = _generate_course_structure(course_key)
+        with modulestore().bulk_operations(course_key):
+            course = modulestore().get_course(course_key, depth=0)
+            version = _course_version(course)
+            try:
+                cs = CourseStructure.objects.get(course_id=course_key)
+            except CourseStructure.DoesNotExist:
+                cs = None
+
+            structure = None
+            if version and cs and cs.course_version and cs.structure_json:
+                if cs.course_version == version:
+                    # Already generated from this version of the course
+                    return
+                structure = _update_course_structure(course, cs.structure, cs.course_version)
+        if structure is None:
+            structure = _generate_course_structure(course_key)
     except Exception as ex:
         log.exception('An error occurred while generating course structure: %s', ex.message)
         raise
 
     structure_json = json.dumps(structure)
 
-    cs, created = CourseStructure.objects.get_or_create(
-        course_id=course_key,
-        defaults={'structure_json': structure_json}
-    )
-
-    if not created:
-        cs.structure_json = structure_json
-        cs.save()
+    if cs is None:
+        cs, created = CourseStructure.objects.get_or_create(
+            course_id=course_key,
+            defaults={'structure_json': structure_json, 'course_version': version}
+        )
+        if created:
+            return
+
+    cs.structure_json = structure_json
+    cs.course_version = version
+    cs.save()
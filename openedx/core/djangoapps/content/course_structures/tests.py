@@ -1,10 +1,14 @@
 import json
 
+from mock import patch
+
+from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.django import SignalHandler
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from openedx.core.djangoapps.content.course_structures.models import CourseStructure
 from openedx.core.djangoapps.content.course_structures.signals import listen_for_course_publish
+from openedx.core.djangoapps.content.course_structures import tasks
 from openedx.core.djangoapps.content.course_structures.tasks import _generate_course_structure, update_course_structure
 
 
@@ -91,6 +95,18 @@ class CourseStructureTaskTests(ModuleStoreTestCase):
         cs = CourseStructure.objects.create(course_id=self.course.id, structure_json=structure_json)
         self.assertDictEqual(cs.structure, structure)
 
+    def test_revision(self):
+        """
+        Every save of a CourseStructure, even of an instance loaded before another save, increments its revision.
+        """
+        CourseStructure.objects.create(course_id=self.course.id, structure_json='{}')
+        first = CourseStructure.objects.get(course_id=self.course.id)
+        second = CourseStructure.objects.get(course_id=self.course.id)
+        first.save()
+        second.save()
+        self.assertEqual(second.revision, 3)
+        self.assertEqual(CourseStructure.objects.get(course_id=self.course.id).revision, 3)
+
     def test_ordered_blocks(self):
         structure = {
             'root': 'a/b/c',
@@ -126,6 +142,31 @@ class CourseStructureTaskTests(ModuleStoreTestCase):
 
         self.assertEqual(retrieved_course_structure.ordered_blocks.keys(), in_order_blocks)
 
+        parsed_structure = retrieved_course_structure.parsed_structure
+        self.assertEqual(parsed_structure.parents, {'g/h/i': 'a/b/c', 'j/k/l': 'g/h/i', 'd/e/f': 'g/h/i'})
+        self.assertEqual(parsed_structure.ordered_blocks['j/k/l']['parent'], 'g/h/i')
+        self.assertNotIn('parent', parsed_structure.ordered_blocks['a/b/c'])
+        # The decoded structure itself is left as it was stored
+        self.assertEqual(retrieved_course_structure.structure, structure)
+
+    def test_get_parsed_structure(self):
+        self.assertRaises(CourseStructure.DoesNotExist, CourseStructure.get_parsed_structure, self.course.id)
+
+        update_course_structure(unicode(self.course.id))
+        parsed_structure = CourseStructure.get_parsed_structure(self.course.id)
+        self.assertEqual(parsed_structure.structure, _generate_course_structure(self.course.id))
+        self.assertEqual(parsed_structure.blocks_of_type('chapter'), [unicode(self.section.location)])
+        self.assertEqual(parsed_structure.blocks_of_type('problem'), [])
+
+        # Only the version of the stored structure is queried once it has been parsed
+        with self.assertNumQueries(1):
+            self.assertIs(CourseStructure.get_parsed_structure(self.course.id), parsed_structure)
+
+        # Updating the structure, even within the same second, replaces the cached one
+        ItemFactory.create(parent=self.section, category='sequential', display_name='Test Subsection')
+        update_course_structure(unicode(self.course.id))
+        self.assertEqual(len(CourseStructure.get_parsed_structure(self.course.id).blocks_of_type('sequential')), 1)
+
     def test_block_with_missing_fields(self):
         """
         The generator should continue to operate on blocks/XModule that do not have graded or format fields.
@@ -163,3 +204,81 @@ class CourseStructureTaskTests(ModuleStoreTestCase):
         cs = CourseStructure.objects.get(course_id=course_id)
         self.assertEqual(cs.course_id, course_id)
         self.assertEqual(cs.structure, structure)
+
+
+class IncrementalCourseStructureTests(SignalDisconnectTestMixin, ModuleStoreTestCase):
+    """
+    Tests of updating the course structures of split courses with only the blocks which changed.
+    """
+    def setUp(self):
+        super(IncrementalCourseStructureTests, self).setUp()
+        self.course = CourseFactory.create(default_store=ModuleStoreEnum.Type.split)
+        self.chapter = ItemFactory.create(parent=self.course, category='chapter', display_name='Chapter')
+        self.sequential = ItemFactory.create(parent=self.chapter, category='sequential', display_name='Sequential')
+        update_course_structure(unicode(self.course.id))
+
+    def assert_structure_updated(self, incrementally=True):
+        """
+        Updates the course structure, and asserts that it matches a fully regenerated one.
+        """
+        expected = _generate_course_structure(self.course.id)
+        with patch.object(tasks, '_generate_course_structure', wraps=_generate_course_structure) as mock_generate:
+            update_course_structure(unicode(self.course.id))
+        self.assertEqual(mock_generate.called, not incrementally)
+        self.assertEqual(CourseStructure.objects.get(course_id=self.course.id).structure, expected)
+
+    def update_and_publish(self, item, **fields):
+        """
+        Sets the fields of the item and publishes it.
+        """
+        for name, value in fields.items():
+            setattr(item, name, value)
+        self.store.update_item(item, ModuleStoreEnum.UserID.test)
+        self.store.publish(item.location, ModuleStoreEnum.UserID.test)
+
+    def test_stored_version(self):
+        course_structure = CourseStructure.objects.get(course_id=self.course.id)
+        self.assertIsNotNone(course_structure.course_version)
+
+        # Nothing is saved when the course hasn't changed
+        update_course_structure(unicode(self.course.id))
+        self.assertEqual(CourseStructure.objects.get(course_id=self.course.id).revision, course_structure.revision)
+
+    def test_added_block(self):
+        ItemFactory.create(parent=self.sequential, category='vertical', display_name='Vertical')
+        self.assert_structure_updated()
+
+    def test_changed_block(self):
+        ItemFactory.create(parent=self.sequential, category='vertical', display_name='Vertical')
+        update_course_structure(unicode(self.course.id))
+        self.update_and_publish(self.store.get_item(self.sequential.location), graded=True, format='Homework')
+        self.assert_structure_updated()
+
+    def test_moved_block(self):
+        graded = ItemFactory.create(
+            parent=self.chapter, category='sequential', display_name='Graded', graded=True, format='Homework'
+        )
+        vertical = ItemFactory.create(parent=self.sequential, category='vertical', display_name='Vertical')
+        update_course_structure(unicode(self.course.id))
+
+        # Move the vertical from the ungraded sequential to the graded one
+        sequential = self.store.get_item(self.sequential.location)
+        sequential.children = []
+        self.store.update_item(sequential, ModuleStoreEnum.UserID.test)
+        graded = self.store.get_item(graded.location)
+        graded.children.append(vertical.location)
+        self.store.update_item(graded, ModuleStoreEnum.UserID.test)
+        self.store.publish(self.chapter.location, ModuleStoreEnum.UserID.test)
+
+        self.assert_structure_updated()
+        blocks = CourseStructure.objects.get(course_id=self.course.id).structure['blocks'].values()
+        self.assertEqual([block['graded'] for block in blocks if block['display_name'] == 'Vertical'], [True])
+
+    def test_deleted_block(self):
+        self.store.delete_item(self.sequential.location, ModuleStoreEnum.UserID.test)
+        self.store.publish(self.chapter.location, ModuleStoreEnum.UserID.test)
+        self.assert_structure_updated()
+
+    def test_changed_course(self):
+        self.update_and_publish(self.store.get_course(self.course.id), display_name='Renamed')
+        self.assert_structure_updated(incrementally=False)